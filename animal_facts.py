@@ -0,0 +1,115 @@
+# Built-in facts for offline chats, as (topic words, answer) per character.
+# The topic words only help the search find the answer; the player never sees
+# them. Answers are written in the character's voice and kept under 100
+# characters like the model's replies.
+
+ANIMAL_FACTS = {
+    'Capybara': [
+        ("habitat home live river wetland swamp",
+         "I live by rivers, lakes and swamps in the rainforest. Water is my safe place!"),
+        ("swim water dive hide breath",
+         "I'm a great swimmer! I can stay underwater for about five minutes to hide."),
+        ("eat food diet grass plant",
+         "I eat grasses and water plants, up to 3 kg a day. Crunchy and fresh!"),
+        ("size big largest rodent weight special",
+         "I'm the biggest rodent in the world, about as heavy as a grown-up person!"),
+        ("family group herd friends social",
+         "I live in a family group of 10 to 20 capybaras. We look after each other."),
+        ("threat danger fire burn smoke",
+         "Fires burn the grass I eat and dry up my wetlands. Smoke hurts us too."),
+        ("threat danger deforestation farm cattle cut",
+         "Forests and wetlands are cleared for farms and cattle, so my home shrinks."),
+        ("threat danger hunt hunting poach",
+         "Some people hunt capybaras for meat and skin, which hurts our numbers."),
+        ("help protect save conservation kid",
+         "You can help by learning about wetlands and telling friends to protect them!"),
+        ("help protect save recycle paper buy",
+         "Buy recycled paper and wood with a forest-friendly label to save my trees."),
+        ("predator enemy jaguar caiman anaconda",
+         "Jaguars, caimans and anacondas hunt me, so I keep watch and dive when scared."),
+        ("friend bird calm chill gentle",
+         "Birds like to sit on my back and eat bugs. I'm very calm and gentle!"),
+        ("teeth grow chew",
+         "My teeth never stop growing, so I chew all day to keep them short."),
+        ("feet toes web",
+         "My feet are a little webbed, like a duck's, to help me swim."),
+        ("sound talk noise bark",
+         "Capybaras talk with barks, whistles and purrs to warn and greet each other."),
+    ],
+    'Jaguar': [
+        ("territory home range habitat live",
+         "My territory can be bigger than a city. I mark it with scratches on trees."),
+        ("corridor habitat fragment connect road",
+         "Habitat corridors are forest paths that link my patches so I can travel safely."),
+        ("threat danger fragment fragmentation road split",
+         "Roads and farms split my forest into small pieces, so I can't find mates."),
+        ("threat danger deforestation cut fire",
+         "Fires and logging destroy the forest I hunt in. Half my old range is gone."),
+        ("threat danger hunt hunting poach conflict rancher",
+         "Some ranchers hunt jaguars to protect cattle. Safe fences help us both."),
+        ("endangered status number population",
+         "Jaguars are near threatened. Fewer of us live in the wild every year."),
+        ("special bite strong power jaw",
+         "I have the strongest bite of any big cat. I can crack a turtle shell!"),
+        ("swim water river",
+         "Unlike most cats, I love water. I swim across rivers to hunt."),
+        ("eat food diet hunt prey",
+         "I eat capybaras, caimans, deer, fish and turtles. I hunt by ambush."),
+        ("spot coat rosette pattern color",
+         "My spots are called rosettes. Every jaguar's pattern is unique, like a fingerprint."),
+        ("black panther dark melanistic",
+         "Some jaguars are black, but you can still see our rosettes in the sunlight."),
+        ("help protect save conservation kid",
+         "Help by supporting parks and corridors, and by sharing what you learn about me!"),
+        ("help protect save buy beef soy",
+         "Choose food that doesn't come from cleared rainforest. It keeps my home standing."),
+        ("role ecosystem top predator balance important",
+         "As a top predator I keep the forest in balance by keeping prey numbers healthy."),
+        ("alone solitary cub baby family",
+         "I live alone. Jaguar cubs stay with their mom for about two years."),
+    ],
+    'Macaw': [
+        ("nest nesting tree hole cavity site",
+         "I nest in holes high up in old, dead trees. Without big trees, no chicks!"),
+        ("threat danger pet trade illegal trap cage",
+         "People catch wild macaws to sell as pets. Many of us die on the way."),
+        ("threat danger deforestation cut logging tree",
+         "Logging takes the tall old trees I need for nests and food."),
+        ("eat food diet nut seed fruit like",
+         "I eat nuts, seeds, fruit and flowers. My beak cracks the hardest nuts!"),
+        ("clay lick soil mud",
+         "We gather at clay licks and eat mud. It helps us digest the seeds we eat."),
+        ("color feather bright red blue",
+         "My bright red, blue and yellow feathers help me spot my friends in the trees."),
+        ("mate partner pair life love",
+         "Macaws pick one partner for life. We fly together wing to wing."),
+        ("social flock friends group talk",
+         "I live in noisy flocks. We squawk to keep in touch across the forest."),
+        ("talk sound loud squawk voice",
+         "My call can be heard over a kilometre away through the trees!"),
+        ("age old live long life",
+         "Macaws can live 50 years or more in the wild if our forest is safe."),
+        ("seed plant forest gardener spread",
+         "I drop seeds as I fly, so I help plant new trees in the rainforest."),
+        ("help protect save pet buy",
+         "Never buy a wild parrot as a pet. That keeps macaws flying free!"),
+        ("help protect save conservation nest box kid",
+         "Nest boxes and protected trees help us raise chicks. Tell everyone!"),
+        ("beak feet toe climb",
+         "I use my strong beak like a third foot to climb branches."),
+        ("fire burn smoke",
+         "Fires burn my nesting trees and the fruit trees my flock depends on."),
+    ],
+}
+
+GREETINGS = {
+    'Capybara': "Hi {player}! I'm a capybara from the river's edge. Ask me about my home or my food!",
+    'Jaguar': "Hello {player}. I'm a jaguar, guardian of this forest. Ask me about my territory!",
+    'Macaw': "Squawk! Hi {player}! I'm a macaw. Ask me about my nest or my colourful flock!",
+}
+
+FALLBACK_REPLIES = {
+    'Capybara': "Good question! Ask me about my food, my family or how to protect wetlands.",
+    'Jaguar': "Hmm. Ask me about my territory, my spots or habitat corridors.",
+    'Macaw': "Squawk? Ask me about nests, clay licks or the pet trade.",
+}
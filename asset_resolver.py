@@ -0,0 +1,111 @@
+import json
+import os
+import pygame
+from surface_cache import RawSurfaceCache
+
+# Runtime side of build_assets.py. Screens ask for an image at the size they
+# draw it; if the build step produced that variant (and the source hasn't
+# changed since), the pre-scaled file is loaded as is. Otherwise the original
+# is loaded and scaled here, exactly as the build step would have.
+# Either way the converted result is kept in the raw surface cache, so later
+# runs map the pixels straight from disk without decoding anything.
+
+BUILD_DIR = os.path.join('assets', 'build')
+MANIFEST_PATH = os.path.join(BUILD_DIR, 'manifest.json')
+
+
+def variant_key(path, size, smooth=True, blur=None):
+    """Manifest key for path scaled to size, e.g. 'assets/characters/jaguar.png@160x160'."""
+    key = f"{os.path.normpath(path).replace(os.sep, '/')}@{size[0]}x{size[1]}"
+    if not smooth:
+        key += ':nearest'
+    if blur:
+        key += f':blur{blur}'
+    return key
+
+
+def scale_image(surface, size, smooth=True, blur=None):
+    """Scale surface to size. blur=n first shrinks it n times for a soft, blurred look."""
+    size = tuple(size)
+    if blur:
+        surface = pygame.transform.smoothscale(surface, (size[0] // blur, size[1] // blur))
+    if not smooth:
+        return pygame.transform.scale(surface, size)
+    return pygame.transform.smoothscale(surface, size)
+
+
+class AssetResolver:
+    def __init__(self, manifest_path=MANIFEST_PATH, raw_cache=True):
+        self.manifest_path = manifest_path
+        self.build_dir = os.path.dirname(manifest_path)
+        # True for the default cache under the build directory, None/False to always decode
+        if raw_cache is True:
+            raw_cache = RawSurfaceCache(os.path.join(self.build_dir, 'raw'))
+        self.raw_cache = raw_cache or None
+        self._variants = None
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def variants(self):
+        if self._variants is None:
+            try:
+                with open(self.manifest_path) as f:
+                    self._variants = json.load(f).get('variants', {})
+            except (OSError, ValueError):
+                self._variants = {}
+        return self._variants
+
+    def reload(self):
+        self._variants = None
+
+    def resolve(self, path, size, smooth=True, blur=None):
+        """Path of the built variant, or None if there is none or its source has changed."""
+        entry = self.variants.get(variant_key(path, size, smooth, blur))
+        if entry is None:
+            return None
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        if stat.st_size != entry['source_size'] or stat.st_mtime_ns != entry['source_mtime_ns']:
+            return None
+        built = os.path.join(self.build_dir, entry['output'])
+        return built if os.path.exists(built) else None
+
+    def load(self, path, size=None, alpha=False, smooth=True, blur=None):
+        """Load path as a display-format surface, scaled to size if given."""
+        raw_key = stamp = None
+        if self.raw_cache is not None:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                pass
+            else:
+                raw_key = (variant_key(path, size, smooth, blur) if size else path) + (':alpha' if alpha else '')
+                stamp = f"{stat.st_size}:{stat.st_mtime_ns}"
+                image = self.raw_cache.load(raw_key, stamp)
+                if image is not None:
+                    return image
+        built = self.resolve(path, size, smooth, blur) if size else None
+        image = pygame.image.load(built or path)
+        image = image.convert_alpha() if alpha else image.convert()
+        if size and built is None:
+            self.misses += 1
+            image = scale_image(image, size, smooth, blur)
+        elif size:
+            self.hits += 1
+        if raw_key is not None:
+            try:
+                self.raw_cache.store(raw_key, stamp, image)
+            except OSError as e:
+                print(f"Could not cache {path}: {e}")
+        return image
+
+
+asset_resolver = AssetResolver()
+
+
+def load_image(path, size=None, alpha=False, smooth=True, blur=None):
+    """Shortcut for asset_resolver.load."""
+    return asset_resolver.load(path, size, alpha, smooth, blur)
@@ -0,0 +1,47 @@
+"""
+Image load time with and without the pre-scaled variants from build_assets.py.
+
+Loads every variant the game uses through an AssetResolver pointed at the
+build manifest, then through one with no manifest (load + scale at runtime).
+Run build_assets.py first.
+
+Run from the repository root:
+    python benchmarks/bench_assets.py
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import pygame
+from asset_resolver import MANIFEST_PATH, AssetResolver
+from build_assets import variants
+
+
+def load_all(resolver):
+    start = time.perf_counter()
+    for path, size, smooth, blur in variants():
+        resolver.load(path, size, alpha=size[0] <= 200, smooth=smooth, blur=blur)
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    pygame.display.init()
+    pygame.display.set_mode((960, 640))
+    built = AssetResolver(MANIFEST_PATH)
+    runtime = AssetResolver(os.path.join('assets', 'build', 'missing-manifest.json'))
+    load_all(built)  # warm the OS file cache
+    load_all(runtime)
+    built.hits = built.misses = 0
+    built_ms = load_all(built)
+    runtime_ms = load_all(runtime)
+    print(f"{len(variants())} images")
+    print(f"pre-scaled variants: {built_ms:8.1f} ms  ({built.hits} built, {built.misses} scaled at runtime)")
+    print(f"load + scale:        {runtime_ms:8.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
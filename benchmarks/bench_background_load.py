@@ -0,0 +1,65 @@
+"""
+Background load time: PNG decode + smoothscale versus the raw surface cache.
+
+For rainforest.png and each stage background, times
+  - the original path: pygame.image.load of the 1920x1080 PNG, convert, smoothscale,
+  - loading the pre-scaled PNG from build_assets.py (if built) and converting it,
+  - mapping the display-format pixels from the raw surface cache.
+
+Run from the repository root:
+    python benchmarks/bench_background_load.py
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import pygame
+from asset_resolver import MANIFEST_PATH, AssetResolver
+from main import BG_STAGES, SCREEN_HEIGHT, SCREEN_WIDTH
+from surface_cache import RawSurfaceCache
+
+RUNS = 7
+SIZE = (SCREEN_WIDTH, SCREEN_HEIGHT)
+BACKGROUNDS = [os.path.join('assets', 'background', 'rainforest.png')] + BG_STAGES
+
+
+def median_ms(func):
+    samples = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return sorted(samples)[RUNS // 2] * 1000
+
+
+def decode_and_scale(path):
+    return pygame.transform.smoothscale(pygame.image.load(path).convert(), SIZE)
+
+
+def main():
+    pygame.display.init()
+    pygame.display.set_mode(SIZE)
+    with tempfile.TemporaryDirectory() as cache_dir:
+        prescaled = AssetResolver(MANIFEST_PATH, raw_cache=False)
+        raw = AssetResolver(MANIFEST_PATH, raw_cache=RawSurfaceCache(cache_dir))
+        print(f"{'image':<24}{'load+scale':>12}{'prescaled':>12}{'raw cache':>12}")
+        totals = [0.0, 0.0, 0.0]
+        for path in BACKGROUNDS:
+            raw.load(path, SIZE)  # fills the cache
+            row = [median_ms(lambda: decode_and_scale(path)),
+                   median_ms(lambda: prescaled.load(path, SIZE)),
+                   median_ms(lambda: raw.load(path, SIZE))]
+            totals = [t + ms for t, ms in zip(totals, row)]
+            print(f"{os.path.basename(path):<24}" + "".join(f"{ms:>10.2f}ms" for ms in row))
+        print(f"{'total':<24}" + "".join(f"{ms:>10.2f}ms" for ms in totals))
+        if not prescaled.hits:
+            print("(no pre-scaled variants found; run build_assets.py for the middle column)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,135 @@
+"""
+Benchmark: per-message latency through ModelClientPool, fresh versus pooled, against a local stub server.
+
+The stub answers like a tiny generateContent endpoint. Models come from
+ModelClientPool's factory hook: each stub model opens its own keep-alive
+connection when it is built, standing in for the transport a real SDK model
+sets up. Every message goes through GeminiBackend (pool lookup, resilience
+layer, model call):
+  - "fresh" builds a new pool for every message, the way a new client per
+    chat-screen visit does, so each message pays for a new model and connection;
+  - "pooled" shares one pool, so every message reuses the same model.
+The numbers say what reuse saves for a transport that keeps its connection;
+whether the real SDK transport does is up to the SDK. It also times building
+a ConversationManager with a cold versus a warm pool (no network calls are
+made for that part).
+
+Run from the repository root:
+    python benchmarks/bench_client_reuse.py [messages]
+"""
+
+import http.client
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from chat_backends import ChatRequest
+from conversation import GeminiBackend, ModelClientPool
+
+RESPONSE = json.dumps({"candidates": [{"content": {"parts": [{"text": "Hello from the stub!"}]}}]}).encode()
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # keep-alive
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(RESPONSE)))
+        self.end_headers()
+        self.wfile.write(RESPONSE)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubResponse:
+    def __init__(self, payload):
+        self.text = payload['candidates'][0]['content']['parts'][0]['text']
+
+
+class StubModel:
+    """Just enough of GenerativeModel for GeminiBackend, talking to the stub over one connection."""
+
+    def __init__(self, port, model_name):
+        self.path = f'/v1beta/models/{model_name}:generateContent'
+        self.conn = http.client.HTTPConnection('127.0.0.1', port)
+        self.conn.connect()
+
+    def generate_content(self, prompt):
+        body = json.dumps({"contents": [{"parts": [{"text": prompt}]}]})
+        self.conn.request('POST', self.path, body, {'Content-Type': 'application/json'})
+        return StubResponse(json.loads(self.conn.getresponse().read()))
+
+    def count_tokens(self, text):
+        return len(text)
+
+    def close(self):
+        self.conn.close()
+
+
+def bench_pool(port, messages):
+    factory = lambda api_key, model_name: StubModel(port, model_name)
+    request = ChatRequest("Tell me about your habitat")
+    fresh = []
+    for _ in range(messages):
+        start = time.perf_counter()
+        backend = GeminiBackend('bench-key', pool=ModelClientPool(factory=factory))
+        backend.generate(request)
+        fresh.append(time.perf_counter() - start)
+        backend.model.close()
+
+    pooled = []
+    pool = ModelClientPool(factory=factory)
+    for _ in range(messages):
+        start = time.perf_counter()
+        GeminiBackend('bench-key', pool=pool).generate(request)
+        pooled.append(time.perf_counter() - start)
+    pool.get_model('bench-key').close()
+    return fresh, pooled
+
+
+def bench_manager_construction(rounds=20):
+    try:
+        from conversation import ConversationManager
+    except ImportError as e:
+        print(f"Skipping ConversationManager timing: {e}")
+        return
+    cold = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        ConversationManager(api_key='bench-key', pool=ModelClientPool())
+        cold.append(time.perf_counter() - start)
+    pool = ModelClientPool()
+    warm = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        ConversationManager(api_key='bench-key', pool=pool)
+        warm.append(time.perf_counter() - start)
+    print(f"ConversationManager(): cold pool {statistics.median(cold) * 1000:.2f} ms, "
+          f"warm pool {statistics.median(warm) * 1000:.2f} ms (median of {rounds})")
+
+
+def report(label, samples):
+    ms = sorted(s * 1000 for s in samples)
+    print(f"{label:>8}: median {statistics.median(ms):.3f} ms, p95 {ms[int(len(ms) * 0.95) - 1]:.3f} ms")
+
+
+if __name__ == '__main__':
+    messages = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    fresh, pooled = bench_pool(server.server_address[1], messages)
+    server.shutdown()
+    print(f"{messages} messages through ModelClientPool against the local stub:")
+    report('fresh', fresh)
+    report('pooled', pooled)
+    bench_manager_construction()
@@ -0,0 +1,115 @@
+"""
+Load test for ConversationService against a local fake model.
+
+Simulates hundreds of kiosk sessions chatting at once and reports throughput,
+latency percentiles, how many prompts were coalesced, the peak number of
+concurrent model calls, and how evenly sessions were served.
+
+Run from the repository root:
+    python benchmarks/bench_conversation_service.py [sessions] [messages_per_session]
+"""
+
+import asyncio
+import os
+import statistics
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from conversation import ConversationManager, ModelClientPool
+from conversation_service import ConversationService, ServiceBusy
+
+CHARACTERS = ['Capybara', 'Jaguar', 'Macaw']
+PLAYER_NAMES = ['Ana', 'Ben', 'Caio', 'Dara']  # few names, so greetings repeat and coalesce
+
+
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+class FakeModel:
+    """Stands in for GenerativeModel: fixed latency, tracks peak concurrency."""
+
+    def __init__(self, latency=0.02):
+        self.latency = latency
+        self.active = 0
+        self.peak = 0
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def generate_content(self, prompt):
+        with self._lock:
+            self.active += 1
+            self.calls += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(self.latency)
+        with self._lock:
+            self.active -= 1
+        return FakeResponse(f"Fake answer to {len(prompt)} characters of prompt.")
+
+
+def is_model_answer(text):
+    return text.startswith("Fake answer")
+
+
+async def run_session(service, index, messages, latencies, finish_times, fallbacks, start):
+    session_id = f"kiosk-{index}"
+    character = CHARACTERS[index % len(CHARACTERS)]
+    player = PLAYER_NAMES[index % len(PLAYER_NAMES)]
+    t = time.perf_counter()
+    answer = await service.start_conversation(session_id, character, player)
+    latencies.append(time.perf_counter() - t)
+    if not is_model_answer(answer):
+        fallbacks.append(answer)
+    for m in range(messages):
+        t = time.perf_counter()
+        try:
+            answer = await service.continue_conversation(session_id, character, f"Question {m} from {session_id}")
+        except ServiceBusy:
+            continue
+        latencies.append(time.perf_counter() - t)
+        if not is_model_answer(answer):
+            fallbacks.append(answer)
+    finish_times.append(time.perf_counter() - start)
+
+
+async def load_test(sessions, messages, max_concurrency=8, latency=0.02):
+    model = FakeModel(latency)
+    pool = ModelClientPool()
+    pool.put('fake-key', model)
+    manager = ConversationManager(api_key='fake-key', pool=pool)
+    service = ConversationService(manager, max_concurrency=max_concurrency)
+    await service.start()
+    latencies, finish_times, fallbacks = [], [], []
+    start = time.perf_counter()
+    await asyncio.gather(*(run_session(service, i, messages, latencies, finish_times, fallbacks, start)
+                           for i in range(sessions)))
+    elapsed = time.perf_counter() - start
+    await service.stop()
+
+    ms = sorted(x * 1000 for x in latencies)
+    print(f"{sessions} sessions x {messages + 1} requests, max_concurrency={max_concurrency}, "
+          f"fake latency {latency * 1000:.0f} ms")
+    print(f"  {len(latencies)} answered in {elapsed:.2f}s ({len(latencies) / elapsed:.0f} req/s)")
+    print(f"  latency p50 {statistics.median(ms):.1f} ms, p95 {ms[int(len(ms) * 0.95) - 1]:.1f} ms, max {ms[-1]:.1f} ms")
+    print(f"  model calls {model.calls}, coalesced {service.stats['coalesced']}, "
+          f"rejected {service.stats['rejected']}, peak concurrent calls {model.peak}")
+    print(f"  session finish times: first {min(finish_times):.2f}s, last {max(finish_times):.2f}s, "
+          f"stdev {statistics.pstdev(finish_times):.2f}s")
+    assert model.peak <= max_concurrency
+    # Every request that wasn't coalesced (rejected ones are never counted) must have reached the model,
+    # or the numbers above measure fallback answers instead of the service
+    assert not fallbacks, f"{len(fallbacks)} answers did not come from the model, e.g. {fallbacks[0]!r}"
+    assert model.calls == service.stats['requests'] - service.stats['coalesced'], \
+        f"{model.calls} model calls for {service.stats['requests'] - service.stats['coalesced']} requests"
+    assert service.stats['coalesced'] > 0, "repeated greetings were not coalesced"
+    assert not service._sessions, "finished sessions were not dropped"
+
+
+if __name__ == '__main__':
+    sessions = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    messages = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    asyncio.run(load_test(sessions, messages))
@@ -0,0 +1,69 @@
+"""
+First-answer latency in the chat screen with and without the greeting prefetch.
+
+A fake model answers after a fixed delay. Without prefetch the greeting and
+the first reply are both requested when the player presses Send, and the
+session answers them in order. With prefetch the greeting is requested when
+the player points at Learn Facts on InteractionScreen, a moment before they
+open the chat.
+
+Run from the repository root:
+    python benchmarks/bench_greeting_prefetch.py [latency_ms]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from conversation import ConversationManager, ModelClientPool
+from conversation_service import ConversationClient, ConversationService, chat_session_id
+
+THINKING_TIME = 1.0  # seconds between pointing at Learn Facts and sending the first question
+
+
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+class SlowModel:
+    def __init__(self, latency):
+        self.latency = latency
+
+    def generate_content(self, prompt):
+        time.sleep(self.latency)
+        return FakeResponse("Fake answer.")
+
+
+def first_answer(client, player, prefetch):
+    session = chat_session_id(player, 'Jaguar')
+    if prefetch:
+        client.greeting(session, 'Jaguar', player)  # InteractionScreen.prefetch_greeting
+        time.sleep(THINKING_TIME)
+    start = time.perf_counter()
+    # Send pressed: the greeting (unless already fetched), then the question
+    client.greeting(session, 'Jaguar', player)
+    reply = client.continue_conversation(session, 'Jaguar', "What makes you special?")
+    reply.result()
+    return time.perf_counter() - start
+
+
+def main():
+    latency = (float(sys.argv[1]) if len(sys.argv) > 1 else 400) / 1000
+    pool = ModelClientPool()
+    pool.put('fake-key', SlowModel(latency))
+    client = ConversationClient(ConversationService(ConversationManager(api_key='fake-key', pool=pool)))
+    try:
+        cold = first_answer(client, 'Cold', prefetch=False)
+        warm = first_answer(client, 'Warm', prefetch=True)
+    finally:
+        client.close()
+    print(f"model latency {latency * 1000:.0f} ms")
+    print(f"first answer without prefetch: {cold * 1000:6.0f} ms")
+    print(f"first answer with prefetch:    {warm * 1000:6.0f} ms ({warm / cold:.0%} of before)")
+
+
+if __name__ == '__main__':
+    main()
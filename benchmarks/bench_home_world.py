@@ -0,0 +1,63 @@
+"""
+HomeScreen frame cost against world size.
+
+Builds the home screen with worlds of 1 to 1000 screens (about 3 to 3000
+animals) and times update() + draw() while the player walks right holding
+the arrow key, then compares with a loop that tests and draws every animal
+in the world, as the fixed screen used to.
+
+Run from the repository root:
+    python benchmarks/bench_home_world.py
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import pygame
+from main import SCREEN_HEIGHT, SCREEN_WIDTH
+from screens import HomeScreen
+
+FRAMES = 300
+WORLD_SCREENS = (1, 10, 100, 1000)
+
+
+class HeldKeys:
+    """Stands in for pygame.key.get_pressed() with the right arrow held."""
+
+    def __getitem__(self, key):
+        return key == pygame.K_RIGHT
+
+
+def frame_ms(home, every_animal=False):
+    start = time.perf_counter()
+    for _ in range(FRAMES):
+        home.update()
+        home.draw()
+        if every_animal:
+            # What the old screen did per frame: a distance test and a blit per animal
+            for x, name in home.animals.animals:
+                abs(home.char_x - x) < home.proximity_threshold
+                home.screen.blit(home.other_imgs[name], (home.camera.to_screen(x) - 80, home.other_y - 160))
+    return (time.perf_counter() - start) * 1000 / FRAMES
+
+
+def main():
+    pygame.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    pygame.key.get_pressed = HeldKeys
+    print(f"{'world':>7} {'animals':>8} {'culled ms':>10} {'all ms':>8}")
+    for screens in WORLD_SCREENS:
+        home = HomeScreen(screen, 'Capybara', 'Player', world_screens=screens)
+        home.char_x = home.world_width // 2  # walk through the middle of the world
+        culled = frame_ms(home)
+        home.char_x = home.world_width // 2
+        every = frame_ms(home, every_animal=True)
+        print(f"{screens:>7} {len(home.animals):>8} {culled:>10.3f} {every:>8.3f}")
+
+
+if __name__ == '__main__':
+    main()
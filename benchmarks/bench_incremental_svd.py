@@ -0,0 +1,64 @@
+"""
+Animated background throughput: full SVD per frame versus incremental updates.
+
+rainforest.png at the window size is swayed over 60 frames (svd_incremental.sway_frames)
+and each frame is reconstructed at rank 35, the second background stage, with
+  - svd.compress_image_color, a full np.linalg.svd of every channel (a few frames only),
+  - IncrementalImageSVD at several update ranks and power iterations,
+reporting frames per second and the PSNR gap to the best rank-35 frame
+(Eckart-Young), averaged over the sampled frames.
+
+Run from the repository root:
+    python benchmarks/bench_incremental_svd.py
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from PIL import Image
+import svd
+from main import SCREEN_HEIGHT, SCREEN_WIDTH
+from svd_incremental import IncrementalImageSVD, sway_frames
+
+IMAGE = os.path.join('assets', 'background', 'rainforest.png')
+RANK = 35
+FRAMES = 60
+FULL_SVD_FRAMES = 4
+SAMPLED = (10, 25, 40, 59)  # frames compared against the best rank-k result
+SETTINGS = [(4, 0), (8, 0), (8, 1), (16, 1)]  # (update rank, power iterations)
+
+
+def main():
+    with Image.open(IMAGE) as image:
+        original = np.asarray(image.convert('RGB').resize((SCREEN_WIDTH, SCREEN_HEIGHT)), dtype=np.float32) / 255.0
+    frames = list(sway_frames(original, FRAMES, amplitude=8, period=FRAMES // 2))
+    best = {i: svd.compress_image_color(frames[i], RANK) for i in SAMPLED}
+    best_psnr = np.mean([svd.psnr(frames[i], best[i]) for i in SAMPLED])
+
+    print(f"{SCREEN_WIDTH}x{SCREEN_HEIGHT}, rank {RANK}, {FRAMES} swaying frames")
+    print(f"{'method':<32} {'fps':>7} {'PSNR dB':>8} {'vs best':>8}")
+    start = time.perf_counter()
+    for frame in frames[:FULL_SVD_FRAMES]:
+        svd.compress_image_color(frame, RANK)
+    fps = FULL_SVD_FRAMES / (time.perf_counter() - start)
+    print(f"{'full SVD per frame':<32} {fps:>7.1f} {best_psnr:>8.2f} {0.0:>8.2f}")
+
+    for update_rank, power_iters in SETTINGS:
+        tracker = IncrementalImageSVD(frames[0], RANK, update_rank, power_iters)
+        scores = []
+        start = time.perf_counter()
+        for i, frame in enumerate(frames):
+            reconstruction = tracker.update(frame)
+            if i in best:
+                scores.append(svd.psnr(frame, reconstruction))
+        elapsed = time.perf_counter() - start
+        label = f"incremental r={update_rank}, {power_iters} power it."
+        print(f"{label:<32} {FRAMES / elapsed:>7.1f} {np.mean(scores):>8.2f} {np.mean(scores) - best_psnr:>8.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""
+Per-frame event cost while the mouse moves fast.
+
+Posts N MOUSEMOTION events per frame (N = 1 to 1000) while an egg is being
+dragged in DragNestMinigame, then times handling them
+  - the old way: draining the queue and moving the egg for every event,
+  - through input_pipeline, which folds the motion run into one event,
+and for a screen that ignores the mouse (the home screen allows KEYDOWN only),
+where the pipeline has SDL drop the events before they are queued.
+
+Run from the repository root:
+    python benchmarks/bench_input.py
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import pygame
+from input_pipeline import input_pipeline
+from main import SCREEN_HEIGHT, SCREEN_WIDTH
+from minigames.drag_nest import DragNestMinigame
+
+FRAMES = 50
+MOTIONS_PER_FRAME = (1, 10, 100, 1000)
+
+
+def post_motions(count, frame):
+    for i in range(count):
+        pygame.event.post(pygame.event.Event(pygame.MOUSEMOTION, pos=(100 + (frame + i) % 400, 200),
+                                             rel=(1, 0), buttons=(1, 0, 0), touch=False))
+
+
+def drain_every_event(game):
+    for event in pygame.event.get():
+        if event.type == pygame.MOUSEMOTION:
+            game.on_mouse_motion(event)
+
+
+def frame_ms(count, handle):
+    total = 0.0
+    for frame in range(FRAMES):
+        post_motions(count, frame)
+        start = time.perf_counter()
+        handle()
+        total += time.perf_counter() - start
+    return total * 1000 / FRAMES
+
+
+def main():
+    pygame.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    game = DragNestMinigame(screen)
+    x, y = game.eggs[0]['pos']
+    game.pick_egg((x, y))
+    handlers = {pygame.MOUSEMOTION: game.on_mouse_motion}
+
+    print(f"{'motions/frame':>13} {'drain all ms':>13} {'pipeline ms':>12} {'ignored ms':>11}")
+    for count in MOTIONS_PER_FRAME:
+        input_pipeline.allow(None)
+        old = frame_ms(count, lambda: drain_every_event(game))
+        input_pipeline.allow(handlers)
+        new = frame_ms(count, lambda: input_pipeline.dispatch(handlers))
+        input_pipeline.allow((pygame.KEYDOWN,))
+        ignored = frame_ms(count, input_pipeline.poll)
+        print(f"{count:>13} {old:>13.3f} {new:>12.3f} {ignored:>11.3f}")
+    input_pipeline.allow(None)
+
+
+if __name__ == '__main__':
+    main()
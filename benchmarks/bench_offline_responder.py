@@ -0,0 +1,53 @@
+"""
+Latency of the offline chat backend (BM25 over the built-in animal facts).
+
+Builds the indexes, asks every character its suggested questions plus a few
+free-form ones through a keyless ConversationManager, and prints the answers
+with index build time and per-reply latency.
+
+Run from the repository root:
+    python benchmarks/bench_offline_responder.py
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.pop('GEMINI_API_KEY', None)
+
+from chat_backends import LocalFactBackend
+from conversation import ConversationManager
+
+EXTRA_QUESTIONS = ["Are you in danger?", "Do you like fires?", "What's your favourite colour?", "hello"]
+REPEATS = 200
+
+
+def main():
+    start = time.perf_counter()
+    LocalFactBackend()
+    build_ms = (time.perf_counter() - start) * 1000
+    print(f"Index build: {build_ms:.2f} ms")
+
+    manager = ConversationManager(api_key=None)
+    manager.backend = LocalFactBackend()  # load_dotenv may have found a key
+    for character in ('Capybara', 'Jaguar', 'Macaw'):
+        print(f"\n{character}: {manager.start_conversation(character, 'Sam')}")
+        for question in manager.get_conversation_suggestions(character) + EXTRA_QUESTIONS:
+            answer = manager.continue_conversation(character, question, f"bench-{character}")
+            print(f"  Q: {question}\n  A: {answer}")
+
+    timings = []
+    for i in range(REPEATS):
+        start = time.perf_counter()
+        request = manager.reply_request('Jaguar', "How can I help protect jaguars?", f"timing-{i % 10}")
+        manager.generate_text(request)
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    print(f"\nReply latency over {REPEATS} turns: median {timings[len(timings) // 2]:.3f} ms, "
+          f"p95 {timings[int(len(timings) * 0.95)]:.3f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,162 @@
+"""
+Deterministic fault-injection run for the model resilience layer.
+
+A scripted stub model fails, hangs or answers in a fixed order. Each scenario
+checks the retries, deadlines, circuit breaker and fallbacks, then the
+exported stats and latency histogram are printed. Exits non-zero on a failed check.
+
+Run from the repository root:
+    python benchmarks/bench_resilience.py
+"""
+
+import json
+import os
+import random
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from conversation import ConversationManager, ModelClientPool
+from resilience import CircuitBreaker, ModelUnavailable, ResilientCaller, RetryPolicy
+
+
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+class ScriptedModel:
+    """Plays back 'ok', 'error' or 'hang' for each call, then keeps answering 'ok'."""
+
+    def __init__(self, script):
+        self.script = list(script)
+        self.calls = 0
+        self.release = threading.Event()
+
+    def generate_content(self, prompt):
+        self.calls += 1
+        step = self.script.pop(0) if self.script else 'ok'
+        if step == 'error':
+            raise ConnectionError("injected failure")
+        if step == 'hang':
+            self.release.wait()  # never answers within the deadline
+        return FakeResponse(f"answer #{self.calls}")
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def build(script, clock, call_timeout=0.05, offline_fallback=False):
+    model = ScriptedModel(script)
+    # failed models are dropped from the pool, so the factory hands back the same stub
+    pool = ModelClientPool(factory=lambda api_key, model_name: model)
+    sleeps = []
+    caller = ResilientCaller(call_timeout=call_timeout,
+                             retry=RetryPolicy(max_attempts=3, base_delay=0.1, rng=random.Random(7)),
+                             breaker=CircuitBreaker(failure_threshold=3, reset_timeout=30.0, clock=clock),
+                             sleep=sleeps.append)
+    manager = ConversationManager(api_key='fake-key', pool=pool, resilience=caller,
+                                  offline_fallback=offline_fallback)
+    return manager, model, caller, sleeps
+
+
+def check(condition, message):
+    print(("  ok    " if condition else "  FAIL  ") + message)
+    return condition
+
+
+def main():
+    clock = FakeClock()
+    passed = True
+
+    print("Transient error is retried with jittered backoff")
+    manager, model, caller, sleeps = build(['error', 'ok'], clock)
+    answer = manager.generate_text("hello")
+    passed &= check(answer == "answer #2", f"answered after retry ({answer!r})")
+    passed &= check(len(sleeps) == 1 and 0 <= sleeps[0] <= 0.1, f"one backoff sleep within base delay ({sleeps})")
+
+    print("Hung request hits its deadline, then the cached answer is served")
+    manager, model, caller, sleeps = build(['ok', 'hang', 'hang', 'hang'], clock)
+    first = manager.generate_text("same prompt")
+    start = time.perf_counter()
+    second = manager.generate_text("same prompt")
+    elapsed = time.perf_counter() - start
+    passed &= check(second == first, "fell back to the cached answer")
+    passed &= check(caller.counters['timeouts'] == 3, f"three deadline hits ({caller.counters['timeouts']})")
+    passed &= check(elapsed < 1.0, f"gave up after {elapsed * 1000:.0f} ms instead of hanging")
+    model.release.set()
+
+    print("Breaker opens after repeated failures and short-circuits instantly")
+    manager, model, caller, sleeps = build(['error'] * 3, clock)
+    try:
+        manager.generate_text("question")
+        passed &= check(False, "expected ModelUnavailable")
+    except ModelUnavailable:
+        passed &= check(True, "ModelUnavailable with nothing cached")
+    passed &= check(caller.breaker.state == CircuitBreaker.OPEN, f"breaker is {caller.breaker.state}")
+    calls_before = model.calls
+    start = time.perf_counter()
+    reply = manager.continue_conversation('Jaguar', "Are you there?", 'kiosk-1')
+    elapsed = time.perf_counter() - start
+    passed &= check(model.calls == calls_before, "no call reached the dead endpoint")
+    passed &= check(elapsed < 0.01, f"answered in {elapsed * 1000:.2f} ms: {reply[:40]!r}...")
+
+    print("Offline fallback answers while the breaker is open")
+    caller.fallback = lambda prompt: "Offline answer"
+    passed &= check(manager.generate_text("another question") == "Offline answer", "fallback used")
+
+    print("Half-open trial after the reset timeout closes the breaker")
+    clock.now += 31
+    answer = manager.generate_text("question")
+    passed &= check(caller.breaker.state == CircuitBreaker.CLOSED, f"breaker is {caller.breaker.state}, got {answer!r}")
+
+    print("Hung calls are capped by the breaker instead of piling up threads")
+    manager, model, caller, sleeps = build(['hang'] * 10, clock)
+    caller.breaker.failure_threshold = 100  # keep the breaker closed, so only the cap stops calls
+    threads_before = threading.active_count()
+    for i in range(4):
+        try:
+            manager.generate_text(f"question {i}")
+        except ModelUnavailable:
+            pass
+    limit = caller.breaker.max_hung
+    passed &= check(model.calls == limit, f"{model.calls} calls started for {limit} slots")
+    passed &= check(caller.counters['short_circuited'] > 0, f"{caller.counters['short_circuited']} attempts short-circuited")
+    passed &= check(threading.active_count() - threads_before <= limit,
+                    f"{threading.active_count() - threads_before} new threads")
+    model.release.set()
+
+    print("Slow but healthy concurrent calls are not capped")
+    manager, model, caller, sleeps = build([], clock, call_timeout=2.0)
+    caller.fallback = lambda prompt: "Offline answer"
+    slow = model.generate_content
+    model.generate_content = lambda prompt: (time.sleep(0.1), slow(prompt))[1]
+    answers = []
+    workers = [threading.Thread(target=lambda i=i: answers.append(manager.generate_text(f"concurrent {i}")))
+               for i in range(3 * caller.breaker.max_hung)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    passed &= check(model.calls == len(workers) and "Offline answer" not in answers,
+                    f"{model.calls} of {len(workers)} concurrent calls reached the model")
+
+    print("Local fact backend answers in character when the model is down")
+    offline_manager, model, _, _ = build(['error'] * 3, clock, offline_fallback=True)
+    reply = offline_manager.continue_conversation('Jaguar', "Why are roads bad for you?", 'kiosk-2')
+    passed &= check(model.calls == 3 and "road" in reply.lower(), f"answered from facts: {reply!r}")
+
+    print("Exported stats:")
+    print(json.dumps(caller.stats(), indent=2))
+    return 0 if passed else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
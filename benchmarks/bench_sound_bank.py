@@ -0,0 +1,66 @@
+"""
+Cost of starting the victory jingle and overlapping effects on the frame thread.
+
+Compares the old mixer.music.load + play of victory.wav with SoundBank.play on
+a preloaded bank, and shows how a burst of effects is spread over the pooled
+channels. Runs with the dummy audio driver, so no sound device is needed.
+
+Run from the repository root:
+    python benchmarks/bench_sound_bank.py
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import pygame
+from sound_bank import SOUND_FILES, SoundBank
+
+RUNS = 20
+
+
+def median_ms(samples):
+    samples = sorted(samples)
+    return samples[len(samples) // 2] * 1000
+
+
+def main():
+    pygame.mixer.pre_init(44100, -16, 2, 512)
+    pygame.mixer.init()
+
+    music = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        pygame.mixer.music.load(SOUND_FILES['victory'])
+        pygame.mixer.music.play()
+        music.append(time.perf_counter() - start)
+        pygame.mixer.music.stop()
+    print(f"mixer.music.load + play:  first {music[0] * 1000:.3f} ms, median {median_ms(music):.3f} ms")
+
+    bank = SoundBank()
+    start = time.perf_counter()
+    bank.preload()
+    handoff = time.perf_counter() - start
+    bank.wait_until_loaded()
+    loaded = time.perf_counter() - start
+    print(f"SoundBank.preload:        {handoff * 1000:.3f} ms on the caller, {loaded * 1000:.1f} ms on the worker")
+
+    plays = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        bank.play('victory', group='music')
+        plays.append(time.perf_counter() - start)
+    print(f"SoundBank.play(victory):  median {median_ms(plays):.3f} ms")
+
+    used = []
+    for _ in range(12):
+        used.append(bank.groups['sfx'].index(bank.play('fire_hit')))
+    print(f"12 overlapping fire hits on sfx channels: {used}")
+    print(f"victory channel still busy: {bank.groups['music'][0].get_busy()}")
+
+
+if __name__ == '__main__':
+    main()
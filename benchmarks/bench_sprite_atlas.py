@@ -0,0 +1,80 @@
+"""
+Character images: one load per screen and size versus the shared sprite atlas.
+
+Gets all three characters at the four sizes the screens use (12 sprites)
+  - with load_image from the originals (no build, no raw cache), as the screens used to,
+  - with load_image and a warm raw surface cache,
+  - by building the sprite atlas from the originals,
+  - by loading the sprite atlas from a warm raw surface cache,
+then times drawing all 12 sprites from separate surfaces and from the atlas.
+
+Run from the repository root:
+    python benchmarks/bench_sprite_atlas.py
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import pygame
+from asset_resolver import AssetResolver
+from main import SCREEN_HEIGHT, SCREEN_WIDTH
+from sprite_atlas import CHARACTER_NAMES, CHARACTER_SIZES, SpriteAtlas, character_path
+from surface_cache import RawSurfaceCache
+
+DRAWS = 2000
+
+
+def timed_ms(func):
+    start = time.perf_counter()
+    result = func()
+    return (time.perf_counter() - start) * 1000, result
+
+
+def load_separately(resolver):
+    return [resolver.load(character_path(name), (size, size), alpha=True)
+            for size in CHARACTER_SIZES for name in CHARACTER_NAMES]
+
+
+def load_atlas(cache):
+    atlas = SpriteAtlas(raw_cache=cache)
+    return [atlas.sprite(name, size) for size in CHARACTER_SIZES for name in CHARACTER_NAMES]
+
+
+def draw_ms(screen, sprites):
+    start = time.perf_counter()
+    for _ in range(DRAWS):
+        x = 0
+        for sprite in sprites:
+            screen.blit(sprite, (x % SCREEN_WIDTH, 200))
+            x += 80
+    return (time.perf_counter() - start) * 1000 / DRAWS
+
+
+def main():
+    pygame.display.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    with tempfile.TemporaryDirectory() as workdir:
+        no_manifest = os.path.join(workdir, 'none', 'manifest.json')
+        cold_ms, separate = timed_ms(lambda: load_separately(AssetResolver(no_manifest, raw_cache=None)))
+        cache = RawSurfaceCache(os.path.join(workdir, 'raw'))
+        load_separately(AssetResolver(no_manifest, raw_cache=cache))
+        warm_ms, _ = timed_ms(lambda: load_separately(AssetResolver(no_manifest, raw_cache=cache)))
+        atlas_cache = RawSurfaceCache(os.path.join(workdir, 'atlas'))
+        build_ms, _ = timed_ms(lambda: load_atlas(atlas_cache))
+        cached_ms, sprites = timed_ms(lambda: load_atlas(atlas_cache))
+
+        print(f"{'12 character sprites':<36} {'ms':>8}")
+        for label, ms in (('load_image each, decode + scale', cold_ms), ('load_image each, raw cache', warm_ms),
+                          ('atlas, built', build_ms), ('atlas, raw cache', cached_ms)):
+            print(f"{label:<36} {ms:>8.2f}")
+        print(f"{'draw 12, separate surfaces':<36} {draw_ms(screen, separate):>8.3f}")
+        print(f"{'draw 12, atlas subsurfaces':<36} {draw_ms(screen, sprites):>8.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+"""
+Stage output cost: Matplotlib imsave versus the Pillow output stage in svd.py.
+
+Encodes the four rainforest.png stages (k = 15, 35, 50, 100) with
+  - plt.imsave of the float image (the old path, RGBA PNG), if Matplotlib is installed,
+  - svd.save_compressed_image as PNG at compress levels 1, 6 and 9 and as WebP,
+  - the same PNG encodes spread over a thread pool,
+and prints wall time and total bytes for each.
+
+Run from the repository root:
+    python benchmarks/bench_stage_encode.py
+"""
+
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import svd
+
+IMAGE = os.path.join('assets', 'background', 'rainforest.png')
+STAGES = [15, 35, 50, 100]
+
+
+def run(label, extension, stages, workdir, save, workers=1):
+    paths = [os.path.join(workdir, f'{label.replace(" ", "_")}_{n}{extension}') for n in range(len(stages))]
+    start = time.perf_counter()
+    if workers > 1:
+        with ThreadPoolExecutor(workers) as pool:
+            list(pool.map(save, stages, paths))
+    else:
+        for stage, path in zip(stages, paths):
+            save(stage, path)
+    elapsed = time.perf_counter() - start
+    size = sum(os.path.getsize(path) for path in paths)
+    print(f"{label:<28} {elapsed * 1000:>9.0f} {size / 1024:>9.0f}")
+
+
+def main():
+    original = svd.load_image(IMAGE)
+    stages = [svd.compress_image_color(original, k) for k in STAGES]
+    print(f"{len(STAGES)} stages of {original.shape[1]}x{original.shape[0]}")
+    print(f"{'output':<28} {'total ms':>9} {'total KB':>9}")
+    with tempfile.TemporaryDirectory() as workdir:
+        try:
+            import matplotlib
+            matplotlib.use('Agg')
+            import matplotlib.pyplot as plt
+        except ImportError:
+            print(f"{'matplotlib imsave':<28} {'(not installed)':>19}")
+        else:
+            run('matplotlib imsave', '.png', stages, workdir, lambda image, path: plt.imsave(path, image))
+        for level in (1, 6, 9):
+            run(f'pillow png level {level}', '.png', stages, workdir,
+                lambda image, path, level=level: svd.save_compressed_image(image, path, level))
+        run('pillow webp q90', '.webp', stages, workdir, svd.save_compressed_image)
+        run('pillow webp lossless', '.webp', stages, workdir,
+            lambda image, path: svd.save_compressed_image(image, path, lossless=True))
+        run('pillow png level 6, 4 threads', '.png', stages, workdir, svd.save_compressed_image, workers=4)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""
+Startup import benchmark and regression gate.
+
+Runs `python -X importtime -c "import main"` and reports the slowest imports.
+Exits with status 1 if a module that should load lazily (chat SDK, minigames,
+SVD/Matplotlib) is imported at startup, or if importing main takes longer
+than the budget.
+
+Run from the repository root:
+    python benchmarks/bench_startup.py [budget_ms]
+"""
+
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Must not be imported before the opening screen is shown. NumPy is not listed:
+# pygame imports it for surfarray whenever it is installed.
+LAZY_MODULES = [
+    'google.generativeai',
+    'dotenv',
+    'conversation',
+    'conversation_service',
+    'chat_backends',
+    'animal_facts',
+    'minigames.fire_invaders',
+    'minigames.puzzle',
+    'minigames.drag_nest',
+    'svd',
+    'matplotlib',
+]
+DEFAULT_BUDGET_MS = 1000
+
+
+def measure_imports(module='main', runs=3):
+    """Return {module: cumulative microseconds}, keeping the fastest of several runs."""
+    best = {}
+    for _ in range(runs):
+        result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                                cwd=ROOT, capture_output=True, text=True,
+                                env=dict(os.environ, PYGAME_HIDE_SUPPORT_PROMPT='1'))
+        if result.returncode != 0:
+            raise RuntimeError(result.stderr)
+        timings = {}
+        for line in result.stderr.splitlines():
+            if not line.startswith('import time:') or 'cumulative' in line:
+                continue
+            # "import time:   self_us |   cumulative_us | <indent>module"
+            _, cumulative_us, name = line[len('import time:'):].split('|')
+            timings[name.strip()] = int(cumulative_us)
+        for name, cumulative in timings.items():
+            best[name] = min(cumulative, best.get(name, cumulative))
+    return best
+
+
+def main(budget_ms=DEFAULT_BUDGET_MS):
+    timings = measure_imports()
+    total_ms = timings.get('main', 0) / 1000
+    print(f"import main: {total_ms:.1f} ms (budget {budget_ms} ms)")
+    print("Slowest imports:")
+    for name, cumulative in sorted(timings.items(), key=lambda item: -item[1])[:10]:
+        print(f"  {cumulative / 1000:8.1f} ms  {name}")
+
+    eager = [name for name in LAZY_MODULES if name in timings]
+    failed = False
+    if eager:
+        print("FAIL: imported at startup but should load lazily:", ", ".join(eager))
+        failed = True
+    if total_ms > budget_ms:
+        print(f"FAIL: startup import took {total_ms:.1f} ms, over the {budget_ms} ms budget")
+        failed = True
+    if not failed:
+        print("OK")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(float(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_BUDGET_MS))
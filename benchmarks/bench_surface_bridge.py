@@ -0,0 +1,81 @@
+"""
+Getting a NumPy image on screen: PNG round trip versus surface_bridge.
+
+A rank-35 SVD reconstruction of rainforest.png at the window size (float32,
+(height, width, 3)) is turned into a display-format surface by
+  - svd.save_compressed_image to a PNG (fastest zlib level), then pygame.image.load + convert,
+  - surfarray.make_surface of a freshly converted, transposed uint8 copy, then convert,
+  - ArrayBlitter.to_surface into a new surface,
+  - ArrayBlitter.to_surface into the same surface every frame, as an animation would.
+
+Run from the repository root:
+    python benchmarks/bench_surface_bridge.py
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import numpy as np
+import pygame
+import svd
+from main import SCREEN_HEIGHT, SCREEN_WIDTH
+from surface_bridge import ArrayBlitter
+
+RUNS = 15
+SIZE = (SCREEN_WIDTH, SCREEN_HEIGHT)
+IMAGE = os.path.join('assets', 'background', 'rainforest.png')
+
+
+def median_ms(func):
+    samples = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return sorted(samples)[RUNS // 2] * 1000
+
+
+def main():
+    pygame.display.init()
+    pygame.display.set_mode(SIZE)
+    original = pygame.transform.smoothscale(pygame.image.load(IMAGE).convert(), SIZE)
+    pixels = pygame.surfarray.array3d(original).transpose(1, 0, 2).astype(np.float32) / 255.0
+    frame = svd.compress_image_color(pixels, 35).astype(np.float32)
+
+    blitter = ArrayBlitter(SIZE)
+    target = blitter.new_surface()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        path = os.path.join(workdir, 'frame.png')
+
+        def png_round_trip():
+            svd.save_compressed_image(frame, path, compress_level=1)
+            return pygame.image.load(path).convert()
+
+        def make_surface():
+            values = (np.clip(frame, 0, 1) * 255 + 0.5).astype(np.uint8)
+            return pygame.surfarray.make_surface(values.transpose(1, 0, 2)).convert()
+
+        timings = [
+            ('PNG round trip', median_ms(png_round_trip)),
+            ('surfarray.make_surface', median_ms(make_surface)),
+            ('bridge, new surface', median_ms(lambda: blitter.to_surface(frame))),
+            ('bridge, reused surface', median_ms(lambda: blitter.to_surface(frame, target))),
+        ]
+        # Both ends must give the same pixels
+        expected = pygame.surfarray.array3d(png_round_trip())
+        assert np.array_equal(pygame.surfarray.array3d(blitter.to_surface(frame, target)), expected)
+
+    print(f"{SIZE[0]}x{SIZE[1]} float32 frame, median of {RUNS}")
+    print(f"{'path':<26} {'ms':>8} {'fps':>8}")
+    for label, ms in timings:
+        print(f"{label:<26} {ms:>8.2f} {1000 / ms:>8.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,130 @@
+"""
+Pre-scale the game's images to the sizes the screens draw them at.
+
+Each variant is written to assets/build/ under a name that includes a hash of
+its source and settings, and assets/build/manifest.json maps variants to
+files. Sources whose size and mtime are unchanged are skipped, sources that
+were only touched are re-hashed, and files no variant refers to any more are
+deleted. When any variant was built or removed, the raw surface cache is
+cleared as well (the game refills it on the next run), so entries for
+variants that no longer exist don't pile up. The game falls back to scaling
+at runtime for anything not built.
+
+Run from the repository root:
+    python build_assets.py [--force]
+"""
+
+import hashlib
+import json
+import os
+import sys
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import pygame
+from asset_resolver import BUILD_DIR, MANIFEST_PATH, scale_image, variant_key
+from surface_cache import RawSurfaceCache
+from main import BG_STAGES, SCREEN_HEIGHT, SCREEN_WIDTH
+
+BUILD_VERSION = 1  # bump to rebuild everything after changing scale_image
+SCREEN_SIZE = (SCREEN_WIDTH, SCREEN_HEIGHT)
+RAINFOREST = os.path.join('assets', 'background', 'rainforest.png')
+MINIGAME_ASSETS = os.path.join('assets', 'Minigame_assets')
+
+
+def variants():
+    """(source, size, smooth, blur) for every image size the game draws.
+
+    Characters are not here: sprite_atlas.py packs them into one cached atlas.
+    """
+    specs = [(RAINFOREST, SCREEN_SIZE, True, None),
+             (RAINFOREST, SCREEN_SIZE, True, 8),  # blurred backdrop of the interaction and chat screens
+             (RAINFOREST, (480, 480), True, None)]  # 3x3 puzzle atlas
+    specs += [(path, SCREEN_SIZE, True, None) for path in BG_STAGES]
+    specs += [(os.path.join(MINIGAME_ASSETS, 'leaves.webp'), SCREEN_SIZE, False, None),
+              (os.path.join(MINIGAME_ASSETS, 'fire.png'), (44, 44), False, None),
+              (os.path.join(MINIGAME_ASSETS, 'empty_nest.png'), (640, 320), False, None),
+              (os.path.join(MINIGAME_ASSETS, 'egg.png'), (64, 64), False, None)]
+    return specs
+
+
+def file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 16), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def load_manifest():
+    try:
+        with open(MANIFEST_PATH) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return manifest.get('variants', {}) if manifest.get('version') == BUILD_VERSION else {}
+
+
+def build(force=False):
+    os.makedirs(BUILD_DIR, exist_ok=True)
+    old = {} if force else load_manifest()
+    new = {}
+    built = skipped = 0
+    hashes = {}
+    for path, size, smooth, blur in variants():
+        key = variant_key(path, size, smooth, blur)
+        stat = os.stat(path)
+        entry = old.get(key)
+        output_exists = entry is not None and os.path.exists(os.path.join(BUILD_DIR, entry['output']))
+        if output_exists and (entry['source_size'], entry['source_mtime_ns']) == (stat.st_size, stat.st_mtime_ns):
+            new[key] = entry
+            skipped += 1
+            continue
+        if path not in hashes:
+            hashes[path] = file_hash(path)
+        source_hash = hashes[path]
+        if output_exists and entry['source_hash'] == source_hash:
+            # Touched but not changed
+            new[key] = dict(entry, source_size=stat.st_size, source_mtime_ns=stat.st_mtime_ns)
+            skipped += 1
+            continue
+        name_hash = hashlib.sha256(f"{source_hash}|{key}|{BUILD_VERSION}".encode()).hexdigest()[:12]
+        stem = os.path.splitext(os.path.basename(path))[0]
+        suffix = key.split('@', 1)[1].replace(':', '-')
+        output = f"{stem}-{suffix}-{name_hash}.png"
+        image = scale_image(pygame.image.load(path).convert_alpha(), size, smooth, blur)
+        pygame.image.save(image, os.path.join(BUILD_DIR, output))
+        new[key] = {'source': key.split('@', 1)[0], 'source_hash': source_hash, 'source_size': stat.st_size,
+                    'source_mtime_ns': stat.st_mtime_ns, 'output': output, 'size': list(size)}
+        built += 1
+
+    # Drop files that no variant points at any more
+    keep = {entry['output'] for entry in new.values()} | {os.path.basename(MANIFEST_PATH)}
+    removed = 0
+    for name in os.listdir(BUILD_DIR):
+        if name not in keep and name.endswith('.png'):
+            os.remove(os.path.join(BUILD_DIR, name))
+            removed += 1
+
+    if built or removed:
+        RawSurfaceCache().clear()
+
+    with open(MANIFEST_PATH + '.tmp', 'w') as f:
+        json.dump({'version': BUILD_VERSION, 'variants': new}, f, indent=1, sort_keys=True)
+    os.replace(MANIFEST_PATH + '.tmp', MANIFEST_PATH)
+    return built, skipped, removed
+
+
+def main():
+    # convert_alpha needs a display, even a hidden one
+    pygame.display.init()
+    pygame.display.set_mode((1, 1))
+    start = time.perf_counter()
+    built, skipped, removed = build(force='--force' in sys.argv)
+    elapsed = time.perf_counter() - start
+    print(f"{built} built, {skipped} unchanged, {removed} stale files removed in {elapsed:.2f}s -> {BUILD_DIR}")
+
+
+if __name__ == '__main__':
+    main()
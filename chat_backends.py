@@ -0,0 +1,140 @@
+import math
+import re
+import threading
+from collections import Counter, deque
+from animal_facts import ANIMAL_FACTS, FALLBACK_REPLIES, GREETINGS
+
+# Backends that ConversationManager can hand a chat turn to. The Gemini
+# backend lives in conversation.py next to the client pool; LocalFactBackend
+# answers from the built-in fact corpus with BM25 ranking, so chats work with
+# no API key, no network and no model download.
+
+STOPWORDS = {
+    'a', 'about', 'an', 'and', 'are', 'can', 'do', 'does', 'for', 'how', 'i', 'in', 'is', 'it',
+    'like', 'me', 'my', 'of', 'on', 'or', 'so', 'tell', 'that', 'the', 'to', 'what', 'why', 'you', 'your',
+}
+_WORD = re.compile(r"[a-z]+")
+
+
+def stem(word):
+    """Strip common English endings so 'eats', 'eating' and 'eat' match."""
+    for suffix in ('ing', 'ed', 'es', 's'):
+        if len(word) > len(suffix) + 3 and word.endswith(suffix):
+            return word[:-len(suffix)]
+    return word
+
+
+def tokenize(text):
+    return [stem(word) for word in _WORD.findall(text.lower()) if len(word) > 1 and word not in STOPWORDS]
+
+
+class ChatRequest:
+    """One chat turn: the full model prompt plus the pieces it was built from.
+
+    player_message is None for a greeting.
+    """
+
+    __slots__ = ('prompt', 'character_name', 'player_name', 'player_message', 'conversation_id')
+
+    def __init__(self, prompt, character_name=None, player_name=None, player_message=None,
+                 conversation_id='default'):
+        self.prompt = prompt
+        self.character_name = character_name
+        self.player_name = player_name
+        self.player_message = player_message
+        self.conversation_id = conversation_id
+
+
+class ChatBackend:
+    """Turns a ChatRequest into the character's reply. Subclasses override generate()."""
+
+    name = 'base'
+
+    def generate(self, request):
+        raise NotImplementedError
+
+
+class BM25Index:
+    """Okapi BM25 over a small list of documents, with an inverted index built once."""
+
+    def __init__(self, documents, k1=1.5, b=0.75):
+        self.k1 = k1
+        self.b = b
+        self.postings = {}
+        self.lengths = []
+        for doc_id, document in enumerate(documents):
+            terms = tokenize(document)
+            self.lengths.append(len(terms))
+            for term, count in Counter(terms).items():
+                self.postings.setdefault(term, []).append((doc_id, count))
+        total = len(self.lengths)
+        self.avg_length = sum(self.lengths) / total if total else 0.0
+        self.idf = {term: math.log(1 + (total - len(docs) + 0.5) / (len(docs) + 0.5))
+                    for term, docs in self.postings.items()}
+
+    def scores(self, query):
+        """Score of every document sharing a term with query, as {doc_id: score}."""
+        scores = {}
+        for term in set(tokenize(query)):
+            postings = self.postings.get(term)
+            if postings is None:
+                continue
+            idf = self.idf[term]
+            for doc_id, count in postings:
+                norm = self.k1 * (1 - self.b + self.b * self.lengths[doc_id] / self.avg_length)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * count * (self.k1 + 1) / (count + norm)
+        return scores
+
+    def search(self, query, limit=3):
+        """Best (doc_id, score) pairs for query, highest first."""
+        scores = self.scores(query)
+        return sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:limit]
+
+
+class LocalFactBackend(ChatBackend):
+    """Answers from ANIMAL_FACTS with one BM25 index per character.
+
+    A conversation doesn't get the same fact twice in a row: the best match
+    that wasn't among its last few answers wins, as long as it scores at least
+    min_relative_score of the top match. Questions that match nothing step
+    through the character's facts in order.
+    """
+
+    name = 'local'
+
+    def __init__(self, facts=None, greetings=None, fallback_replies=None, recent_limit=3, min_relative_score=0.5):
+        facts = facts if facts is not None else ANIMAL_FACTS
+        self.greetings = greetings if greetings is not None else GREETINGS
+        self.fallback_replies = fallback_replies if fallback_replies is not None else FALLBACK_REPLIES
+        self.answers = {name: [answer for _, answer in entries] for name, entries in facts.items()}
+        self.indexes = {name: BM25Index([f"{topics} {answer}" for topics, answer in entries])
+                        for name, entries in facts.items()}
+        self.recent_limit = recent_limit
+        self.min_relative_score = min_relative_score
+        self._recent = {}
+        self._browse = {}
+        self._lock = threading.Lock()
+
+    def generate(self, request):
+        name = request.character_name
+        if request.player_message is None:
+            greeting = self.greetings.get(name, "Hi {player}! Ask me about the rainforest.")
+            return greeting.format(player=request.player_name or "friend")
+        if name not in self.indexes:
+            return "I'm not sure about that, but the rainforest is full of surprises!"
+        matches = self.indexes[name].search(request.player_message, limit=self.recent_limit + 1)
+        with self._lock:
+            recent = self._recent.setdefault(request.conversation_id, deque(maxlen=self.recent_limit))
+            floor = matches[0][1] * self.min_relative_score if matches else 0.0
+            choice = next((doc_id for doc_id, score in matches if doc_id not in recent and score >= floor), None)
+            if choice is None and matches:
+                choice = matches[0][0]
+            if choice is None:
+                # Nothing matched: offer the next fact in turn, or a nudge towards good questions
+                step = self._browse.get(request.conversation_id, 0)
+                self._browse[request.conversation_id] = step + 1
+                if step % 2:
+                    return self.fallback_replies.get(name, "Ask me about my home or my food!")
+                choice = (step // 2) % len(self.answers[name])
+            recent.append(choice)
+        return self.answers[name][choice]
@@ -1,33 +1,221 @@
-import google.generativeai as genai
+import math
 import os
+import threading
+import time
+from collections import deque
 from typing import List, Dict
-from dotenv import load_dotenv
+from chat_backends import ChatBackend, ChatRequest, LocalFactBackend
+from resilience import ResilientCaller
 
-# Load environment variables from .env file
-load_dotenv()
+# google.generativeai and dotenv take seconds to import on the kiosks, so they
+# are only loaded when a ConversationManager is actually created.
+# Without an API key the manager answers from the local fact backend instead.
 
-class ConversationManager:
-    def __init__(self, api_key: str = None):
-        if api_key:
+DEFAULT_MODEL = 'gemini-2.0-flash-lite'
+
+
+class ModelClientPool:
+    """Process-wide pool of configured Gemini models.
+
+    genai.configure and GenerativeModel are created once per (api_key, model)
+    and reused, so conversations don't repeat that setup, and whatever
+    connection the model's transport holds (gRPC by default) outlives a
+    single chat screen. A model
+    that fails, or that fails a health check after sitting idle, is dropped and
+    rebuilt on next use.
+    """
+
+    def __init__(self, health_check_interval: float = 300.0, factory=None):
+        self.health_check_interval = health_check_interval
+        # factory(api_key, model_name) builds a model; defaults to Gemini, stubs can be swapped in
+        self.factory = factory
+        self._lock = threading.Lock()
+        self._models = {}
+        self._last_ok = {}
+        self._configured_key = None
+
+    def get_model(self, api_key: str, model_name: str = DEFAULT_MODEL):
+        key = (api_key, model_name)
+        with self._lock:
+            model = self._models.get(key)
+            if model is None:
+                model = self._create(api_key, model_name)
+                self._models[key] = model
+                self._last_ok[key] = time.monotonic()
+        idle = time.monotonic() - self._last_ok.get(key, 0)
+        if idle > self.health_check_interval and not self.health_check(api_key, model_name):
+            return self.get_model(api_key, model_name)
+        return model
+
+    def _create(self, api_key: str, model_name: str):
+        if self.factory is not None:
+            return self.factory(api_key, model_name)
+        import google.generativeai as genai
+
+        if self._configured_key != api_key:
             genai.configure(api_key=api_key)
-        else:
-            # Try to get from environment variable (from .env file)
-            api_key = os.getenv('GEMINI_API_KEY')
-            if api_key:
-                print(f"API key found: {api_key[:10]}...")  # Debug: show first 10 chars
-                genai.configure(api_key=api_key)
-            else:
-                print("ERROR: No API key found in .env file")
-                raise ValueError("Gemini API key not found. Set GEMINI_API_KEY in your .env file or pass api_key parameter.")
-        
+            self._configured_key = api_key
+        model = genai.GenerativeModel(model_name)
+        print("Gemini model initialized successfully")
+        return model
+
+    def health_check(self, api_key: str, model_name: str = DEFAULT_MODEL) -> bool:
+        """Make a cheap token-count call; drop the model if it fails."""
+        key = (api_key, model_name)
+        model = self._models.get(key)
+        if model is None:
+            return False
         try:
-            self.model = genai.GenerativeModel('gemini-2.0-flash-lite')
-            print("Gemini model initialized successfully")
+            model.count_tokens("ping")
         except Exception as e:
-            print(f"ERROR initializing model: {e}")
+            print(f"Gemini health check failed: {e}")
+            self.discard(api_key, model_name)
+            return False
+        self.mark_ok(api_key, model_name)
+        return True
+
+    def put(self, api_key: str, model, model_name: str = DEFAULT_MODEL):
+        """Install a ready-made model, e.g. a local fake for load tests."""
+        with self._lock:
+            self._models[(api_key, model_name)] = model
+            self._last_ok[(api_key, model_name)] = time.monotonic()
+
+    def mark_ok(self, api_key: str, model_name: str = DEFAULT_MODEL):
+        self._last_ok[(api_key, model_name)] = time.monotonic()
+
+    def discard(self, api_key: str, model_name: str = DEFAULT_MODEL):
+        with self._lock:
+            self._models.pop((api_key, model_name), None)
+            self._last_ok.pop((api_key, model_name), None)
+
+
+client_pool = ModelClientPool()
+
+
+class GeminiBackend(ChatBackend):
+    """Answers with the pooled Gemini model, through the resilience layer.
+
+    When the model can't answer and nothing is cached, the offline backend
+    (if given) answers the same request instead. With RR_MODEL_STATS set, the
+    resilience stats are printed after every request.
+    """
+
+    name = 'gemini'
+
+    def __init__(self, api_key: str, model_name: str = DEFAULT_MODEL, pool: ModelClientPool = None,
+                 resilience: ResilientCaller = None, offline: ChatBackend = None):
+        self.api_key = api_key
+        self.model_name = model_name
+        self.pool = pool if pool is not None else client_pool
+        # Deadlines, retries and circuit breaker around every model call
+        self.resilience = resilience if resilience is not None else ResilientCaller()
+        self.offline = offline
+        self.log_stats = bool(os.getenv('RR_MODEL_STATS'))
+        self.model = self.pool.get_model(api_key, model_name)
+
+    def generate(self, request: ChatRequest) -> str:
+        fallback = None
+        if self.offline is not None:
+            fallback = lambda prompt: self.offline.generate(request)
+        try:
+            return self.resilience.call(self._call_model, request.prompt, fallback=fallback)
+        finally:
+            if self.log_stats:
+                self.print_stats()
+
+    def print_stats(self):
+        stats = self.resilience.stats()
+        print(f"Model calls: breaker {stats['breaker_state']}, {stats['calls']} requests, "
+              f"{stats['attempts']} attempts, {stats['timeouts']} timeouts, "
+              f"{stats['hung_calls']} hung, {stats['short_circuited']} short-circuited, "
+              f"{stats['cache_fallbacks'] + stats['offline_fallbacks']} fallbacks, "
+              f"p95 <= {stats['latency']['p95_ms']:.0f} ms")
+
+    def _call_model(self, prompt: str) -> str:
+        """One call to the pooled model, dropping it from the pool if the call fails."""
+        self.model = self.pool.get_model(self.api_key, self.model_name)
+        try:
+            response = self.model.generate_content(prompt)
+        except Exception:
+            self.pool.discard(self.api_key, self.model_name)
             raise
-        
+        self.pool.mark_ok(self.api_key, self.model_name)
+        return response.text
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count for budgeting (about four characters per token)."""
+    return math.ceil(len(text) / 4)
+
+
+class ConversationHistory:
+    """Fixed-size ring buffer of recent turns with an optional running summary.
+
+    When a turn falls out of the buffer its first sentence is folded into a
+    short summary, so long kiosk sessions keep some context while memory and
+    prompt size stay bounded.
+    """
+
+    def __init__(self, capacity: int = 12, summarize: bool = True, summary_chars: int = 300):
+        self.messages = deque(maxlen=capacity)
+        self.summarize = summarize
+        self.summary_chars = summary_chars
+        self.summary = ""
+
+    def append(self, role: str, content: str):
+        if self.summarize and len(self.messages) == self.messages.maxlen:
+            self._fold_into_summary(self.messages[0])
+        self.messages.append({"role": role, "content": content, "tokens": estimate_tokens(content) + 2})
+
+    def _fold_into_summary(self, message: Dict):
+        first_sentence = message["content"].split(". ")[0].strip()[:80]
+        entry = f"{message['role']}: {first_sentence}"
+        self.summary = f"{self.summary}; {entry}" if self.summary else entry
+        if len(self.summary) > self.summary_chars:
+            # keep the most recent entries
+            self.summary = self.summary[-self.summary_chars:].split("; ", 1)[-1]
+
+    def __len__(self):
+        return len(self.messages)
+
+    def __iter__(self):
+        return iter(self.messages)
+
+
+class ConversationManager:
+    def __init__(self, api_key: str = None, model_name: str = DEFAULT_MODEL, pool: ModelClientPool = None,
+                 prompt_token_budget: int = 400, history_capacity: int = 12, summarize_history: bool = True,
+                 resilience: ResilientCaller = None, backend: ChatBackend = None, offline_fallback: bool = True):
+        # Local fact answers, used on their own without a key and as Gemini's fallback
+        self.offline_backend = LocalFactBackend()
+        if backend is None:
+            from dotenv import load_dotenv
+
+            # Load environment variables from .env file
+            load_dotenv()
+            if not api_key:
+                # Try to get from environment variable (from .env file)
+                api_key = os.getenv('GEMINI_API_KEY')
+                if api_key:
+                    print(f"API key found: {api_key[:10]}...")  # Debug: show first 10 chars
+                else:
+                    print("No API key found in .env file, answering from built-in facts")
+            if api_key:
+                try:
+                    backend = GeminiBackend(api_key, model_name, pool, resilience,
+                                            self.offline_backend if offline_fallback else None)
+                except Exception as e:
+                    print(f"ERROR initializing model: {e}")
+                    raise
+            else:
+                backend = self.offline_backend
+        self.backend = backend
+        self.model_name = model_name
+
         self.conversation_history = {}
+        self.prompt_token_budget = prompt_token_budget
+        self.history_capacity = history_capacity
+        self.summarize_history = summarize_history
         
         # Character-specific prompts
         self.character_prompts = {
@@ -47,52 +235,107 @@ class ConversationManager:
             Keep responses conversational and educational, suitable for children learning about rainforest conservation. Respond as if you're talking directly to the player.
             Must keep responses short and concis, less than 100 characterse"""
         }
+        # System prompts with the source indentation squeezed out, built once
+        self._system_prompts = {
+            name: " ".join(line.strip() for line in prompt.splitlines() if line.strip())
+            for name, prompt in self.character_prompts.items()
+        }
 
     def start_conversation(self, character_name: str, player_name: str) -> str:
         """Start a new conversation with a character"""
-        if character_name not in self.character_prompts:
+        request = self.greeting_request(character_name, player_name)
+        if request is None:
             return "I don't know that character."
         
-        prompt = f"{self.character_prompts[character_name]}\n\nPlayer's name is {player_name}. Start a friendly conversation by introducing yourself and asking how you can help them learn about rainforest conservation."
-        
         try:
             print(f"Starting conversation with {character_name} for {player_name}")
-            response = self.model.generate_content(prompt)
-            print(f"Response received: {response.text[:100]}...")  # Debug: show first 100 chars
-            return response.text
+            response_text = self.generate_text(request)
+            print(f"Response received: {response_text[:100]}...")  # Debug: show first 100 chars
+            return response_text
         except Exception as e:
             print(f"ERROR in start_conversation: {e}")
-            return f"Hello {player_name}! I'm having trouble connecting right now, but I'd love to talk about rainforest conservation with you! (Error: {str(e)})"
+            return self.greeting_error(player_name, e)
 
     def continue_conversation(self, character_name: str, player_message: str, conversation_id: str = "default") -> str:
         """Continue an existing conversation"""
-        if character_name not in self.character_prompts:
+        request = self.reply_request(character_name, player_message, conversation_id)
+        if request is None:
             return "I don't know that character."
         
-        # Get or create conversation history
-        if conversation_id not in self.conversation_history:
-            self.conversation_history[conversation_id] = []
-        
-        # Add player message to history
-        self.conversation_history[conversation_id].append({"role": "user", "content": player_message})
-        
-        # Create context with character prompt and conversation history
-        context = f"{self.character_prompts[character_name]}\n\nPrevious conversation:\n"
-        for msg in self.conversation_history[conversation_id][-5:]:  # Last 5 messages for context
-            context += f"{msg['role']}: {msg['content']}\n"
-        
         try:
             print(f"Continuing conversation with {character_name}")
-            response = self.model.generate_content(context)
-            response_text = response.text
+            response_text = self.generate_text(request)
             
             # Add character response to history
-            self.conversation_history[conversation_id].append({"role": "assistant", "content": response_text})
+            self.record_reply(conversation_id, response_text)
             
             return response_text
         except Exception as e:
             print(f"ERROR in continue_conversation: {e}")
-            return f"I'm having trouble responding right now. Could you try again? (Error: {str(e)})"
+            return self.reply_error(e)
+
+    # The steps below are shared with ConversationService, which runs them concurrently.
+
+    def greeting_request(self, character_name: str, player_name: str):
+        """ChatRequest for a character's opening line, or None for an unknown character."""
+        if character_name not in self.character_prompts:
+            return None
+        prompt = f"{self._system_prompts[character_name]}\n\nPlayer's name is {player_name}. Start a friendly conversation by introducing yourself and asking how you can help them learn about rainforest conservation."
+        return ChatRequest(prompt, character_name, player_name)
+
+    def reply_request(self, character_name: str, player_message: str, conversation_id: str = "default"):
+        """Record the player's message and return the ChatRequest for the reply, or None for an unknown character."""
+        if character_name not in self.character_prompts:
+            return None
+        
+        # Get or create conversation history
+        if conversation_id not in self.conversation_history:
+            self.conversation_history[conversation_id] = ConversationHistory(self.history_capacity, self.summarize_history)
+        history = self.conversation_history[conversation_id]
+        
+        # Add player message to history
+        history.append("user", player_message)
+        
+        # Create context with character prompt and as much recent history as the budget allows
+        prompt = self.build_prompt(character_name, history)
+        return ChatRequest(prompt, character_name, player_message=player_message, conversation_id=conversation_id)
+
+    def record_reply(self, conversation_id: str, response_text: str):
+        self.conversation_history[conversation_id].append("assistant", response_text)
+
+    def greeting_error(self, player_name: str, error: Exception) -> str:
+        return f"Hello {player_name}! I'm having trouble connecting right now, but I'd love to talk about rainforest conservation with you! (Error: {str(error)})"
+
+    def reply_error(self, error: Exception) -> str:
+        return f"I'm having trouble responding right now. Could you try again? (Error: {str(error)})"
+
+    def build_prompt(self, character_name: str, history: ConversationHistory) -> str:
+        """System prompt, summary of older turns, then the newest turns that fit the token budget."""
+        system_prompt = self._system_prompts[character_name]
+        budget = self.prompt_token_budget - estimate_tokens(system_prompt)
+        recent = []
+        for msg in reversed(history.messages):
+            if recent and msg["tokens"] > budget:
+                break  # always keep the newest turn, even if it is long
+            recent.append(f"{msg['role']}: {msg['content']}")
+            budget -= msg["tokens"]
+        parts = [system_prompt, ""]
+        dropped = len(history) - len(recent)
+        if history.summary and dropped == 0 and budget > estimate_tokens(history.summary):
+            parts.append(f"Earlier in the conversation: {history.summary}")
+        parts.append("Previous conversation:")
+        parts.extend(reversed(recent))
+        return "\n".join(parts) + "\n"
+
+    def generate_text(self, request) -> str:
+        """Backend answer for a ChatRequest (or a bare prompt string).
+
+        With the Gemini backend this may be a cached or offline answer, and
+        resilience.ModelUnavailable is raised when there is nothing to fall back on.
+        """
+        if isinstance(request, str):
+            request = ChatRequest(request)
+        return self.backend.generate(request)
 
     def get_conversation_suggestions(self, character_name: str) -> List[str]:
         """Get suggested conversation topics for each character"""
@@ -121,4 +364,21 @@ class ConversationManager:
     def clear_conversation(self, conversation_id: str = "default"):
         """Clear conversation history"""
         if conversation_id in self.conversation_history:
-            del self.conversation_history[conversation_id] 
\ No newline at end of file
+            del self.conversation_history[conversation_id]
+
+
+_shared_manager = None
+_shared_manager_lock = threading.Lock()
+
+
+def get_conversation_manager() -> ConversationManager:
+    """The process-wide ConversationManager, created on first use.
+
+    Sharing it keeps each conversation's history alive between visits to the
+    chat screen. Without an API key it answers from the built-in facts.
+    """
+    global _shared_manager
+    with _shared_manager_lock:
+        if _shared_manager is None:
+            _shared_manager = ConversationManager()
+        return _shared_manager
@@ -0,0 +1,226 @@
+import asyncio
+import atexit
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+# Conversation service for running many chats (kiosk stations, load tests)
+# through one ConversationManager. It runs on an asyncio loop:
+# - at most max_concurrency model calls are in flight,
+# - a request identical to one already queued or in flight (the same greeting,
+#   or a session repeating its last message) waits for that one's answer
+#   without taking a queue slot or a worker,
+# - sessions take turns round-robin, and each session's requests run in order,
+# - a session can queue at most max_pending_per_session requests (ServiceBusy
+#   beyond that) and callers wait once max_pending requests are queued overall,
+# - a session is forgotten once it has nothing queued.
+
+
+def chat_session_id(player_name, character_name):
+    """Session id for one player's chat with one character."""
+    return f"{player_name}:{character_name}"
+
+
+class ServiceBusy(Exception):
+    """Raised when a session already has too many requests waiting."""
+
+
+class _Session:
+    def __init__(self):
+        self.jobs = deque()
+        self.scheduled = False  # waiting in the ready ring or being served
+
+
+class ConversationService:
+    def __init__(self, manager, max_concurrency=4, max_pending=256, max_pending_per_session=4, executor=None):
+        self.manager = manager
+        self.max_concurrency = max_concurrency
+        self.max_pending = max_pending
+        self.max_pending_per_session = max_pending_per_session
+        self._executor = executor or ThreadPoolExecutor(max_concurrency, thread_name_prefix='conversation')
+        self._sessions = {}
+        self._ready = deque()
+        self._inflight = {}  # dedup key -> future of the request that will answer it
+        self._workers = []
+        self._wakeup = None
+        self._pending = None
+        self.stats = {'requests': 0, 'model_calls': 0, 'coalesced': 0, 'rejected': 0}
+
+    async def start(self):
+        self._wakeup = asyncio.Condition()
+        self._pending = asyncio.Semaphore(self.max_pending)
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(self.max_concurrency)]
+
+    async def stop(self):
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    async def start_conversation(self, session_id, character_name, player_name):
+        request = self.manager.greeting_request(character_name, player_name)
+        if request is None:
+            return "I don't know that character."
+        # The greeting prompt only depends on the character and player name
+        return await self._submit(session_id, lambda: self._greeting(request, player_name), key=request.prompt)
+
+    async def continue_conversation(self, session_id, character_name, player_message):
+        # A reply's prompt depends on the session's history, so only a repeat of
+        # the same message in the same session can share an answer
+        key = ('reply', session_id, character_name, player_message)
+        return await self._submit(session_id, lambda: self._reply(session_id, character_name, player_message), key)
+
+    async def _submit(self, session_id, job, key=None):
+        shared = self._inflight.get(key) if key is not None else None
+        if shared is not None:
+            self.stats['requests'] += 1
+            self.stats['coalesced'] += 1
+            return await asyncio.shield(shared)
+        session = self._sessions.get(session_id)
+        if session is not None and len(session.jobs) >= self.max_pending_per_session:
+            self.stats['rejected'] += 1
+            raise ServiceBusy(f"Too many requests waiting for {session_id}")
+        future = asyncio.get_running_loop().create_future()
+        if key is not None:
+            # Registered before waiting for a queue slot, so duplicates arriving meanwhile find it
+            self._inflight[key] = future
+            future.add_done_callback(lambda done: self._forget(key, done))
+        try:
+            await self._pending.acquire()
+        except BaseException:
+            future.cancel()
+            raise
+        try:
+            self.stats['requests'] += 1
+            # Looked up again: the worker may have dropped the session while we waited
+            session = self._sessions.setdefault(session_id, _Session())
+            session.jobs.append((job, future))
+            if not session.scheduled:
+                session.scheduled = True
+                async with self._wakeup:
+                    self._ready.append(session_id)
+                    self._wakeup.notify()
+            # Shielded so a caller giving up doesn't cancel the answer others are waiting for
+            return await asyncio.shield(future)
+        finally:
+            self._pending.release()
+
+    def _forget(self, key, future):
+        if self._inflight.get(key) is future:
+            del self._inflight[key]
+
+    async def _worker(self):
+        while True:
+            async with self._wakeup:
+                while not self._ready:
+                    await self._wakeup.wait()
+                session_id = self._ready.popleft()
+            session = self._sessions[session_id]
+            job, future = session.jobs.popleft()
+            try:
+                result = await job()
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+            else:
+                if not future.done():
+                    future.set_result(result)
+            # Back of the ring if it has more work, so other sessions get a turn first
+            if session.jobs:
+                async with self._wakeup:
+                    self._ready.append(session_id)
+                    self._wakeup.notify()
+            else:
+                session.scheduled = False
+                del self._sessions[session_id]
+
+    async def _generate(self, request):
+        self.stats['model_calls'] += 1
+        return await asyncio.get_running_loop().run_in_executor(self._executor, self.manager.generate_text, request)
+
+    async def _greeting(self, request, player_name):
+        try:
+            return await self._generate(request)
+        except Exception as e:
+            print(f"ERROR in start_conversation: {e}")
+            return self.manager.greeting_error(player_name, e)
+
+    async def _reply(self, session_id, character_name, player_message):
+        request = self.manager.reply_request(character_name, player_message, session_id)
+        if request is None:
+            return "I don't know that character."
+        try:
+            response_text = await self._generate(request)
+        except Exception as e:
+            print(f"ERROR in continue_conversation: {e}")
+            return self.manager.reply_error(e)
+        self.manager.record_reply(session_id, response_text)
+        return response_text
+
+
+class ConversationClient:
+    """Thin synchronous front end for the game loop.
+
+    Runs a ConversationService on its own event loop thread and returns
+    concurrent.futures.Future objects, so a screen can poll for the answer
+    instead of blocking the frame.
+    """
+
+    def __init__(self, service):
+        self.service = service
+        self._greetings = {}
+        self._greetings_lock = threading.Lock()
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, name='conversation-service', daemon=True)
+        self.thread.start()
+        asyncio.run_coroutine_threadsafe(service.start(), self.loop).result()
+
+    def start_conversation(self, session_id, character_name, player_name):
+        return asyncio.run_coroutine_threadsafe(
+            self.service.start_conversation(session_id, character_name, player_name), self.loop)
+
+    def greeting(self, session_id, character_name, player_name):
+        """The session's greeting future, started now unless it already was.
+
+        Calling this early (e.g. when the player points at Learn Facts) fetches
+        the greeting while they decide, so their first question only waits
+        for one answer. Each session is greeted once.
+        """
+        with self._greetings_lock:
+            future = self._greetings.get(session_id)
+            if future is None:
+                future = self.start_conversation(session_id, character_name, player_name)
+                self._greetings[session_id] = future
+            return future
+
+    def continue_conversation(self, session_id, character_name, player_message):
+        return asyncio.run_coroutine_threadsafe(
+            self.service.continue_conversation(session_id, character_name, player_message), self.loop)
+
+    def get_conversation_suggestions(self, character_name):
+        return self.service.manager.get_conversation_suggestions(character_name)
+
+    def close(self):
+        asyncio.run_coroutine_threadsafe(self.service.stop(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+
+
+_shared_client = None
+_shared_client_lock = threading.Lock()
+
+
+def get_conversation_client():
+    """The process-wide ConversationClient, built on the shared ConversationManager."""
+    global _shared_client
+    with _shared_client_lock:
+        if _shared_client is None:
+            from conversation import get_conversation_manager
+            _shared_client = ConversationClient(ConversationService(get_conversation_manager()))
+            atexit.register(_shared_client.close)
+        return _shared_client
+
+
+def ready_conversation_client():
+    """The process-wide ConversationClient if it has been built, else None (never builds it)."""
+    return _shared_client
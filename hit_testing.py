@@ -0,0 +1,107 @@
+import pygame
+
+# Shared hit testing for clicks and drags.
+# GridHitTester maps a point to a grid cell with arithmetic instead of testing
+# every cell. SpatialIndex buckets draggable objects by screen area and keeps
+# a z-order, so a pick only looks at the objects near the cursor and returns
+# the one drawn on top.
+
+
+class GridHitTester:
+    def __init__(self, left, top, cell_size, grid_size, margin=0):
+        self.left = left
+        self.top = top
+        self.cell_size = cell_size
+        self.grid_size = grid_size
+        self.margin = margin
+        self.stride = cell_size + margin
+
+    def index_at(self, pos):
+        """Flat cell index (row * grid_size + col) under pos, or None for margins and outside."""
+        dx = pos[0] - self.left
+        dy = pos[1] - self.top
+        if dx < 0 or dy < 0:
+            return None
+        col, x_in_cell = divmod(dx, self.stride)
+        row, y_in_cell = divmod(dy, self.stride)
+        if col >= self.grid_size or row >= self.grid_size:
+            return None
+        if x_in_cell >= self.cell_size or y_in_cell >= self.cell_size:
+            return None
+        return int(row) * self.grid_size + int(col)
+
+    def cell_rect(self, index):
+        row, col = divmod(index, self.grid_size)
+        return pygame.Rect(self.left + col * self.stride, self.top + row * self.stride, self.cell_size, self.cell_size)
+
+
+class SpatialIndex:
+    def __init__(self, bucket_size=64):
+        self.bucket_size = bucket_size
+        self.buckets = {}
+        self.rects = {}
+        self.z = {}
+        self.next_z = 0
+
+    def _bucket_keys(self, rect):
+        size = self.bucket_size
+        for bx in range(rect.left // size, (rect.right - 1) // size + 1):
+            for by in range(rect.top // size, (rect.bottom - 1) // size + 1):
+                yield bx, by
+
+    def insert(self, key, rect):
+        """Add key with its bounding rect on top of everything already indexed."""
+        rect = pygame.Rect(rect)
+        self.rects[key] = rect
+        self.z[key] = self.next_z
+        self.next_z += 1
+        for bucket in self._bucket_keys(rect):
+            self.buckets.setdefault(bucket, set()).add(key)
+
+    def remove(self, key):
+        rect = self.rects.pop(key)
+        del self.z[key]
+        for bucket in self._bucket_keys(rect):
+            items = self.buckets[bucket]
+            items.discard(key)
+            if not items:
+                del self.buckets[bucket]
+
+    def move(self, key, rect):
+        """Update key's bounding rect, keeping its place in the z-order (raise_to_top changes that)."""
+        rect = pygame.Rect(rect)
+        old = set(self._bucket_keys(self.rects[key]))
+        new = set(self._bucket_keys(rect))
+        self.rects[key] = rect
+        for bucket in old - new:
+            items = self.buckets[bucket]
+            items.discard(key)
+            if not items:
+                del self.buckets[bucket]
+        for bucket in new - old:
+            self.buckets.setdefault(bucket, set()).add(key)
+
+    def raise_to_top(self, key):
+        """Put key above everything else."""
+        self.z[key] = self.next_z
+        self.next_z += 1
+
+    def pick(self, pos, hit=None):
+        """Topmost key whose rect contains pos, or None.
+
+        hit(key, pos) can refine the rect test, e.g. for round objects.
+        """
+        bucket = (int(pos[0]) // self.bucket_size, int(pos[1]) // self.bucket_size)
+        best, best_z = None, None
+        for key in self.buckets.get(bucket, ()):
+            if not self.rects[key].collidepoint(pos):
+                continue
+            if hit is not None and not hit(key, pos):
+                continue
+            if best_z is None or self.z[key] > best_z:
+                best, best_z = key, self.z[key]
+        return best
+
+    def in_draw_order(self):
+        """Keys from bottom to top."""
+        return sorted(self.z, key=self.z.get)
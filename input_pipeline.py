@@ -0,0 +1,72 @@
+import pygame
+from window import WINDOW_EVENTS
+
+# Shared event handling for the main loop and the minigames. Each loop tells
+# the pipeline which event types it handles and the rest are blocked at the
+# SDL queue (QUIT and window events always get through), so a screen that
+# ignores the mouse never receives a flood of MOUSEMOTION events. Each frame's
+# events are read in one go, and consecutive motion events are folded into
+# one carrying the latest position and the summed movement, so a drag is
+# applied once per frame however fast the mouse moves. Handlers are looked up
+# by event type.
+
+ALWAYS_ALLOWED = (pygame.QUIT,) + WINDOW_EVENTS
+# pygame fills in KEYDOWN's unicode from the TEXTINPUT event that follows it
+COMPANION_EVENTS = {pygame.KEYDOWN: (pygame.TEXTINPUT,)}
+
+
+class InputPipeline:
+    def __init__(self):
+        self.allowed = None  # None: SDL queues everything
+        self.received = 0
+        self.delivered = 0
+
+    def allow(self, event_types):
+        """Only queue event_types (plus ALWAYS_ALLOWED) from now on; None lets everything through."""
+        if event_types is None:
+            allowed = None
+        else:
+            allowed = set(event_types) | set(ALWAYS_ALLOWED)
+            for event_type in list(allowed):
+                allowed.update(COMPANION_EVENTS.get(event_type, ()))
+            allowed = frozenset(allowed)
+        if allowed == self.allowed:
+            return
+        previous, self.allowed = self.allowed, allowed
+        if allowed is None:
+            pygame.event.set_allowed(None)
+        elif previous is None:
+            # Blocking a type drops its queued events, so keep the ones still wanted
+            kept = pygame.event.get(list(allowed))
+            pygame.event.set_blocked(None)
+            pygame.event.set_allowed(list(allowed))
+            for event in kept:
+                pygame.event.post(event)
+        else:
+            if previous - allowed:
+                pygame.event.set_blocked(list(previous - allowed))
+            pygame.event.set_allowed(list(allowed))
+
+    def poll(self):
+        """This frame's events, oldest first, with each run of MOUSEMOTION events collapsed into the last one."""
+        events = []
+        for event in pygame.event.get():
+            self.received += 1
+            if event.type == pygame.MOUSEMOTION and events and events[-1].type == pygame.MOUSEMOTION:
+                previous = events[-1]
+                event.rel = (previous.rel[0] + event.rel[0], previous.rel[1] + event.rel[1])
+                events[-1] = event
+                continue
+            events.append(event)
+        self.delivered += len(events)
+        return events
+
+    def dispatch(self, handlers, default=None):
+        """Poll, then call handlers[event.type](event), or default(event) for other types, for each event."""
+        for event in self.poll():
+            handler = handlers.get(event.type, default)
+            if handler is not None:
+                handler(event)
+
+
+input_pipeline = InputPipeline()
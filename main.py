@@ -1,9 +1,12 @@
 import pygame
 from screens import OpeningScreen, CharacterSelectScreen, HomeScreen, InteractionScreen, NameInputScreen, ConversationScreen, SVDExplanationScreen, EndingScreen, GameInstructionsScreen
-from minigames.fire_invaders import FireInvadersMinigame
-from minigames.puzzle import PuzzleMinigame
-from minigames.drag_nest import DragNestMinigame
+from stages import ANY_RESULT, StageMachine
+from sound_bank import get_sound_bank
+from input_pipeline import input_pipeline
+from window import FULLSCREEN_KEY, Window
+import importlib
 import os
+import threading
 
 # Game settings
 SCREEN_WIDTH, SCREEN_HEIGHT = 960, 640
@@ -24,7 +27,61 @@ STAGE_ENDING = 'ending'
 BG_STAGES = [
     os.path.join('assets', 'compressed_backgrounds', f'compressed_stage_{i}.png') for i in range(1, 5)
 ]
-VICTORY_SOUND = os.path.join('assets', 'sounds', 'victory.wav')
+
+# Minigame played with each animal, as (module, class) so it is imported on first use
+MINIGAMES = {
+    'Capybara': ('minigames.fire_invaders', 'FireInvadersMinigame'),
+    'Jaguar': ('minigames.puzzle', 'PuzzleMinigame'),
+    'Macaw': ('minigames.drag_nest', 'DragNestMinigame'),
+}
+
+# Modules not needed for the opening screen, warmed up in the background once it is shown
+BACKGROUND_IMPORTS = [
+    'dotenv',
+    'google.generativeai',
+    'conversation',
+    'conversation_service',
+    'minigames.fire_invaders',
+    'minigames.puzzle',
+    'minigames.drag_nest',
+]
+
+
+def load_minigame(animal):
+    entry = MINIGAMES.get(animal)
+    if entry is None:
+        return None
+    module_name, class_name = entry
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def warm_conversation_client():
+    """Build the shared chat client (dotenv, model setup, service loop thread) off the frame loop."""
+    from conversation_service import get_conversation_client
+    get_conversation_client()
+
+
+# Run on the preload thread after the imports
+BACKGROUND_WARMUPS = [warm_conversation_client]
+
+
+def preload_modules(module_names, warmups=()):
+    """Import module_names, then call each of warmups, on a daemon thread so first use doesn't stall a frame."""
+    def worker():
+        for name in module_names:
+            try:
+                importlib.import_module(name)
+            except Exception as e:
+                print(f"Could not preload {name}: {e}")
+        for warmup in warmups:
+            try:
+                warmup()
+            except Exception as e:
+                print(f"Could not warm up {warmup.__name__}: {e}")
+
+    thread = threading.Thread(target=worker, name='preload-modules', daemon=True)
+    thread.start()
+    return thread
 
 
 def fade_in(screen, draw_func, duration=700):
@@ -39,135 +96,201 @@ def fade_in(screen, draw_func, duration=700):
         clock.tick(60)
 
 
+class GameState:
+    """Progress shared by every stage of a play session."""
+
+    def __init__(self, screen):
+        self.screen = screen
+        self.selected_character = None
+        self.player_name = "Player"  # Placeholder for now
+        self.interaction_target = None
+        self.bg_stage = 0
+        self.completed_interactions = set()
+        self.victory_played = False
+        self.victory_message_shown = False
+        self.ending_triggered = False
+        self.home_entry_time = None
+
+    @property
+    def background_path(self):
+        return BG_STAGES[self.bg_stage]
+
+    def advance_background(self):
+        if self.bg_stage < len(BG_STAGES) - 1:
+            self.bg_stage += 1
+
+
+def build_stage_machine(state):
+    machine = StageMachine(state)
+
+    # Screens, built once and reset on later visits
+    machine.add_stage(STAGE_OPENING, lambda s: OpeningScreen(s.screen),
+                      lambda screen, s: screen.reset())
+    machine.add_stage(STAGE_CHARACTER_SELECT, lambda s: CharacterSelectScreen(s.screen),
+                      lambda screen, s: screen.reset())
+    machine.add_stage(STAGE_NAME_INPUT, lambda s: NameInputScreen(s.screen),
+                      lambda screen, s: screen.reset())
+    machine.add_stage(STAGE_SVD_EXPLANATION, lambda s: SVDExplanationScreen(s.screen),
+                      lambda screen, s: screen.reset())
+    machine.add_stage(STAGE_GAME_INSTRUCTIONS, lambda s: GameInstructionsScreen(s.screen),
+                      lambda screen, s: screen.reset())
+    machine.add_stage(STAGE_HOME,
+                      lambda s: HomeScreen(s.screen, s.selected_character, s.player_name, s.background_path),
+                      lambda screen, s: screen.reset(s.background_path),
+                      lambda s: (s.selected_character, s.player_name) if s.selected_character else None)
+    machine.add_stage(STAGE_INTERACTION,
+                      lambda s: InteractionScreen(s.screen, s.interaction_target, s.player_name),
+                      lambda screen, s: screen.reset(),
+                      lambda s: s.interaction_target)
+    machine.add_stage(STAGE_CONVERSATION,
+                      lambda s: ConversationScreen(s.screen, s.interaction_target, s.player_name),
+                      lambda screen, s: screen.reset(),
+                      lambda s: (s.interaction_target, s.player_name) if s.interaction_target else None)
+    machine.add_stage(STAGE_ENDING, lambda s: EndingScreen(s.screen),
+                      lambda screen, s: screen.reset())
+
+    # Transitions, keyed by (stage, screen result)
+    def select_character(s, result):
+        s.selected_character = result
+        return STAGE_NAME_INPUT
+
+    def enter_name(s, result):
+        s.player_name = result
+        return STAGE_SVD_EXPLANATION
+
+    def go_home_with_fade(s, result):
+        home_screen = machine.get_screen(STAGE_HOME)
+        fade_in(s.screen, home_screen.draw)
+        return STAGE_HOME
+
+    def go_home(s, result):
+        s.interaction_target = None
+        s.home_entry_time = pygame.time.get_ticks()
+        return STAGE_HOME
+
+    def meet_animal(s, result):
+        # result is the name of the character to interact with
+        s.interaction_target = result
+        return STAGE_INTERACTION
+
+    def play_minigame(s, result):
+        minigame = load_minigame(s.interaction_target)
+        if minigame is not None:
+            minigame(s.screen).run()
+            s.completed_interactions.add(s.interaction_target)
+        s.advance_background()
+        # After minigame, return to a fresh interaction screen
+        return STAGE_INTERACTION
+
+    def finish_conversation(s, result):
+        # Mark conversation as completed for this animal
+        s.completed_interactions.add(f'facts_{s.interaction_target}')
+        s.advance_background()
+        return STAGE_INTERACTION
+
+    machine.add_transition(STAGE_OPENING, 'next', lambda s, r: STAGE_CHARACTER_SELECT,
+                           targets=[STAGE_CHARACTER_SELECT])
+    machine.add_transition(STAGE_CHARACTER_SELECT, ANY_RESULT, select_character,
+                           targets=[STAGE_NAME_INPUT])
+    machine.add_transition(STAGE_NAME_INPUT, ANY_RESULT, enter_name,
+                           targets=[STAGE_SVD_EXPLANATION])
+    machine.add_transition(STAGE_SVD_EXPLANATION, 'game_instructions', lambda s, r: STAGE_GAME_INSTRUCTIONS,
+                           targets=[STAGE_GAME_INSTRUCTIONS])
+    machine.add_transition(STAGE_GAME_INSTRUCTIONS, 'home', go_home_with_fade,
+                           targets=[STAGE_HOME])
+    machine.add_transition(STAGE_HOME, ANY_RESULT, meet_animal)
+    machine.add_transition(STAGE_INTERACTION, 'back', go_home)
+    machine.add_transition(STAGE_INTERACTION, 'minigame', play_minigame)
+    machine.add_transition(STAGE_INTERACTION, 'facts', lambda s, r: STAGE_CONVERSATION,
+                           targets=[STAGE_CONVERSATION])
+    machine.add_transition(STAGE_CONVERSATION, 'back', finish_conversation)
+    machine.add_transition(STAGE_ENDING, 'explore', go_home)
+    return machine
+
+
 def main():
+    # Small mixer buffer so effects start within a frame of being triggered
+    pygame.mixer.pre_init(44100, -16, 2, 512)
     pygame.init()
-    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    # Drawn at SCREEN_WIDTH x SCREEN_HEIGHT and scaled to the window; RR_FULLSCREEN=1 starts fullscreen
+    window = Window((SCREEN_WIDTH, SCREEN_HEIGHT), fullscreen=bool(os.getenv('RR_FULLSCREEN')))
+    screen = window.open()
     pygame.display.set_caption('Rainforest Revival')
     clock = pygame.time.Clock()
-    pygame.mixer.init()
-
-    # Start at opening screen
-    stage = STAGE_OPENING
-    current_screen = OpeningScreen(screen)
-    selected_character = None
-    player_name = "Player"  # Placeholder for now
-    interaction_target = None
-    bg_stage = 0
-    completed_interactions = set()
-    victory_played = False
-    victory_message_shown = False
-    ending_triggered = False
-    home_entry_time = None
+    try:
+        pygame.mixer.init()
+    except pygame.error as e:
+        print(f"Sound disabled: {e}")
 
+    state = GameState(screen)
+    machine = build_stage_machine(state)
+    if os.getenv('RR_STAGE_TIMING'):
+        machine.timing_hooks.append(
+            lambda previous, stage, ms: print(f"Stage {previous} -> {stage}: {ms:.1f} ms"))
+        machine.prefetch_hooks.append(
+            lambda stage, ms: print(f"Prefetched {stage}: {ms:.1f} ms"))
 
+    # Start at opening screen and show it before loading anything else
+    machine.enter(STAGE_OPENING)
+    machine.current_screen.draw()
+    pygame.display.flip()
+    preload_modules(BACKGROUND_IMPORTS, BACKGROUND_WARMUPS)
+    # Decodes victory.wav and builds the minigame effects on a worker thread
+    sound_bank = get_sound_bank()
 
     running = True
+
+    def quit_game(event):
+        nonlocal running
+        running = False
+
+    def screen_event(event):
+        # Let the current screen handle events
+        machine.dispatch(machine.current_screen.handle_event(event))
+
+    def key_down(event):
+        if event.key == FULLSCREEN_KEY:
+            window.toggle_fullscreen()
+        else:
+            screen_event(event)
+
+    handlers = {pygame.QUIT: quit_game, pygame.KEYDOWN: key_down}
     while running:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                running = False
-            # Let the current screen handle events
-            result = current_screen.handle_event(event)
-            if stage == STAGE_ENDING and result == 'explore':
-                interaction_target = None
-                stage = STAGE_HOME
-                current_screen = HomeScreen(screen, selected_character, player_name, BG_STAGES[bg_stage])
-                home_entry_time = pygame.time.get_ticks()
-            if stage == STAGE_OPENING and result == 'next':
-                stage = STAGE_CHARACTER_SELECT
-                current_screen = CharacterSelectScreen(screen)
-            elif stage == STAGE_CHARACTER_SELECT and result:
-                selected_character = result
-                stage = STAGE_NAME_INPUT
-                current_screen = NameInputScreen(screen)
-            elif stage == STAGE_NAME_INPUT and result:
-                player_name = result
-                stage = STAGE_SVD_EXPLANATION
-                current_screen = SVDExplanationScreen(screen)
-            elif stage == STAGE_SVD_EXPLANATION and result == 'game_instructions':
-                stage = STAGE_GAME_INSTRUCTIONS
-                current_screen = GameInstructionsScreen(screen)
-            elif stage == STAGE_GAME_INSTRUCTIONS and result == 'home':
-                stage = STAGE_HOME
-                home_screen = HomeScreen(screen, selected_character, player_name, BG_STAGES[bg_stage])
-                fade_in(screen, home_screen.draw)
-                current_screen = home_screen
-            elif stage == STAGE_HOME and result and result != 'explore':
-                # result is the name of the character to interact with
-                interaction_target = result
-                stage = STAGE_INTERACTION
-                current_screen = InteractionScreen(screen, interaction_target)
-            elif stage == STAGE_INTERACTION and result:
-                if result == 'back':
-                    stage = STAGE_HOME
-                    current_screen = HomeScreen(screen, selected_character, player_name, BG_STAGES[bg_stage])
-                    home_entry_time = pygame.time.get_ticks()
-                elif result == 'minigame':
-                    # Launch the appropriate minigame
-                    if interaction_target == 'Capybara':
-                        FireInvadersMinigame(screen).run()
-                        completed_interactions.add('Capybara')
-                    elif interaction_target == 'Jaguar':
-                        PuzzleMinigame(screen).run()
-                        completed_interactions.add('Jaguar')
-                    elif interaction_target == 'Macaw':
-                        DragNestMinigame(screen).run()
-                        completed_interactions.add('Macaw')
-                    # Advance background stage if not at max
-                    if bg_stage < 3:
-                        bg_stage += 1
-                    # After minigame, return to interaction screen
-                    current_screen = InteractionScreen(screen, interaction_target)
-                elif result == 'facts':
-                    # Launch conversation screen
-                    stage = STAGE_CONVERSATION
-                    current_screen = ConversationScreen(screen, interaction_target, player_name)
-            elif stage == STAGE_CONVERSATION and result == 'back':
-                # Mark conversation as completed for this animal
-                completed_interactions.add(f'facts_{interaction_target}')
-                # Advance background stage if not at max
-                if bg_stage < 3:
-                    bg_stage += 1
-                # Return to interaction screen
-                stage = STAGE_INTERACTION
-                current_screen = InteractionScreen(screen, interaction_target)
+        # Only queue the events the current screen reads, plus keys for the fullscreen toggle
+        event_types = getattr(machine.current_screen, 'event_types', None)
+        input_pipeline.allow(None if event_types is None else event_types + (pygame.KEYDOWN,))
+        input_pipeline.dispatch(handlers, default=screen_event)
 
         # Play victory sound if at final stage and not already played
-        if bg_stage == 3 and not victory_played:
-            try:
-                pygame.mixer.music.load(VICTORY_SOUND)
-                pygame.mixer.music.play()
-                victory_played = True
-
-                font = pygame.font.SysFont('Arial', 28)
-                msg = "Head home right now to see clear background!"
-                text_surface = font.render(msg, True, (255, 255, 255))
-                screen.fill((0, 0, 0))
-                screen.blit(text_surface, (
-                    screen.get_width() // 2 - text_surface.get_width() // 2,
-                    screen.get_height() // 2 - text_surface.get_height() // 2
-                ))
-                pygame.display.flip()
-                pygame.time.delay(2000)
-                victory_message_shown = True
-            except Exception as e:
-                print(f"Could not play victory sound: {e}")
+        if state.bg_stage == len(BG_STAGES) - 1 and not state.victory_played:
+            sound_bank.play('victory', group='music')
+            state.victory_played = True
+
+            font = pygame.font.SysFont('Arial', 28)
+            msg = "Head home right now to see clear background!"
+            text_surface = font.render(msg, True, (255, 255, 255))
+            screen.fill((0, 0, 0))
+            screen.blit(text_surface, (
+                screen.get_width() // 2 - text_surface.get_width() // 2,
+                screen.get_height() // 2 - text_surface.get_height() // 2
+            ))
+            pygame.display.flip()
+            pygame.time.delay(2000)
+            state.victory_message_shown = True
 
-        current_screen.update()
-        # If on home screen, update background
-        if isinstance(current_screen, HomeScreen):
-            current_screen.set_background(BG_STAGES[bg_stage])
-        current_screen.draw()
+        machine.current_screen.update()
+        machine.current_screen.draw()
         # After going home once victory is triggered, go to ending screen
-        if stage == STAGE_HOME and victory_played and not ending_triggered:
-            if home_entry_time and pygame.time.get_ticks() - home_entry_time >= 3000:
-                stage = STAGE_ENDING
-                current_screen = EndingScreen(screen)
-                ending_triggered = True
+        if machine.stage == STAGE_HOME and state.victory_played and not state.ending_triggered:
+            if state.home_entry_time and pygame.time.get_ticks() - state.home_entry_time >= 3000:
+                machine.enter(STAGE_ENDING)
+                state.ending_triggered = True
         pygame.display.flip()
+        # Build the next likely screen while this frame has time to spare
+        machine.prefetch_next()
         clock.tick(FPS)
 
     pygame.quit()
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
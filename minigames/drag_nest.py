@@ -1,5 +1,9 @@
 import pygame
 import random
+from asset_resolver import load_image
+from hit_testing import SpatialIndex
+from input_pipeline import input_pipeline
+from sound_bank import get_sound_bank
 
 class DragNestMinigame:
     def __init__(self, screen):
@@ -12,6 +16,7 @@ class DragNestMinigame:
         self.width = screen.get_width()
         self.height = screen.get_height()
         self.nest_rect = pygame.Rect(self.width // 2 - 80, self.height // 2 + 100, 640, 320)
+        self.sounds = get_sound_bank()
         
         # Load image assets
         self.load_assets()
@@ -22,18 +27,15 @@ class DragNestMinigame:
         try:
             # Load background
             
-            self.background = pygame.image.load('assets/Minigame_assets/leaves.webp')
-            self.background = pygame.transform.scale(self.background, (self.width, self.height))
+            self.background = load_image('assets/Minigame_assets/leaves.webp', (self.width, self.height), smooth=False)
             
             # Load nest
-            self.nest_image = pygame.image.load('assets/Minigame_assets/empty_nest.png')
-            # Scale nest to fit the nest_rect size
-            self.nest_image = pygame.transform.scale(self.nest_image, (640, 320))
+            # Scaled to fit the nest_rect size
+            self.nest_image = load_image('assets/Minigame_assets/empty_nest.png', (640, 320), alpha=True, smooth=False)
             
             # Load egg
-            self.egg_image = pygame.image.load('assets/Minigame_assets/egg.png')
-            # Scale egg to match the original chick radius (64x64 to fit in circle of radius 32)
-            self.egg_image = pygame.transform.scale(self.egg_image, (64, 64))
+            # Scaled to match the original chick radius (64x64 to fit in circle of radius 32)
+            self.egg_image = load_image('assets/Minigame_assets/egg.png', (64, 64), alpha=True, smooth=False)
             
         except pygame.error as e:
             print(f"Error loading assets: {e}")
@@ -45,40 +47,74 @@ class DragNestMinigame:
     def reset_game(self):
         # Place 3 eggs at random positions (changed from chicks to eggs)
         self.eggs = []
-        for _ in range(3):
+        self.egg_radius = 32
+        # Spatial index over egg bounds; later eggs are drawn (and picked) on top
+        self.egg_index = SpatialIndex()
+        for i in range(3):
             x = random.randint(100, self.width - 100)
             y = random.randint(100, self.height // 2)
             self.eggs.append({'pos': [x, y], 'dragging': False, 'offset': (0, 0)})
-        self.egg_radius = 32
+            self.egg_index.insert(i, self.egg_bounds(i))
         self.selected = None
         self.game_over = False
 
+    def egg_bounds(self, i):
+        cx, cy = self.eggs[i]['pos']
+        return pygame.Rect(cx - self.egg_radius, cy - self.egg_radius, 2 * self.egg_radius, 2 * self.egg_radius)
+
+    def egg_hit(self, i, pos):
+        cx, cy = self.eggs[i]['pos']
+        return (pos[0] - cx) ** 2 + (pos[1] - cy) ** 2 < self.egg_radius ** 2
+
+    def pick_egg(self, pos):
+        """Start dragging the topmost egg under pos, if any."""
+        i = self.egg_index.pick(pos, self.egg_hit)
+        if i is None:
+            return
+        cx, cy = self.eggs[i]['pos']
+        self.eggs[i]['dragging'] = True
+        self.eggs[i]['offset'] = (cx - pos[0], cy - pos[1])
+        self.egg_index.raise_to_top(i)
+        self.selected = i
+        self.sounds.play('egg_pick')
+
+    def on_quit(self, event):
+        self.running = False
+
+    def on_mouse_down(self, event):
+        if event.button != 1:
+            return
+        if self.game_over and self.button_rect.collidepoint(event.pos):
+            self.running = False
+        elif not self.game_over:
+            self.pick_egg(event.pos)
+
+    def on_mouse_up(self, event):
+        if event.button == 1 and self.selected is not None:
+            self.eggs[self.selected]['dragging'] = False
+            self.sounds.play('egg_drop')
+            self.selected = None
+            if self.all_in_nest():
+                self.game_over = True
+
+    def on_mouse_motion(self, event):
+        # The pipeline hands over one motion event per run, at the latest position
+        if self.selected is not None and self.eggs[self.selected]['dragging']:
+            self.eggs[self.selected]['pos'][0] = event.pos[0] + self.eggs[self.selected]['offset'][0]
+            self.eggs[self.selected]['pos'][1] = event.pos[1] + self.eggs[self.selected]['offset'][1]
+            self.egg_index.move(self.selected, self.egg_bounds(self.selected))
+
     def run(self):
         clock = pygame.time.Clock()
+        handlers = {
+            pygame.QUIT: self.on_quit,
+            pygame.MOUSEBUTTONDOWN: self.on_mouse_down,
+            pygame.MOUSEBUTTONUP: self.on_mouse_up,
+            pygame.MOUSEMOTION: self.on_mouse_motion,
+        }
+        input_pipeline.allow(handlers)
         while self.running:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    self.running = False
-                if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-                    if self.game_over and self.button_rect.collidepoint(event.pos):
-                        self.running = False
-                    elif not self.game_over:
-                        for i, egg in enumerate(self.eggs):
-                            cx, cy = egg['pos']
-                            if (event.pos[0] - cx) ** 2 + (event.pos[1] - cy) ** 2 < self.egg_radius ** 2:
-                                egg['dragging'] = True
-                                egg['offset'] = (cx - event.pos[0], cy - event.pos[1])
-                                self.selected = i
-                if event.type == pygame.MOUSEBUTTONUP and event.button == 1:
-                    if self.selected is not None:
-                        self.eggs[self.selected]['dragging'] = False
-                        self.selected = None
-                        if self.all_in_nest():
-                            self.game_over = True
-                if event.type == pygame.MOUSEMOTION:
-                    if self.selected is not None and self.eggs[self.selected]['dragging']:
-                        self.eggs[self.selected]['pos'][0] = event.pos[0] + self.eggs[self.selected]['offset'][0]
-                        self.eggs[self.selected]['pos'][1] = event.pos[1] + self.eggs[self.selected]['offset'][1]
+            input_pipeline.dispatch(handlers)
             self.draw_game()
             pygame.display.flip()
             clock.tick(60)
@@ -112,8 +148,9 @@ class DragNestMinigame:
         win_text = self.small_font.render('To win, return all eggs to the nest!', True, (255, 255, 255))
         win_text_rect = win_text.get_rect(center=(self.width // 2, 25))
         self.screen.blit(win_text, win_text_rect)
-        # Draw eggs
-        for i, egg in enumerate(self.eggs):
+        # Draw eggs, bottom to top so the one being dragged stays in front
+        for i in self.egg_index.in_draw_order():
+            egg = self.eggs[i]
             if self.egg_image:
                 # Center the egg image on the egg position
                 egg_rect = self.egg_image.get_rect(center=egg['pos'])
@@ -1,7 +1,12 @@
 import pygame
 import random
+from asset_resolver import load_image
+from input_pipeline import input_pipeline
+from sound_bank import get_sound_bank
 
 class FireInvadersMinigame:
+    event_types = (pygame.MOUSEBUTTONDOWN, pygame.KEYDOWN)
+
     def __init__(self, screen):
         self.screen = screen
         self.font = pygame.font.SysFont('Arial', 36)
@@ -11,18 +16,17 @@ class FireInvadersMinigame:
         self.running = True
         self.width = screen.get_width()
         self.height = screen.get_height()
+        self.sounds = get_sound_bank()
         
         # Load assets
         try:
-            self.background = pygame.image.load('assets/Minigame_assets/leaves.webp')
-            self.background = pygame.transform.scale(self.background, (self.width, self.height))
+            self.background = load_image('assets/Minigame_assets/leaves.webp', (self.width, self.height), smooth=False)
         except pygame.error:
             print("Could not load background image, using default color")
             self.background = None
             
         try:
-            self.fire_sprite = pygame.image.load('assets/Minigame_assets/fire.png')
-            self.fire_sprite = pygame.transform.scale(self.fire_sprite, (44, 44))  # Scale to match original fire size
+            self.fire_sprite = load_image('assets/Minigame_assets/fire.png', (44, 44), alpha=True, smooth=False)  # Scale to match original fire size
         except pygame.error:
             print("Could not load fire sprite, using default circles")
             self.fire_sprite = None
@@ -62,8 +66,9 @@ class FireInvadersMinigame:
 
     def run(self):
         clock = pygame.time.Clock()
+        input_pipeline.allow(self.event_types)
         while self.running:
-            for event in pygame.event.get():
+            for event in input_pipeline.poll():
                 if event.type == pygame.QUIT:
                     self.running = False
                 if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
@@ -116,6 +121,7 @@ class FireInvadersMinigame:
                     if bullet in self.bullets:
                         self.bullets.remove(bullet)
                     self.score += 1
+                    self.sounds.play('fire_hit')
                     break
                     
         # Check if fire reached bottom
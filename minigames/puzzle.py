@@ -1,9 +1,17 @@
 import pygame
 import os
-import random
+from concurrent.futures import ThreadPoolExecutor
+from hit_testing import GridHitTester
+from minigames.puzzle_board import board_with_solution_length, is_solvable, random_board
+from minigames.puzzle_solver import PuzzleSolver
+from minigames.tile_atlas import get_tile_atlas
+from input_pipeline import input_pipeline
+from sound_bank import get_sound_bank
 
 class PuzzleMinigame:
-    def __init__(self, screen):
+    event_types = (pygame.MOUSEBUTTONDOWN, pygame.KEYDOWN)
+
+    def __init__(self, screen, grid_size=3, difficulty=None):
         self.screen = screen
         self.font = pygame.font.SysFont('Arial', 36)
         self.small_font = pygame.font.SysFont('Arial', 28)
@@ -12,79 +20,137 @@ class PuzzleMinigame:
         self.running = True
         self.width = screen.get_width()
         self.height = screen.get_height()
-        self.grid_size = 3
-        self.tile_size = 160
+        self.grid_size = grid_size
+        # Optimal solution length to aim for, None for a uniformly random board
+        self.difficulty = difficulty
         self.margin = 10
         self.puzzle_top = 100
+        # 160px tiles for 3x3, smaller tiles so bigger grids still fit
+        self.tile_size = min(160, (self.height - self.puzzle_top - 40 - (self.grid_size - 1) * self.margin) // self.grid_size)
         self.puzzle_left = (self.width - (self.grid_size * self.tile_size + (self.grid_size - 1) * self.margin)) // 2
+        self.hit_tester = GridHitTester(self.puzzle_left, self.puzzle_top, self.tile_size, self.grid_size, self.margin)
+        self.solver = PuzzleSolver(self.grid_size)
+        # A budget-exhausting 4x4 search takes over a second, so searches run on
+        # one worker thread (the only thread that touches the solver) and the
+        # result is picked up by a later frame
+        self.solver_node_budget = 200000
+        self.search_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix='puzzle-solver')
+        self.pending_search = None  # (kind, board, future)
+        self.auto_solve_delay = 15  # frames between auto-solve moves
+        self.sounds = get_sound_bank()
         self.reset_game()
 
     def reset_game(self):
-        # Load and slice rainforest image
+        # Sliced rainforest image, shared with earlier games of the same size
         img_path = os.path.join('assets', 'background', 'rainforest.png')
-        full_img = pygame.image.load(img_path).convert()
-        full_img = pygame.transform.smoothscale(full_img, (self.grid_size * self.tile_size, self.grid_size * self.tile_size))
-        self.tiles = []
-        for y in range(self.grid_size):
-            row = []
-            for x in range(self.grid_size):
-                rect = pygame.Rect(x * self.tile_size, y * self.tile_size, self.tile_size, self.tile_size)
-                surf = pygame.Surface((self.tile_size, self.tile_size))
-                surf.blit(full_img, (0, 0), rect)
-                row.append(surf)
-            self.tiles.append(row)
-        # Create board state (numbers 0-8, 0 is empty)
-        self.board = [i for i in range(self.grid_size * self.grid_size)]
-        while True:
-            random.shuffle(self.board)
-            if self.is_solvable(self.board) and not self.is_solved():
-                break
+        self.atlas, self.tiles = get_tile_atlas(img_path, self.grid_size, self.tile_size)
+        # Create board state (tiles 0 to grid_size**2 - 1, 0 is empty)
+        if self.difficulty:
+            # Found by searching on the worker; the solved board is shown (and input ignored) until then
+            self.board = list(range(self.grid_size * self.grid_size))
+            self.board_future = self.search_pool.submit(board_with_solution_length, self.grid_size, self.difficulty,
+                                                        self.solver, max_nodes=self.solver_node_budget)
+        else:
+            self.board = random_board(self.grid_size)
+            self.board_future = None
         self.game_over = False
+        self.hint_idx = None
+        self.auto_solving = False
+        self.auto_solve_timer = 0
+        self.auto_visited = set()  # boards auto-solve went through, so fallback moves don't repeat
 
     def is_solved(self):
         return self.board == list(range(self.grid_size * self.grid_size))
 
     def is_solvable(self, board):
-        inv = 0
-        for i in range(len(board)):
-            for j in range(i + 1, len(board)):
-                if board[i] and board[j] and board[i] > board[j]:
-                    inv += 1
-        return inv % 2 == 0
+        return is_solvable(board, self.grid_size)
 
     def run(self):
         clock = pygame.time.Clock()
+        input_pipeline.allow(self.event_types)
         while self.running:
-            for event in pygame.event.get():
+            for event in input_pipeline.poll():
                 if event.type == pygame.QUIT:
                     self.running = False
                 if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
                     if self.game_over and self.button_rect.collidepoint(event.pos):
                         self.running = False
-                    elif not self.game_over:
+                    elif not self.game_over and self.board_future is None:
                         self.handle_click(event.pos)
+                if event.type == pygame.KEYDOWN and not self.game_over and self.board_future is None:
+                    if event.key == pygame.K_h:
+                        self.show_hint()
+                    elif event.key == pygame.K_a:
+                        self.auto_solving = not self.auto_solving
+                        self.auto_solve_timer = 0
+                        self.auto_visited = {tuple(self.board)}
+            self.update_board()
+            self.update_search()
+            self.update_auto_solve()
             self.draw_game()
             pygame.display.flip()
             clock.tick(60)
+        self.search_pool.shutdown(wait=False, cancel_futures=True)
 
     def handle_click(self, pos):
-        x, y = pos
-        for row in range(self.grid_size):
-            for col in range(self.grid_size):
-                idx = row * self.grid_size + col
-                tile_x = self.puzzle_left + col * (self.tile_size + self.margin)
-                tile_y = self.puzzle_top + row * (self.tile_size + self.margin)
-                rect = pygame.Rect(tile_x, tile_y, self.tile_size, self.tile_size)
-                if rect.collidepoint(x, y):
-                    self.try_move(idx)
-                    return
+        idx = self.hit_tester.index_at(pos)
+        if idx is not None:
+            self.try_move(idx)
 
     def try_move(self, idx):
         empty_idx = self.board.index(0)
         if self.is_adjacent(idx, empty_idx):
             self.board[empty_idx], self.board[idx] = self.board[idx], self.board[empty_idx]
+            self.sounds.play('tile_slide')
+            self.hint_idx = None
             if self.is_solved():
                 self.game_over = True
+                self.auto_solving = False
+
+    def update_board(self):
+        """Start the game on the generated board once the worker has found it."""
+        if self.board_future is not None and self.board_future.done():
+            self.board = self.board_future.result()
+            self.board_future = None
+
+    def request_move(self, kind, avoid=()):
+        """Start searching for the next move on the worker, unless a search is already running."""
+        if self.pending_search is not None:
+            return
+        board = tuple(self.board)
+        future = self.search_pool.submit(self.solver.next_move, board, self.solver_node_budget, frozenset(avoid))
+        self.pending_search = (kind, board, future)
+
+    def update_search(self):
+        """Use a finished search, unless the board changed while it ran."""
+        if self.pending_search is None or not self.pending_search[2].done():
+            return
+        kind, board, future = self.pending_search
+        self.pending_search = None
+        move = future.result()
+        if board != tuple(self.board) or self.game_over:
+            return
+        if kind == 'hint':
+            self.hint_idx = move
+        elif self.auto_solving:
+            if move is None:
+                # Only moves back to boards already visited are left
+                self.auto_solving = False
+            else:
+                self.try_move(move)
+                self.auto_visited.add(tuple(self.board))
+
+    def show_hint(self):
+        """Highlight the tile that should move next on an optimal solution."""
+        self.request_move('hint')
+
+    def update_auto_solve(self):
+        if not self.auto_solving or self.game_over:
+            return
+        self.auto_solve_timer += 1
+        if self.auto_solve_timer >= self.auto_solve_delay:
+            self.auto_solve_timer = 0
+            self.request_move('auto', self.auto_visited)
 
     def is_adjacent(self, idx1, idx2):
         row1, col1 = divmod(idx1, self.grid_size)
@@ -103,6 +169,8 @@ class PuzzleMinigame:
                 if val != 0:
                     tile_img = self.tiles[val // self.grid_size][val % self.grid_size]
                     self.screen.blit(tile_img, (tile_x, tile_y))
+                if idx == self.hint_idx:
+                    pygame.draw.rect(self.screen, (255, 215, 0), (tile_x, tile_y, self.tile_size, self.tile_size), 4)
         # Draw grid lines
         for row in range(self.grid_size + 1):
             y = self.puzzle_top + row * (self.tile_size + self.margin) - self.margin // 2
@@ -110,6 +178,14 @@ class PuzzleMinigame:
         for col in range(self.grid_size + 1):
             x = self.puzzle_left + col * (self.tile_size + self.margin) - self.margin // 2
             pygame.draw.line(self.screen, (80, 80, 80), (x, self.puzzle_top), (x, self.puzzle_top + self.grid_size * (self.tile_size + self.margin) - self.margin), 2)
+        if self.board_future is not None:
+            help_text = self.small_font.render('Shuffling the tiles...', True, (255, 255, 255))
+            help_rect = help_text.get_rect(center=(self.width // 2, 50))
+            self.screen.blit(help_text, help_rect)
+        elif not self.game_over:
+            help_text = self.small_font.render('Press H for a hint, A to auto-solve', True, (255, 255, 255))
+            help_rect = help_text.get_rect(center=(self.width // 2, 50))
+            self.screen.blit(help_text, help_rect)
         # Draw win message
         if self.game_over:
             msg = 'You Win!'
@@ -0,0 +1,122 @@
+import random
+from functools import lru_cache
+
+# Board generation for the sliding puzzle. Boards use the same layout as
+# PuzzleMinigame: board[pos] is the tile at pos, 0 is the empty square and the
+# solved board is list(range(grid_size * grid_size)).
+
+
+def count_inversions(sequence):
+    """Count pairs i < j with sequence[i] > sequence[j] using a merge sort, O(n log n)."""
+    items = list(sequence)
+    buffer = items[:]
+    inversions = 0
+    width = 1
+    while width < len(items):
+        for start in range(0, len(items), 2 * width):
+            mid = min(start + width, len(items))
+            end = min(start + 2 * width, len(items))
+            i, j, k = start, mid, start
+            while i < mid and j < end:
+                if items[j] < items[i]:
+                    buffer[k] = items[j]
+                    inversions += mid - i  # everything left in the first half is larger
+                    j += 1
+                else:
+                    buffer[k] = items[i]
+                    i += 1
+                k += 1
+            buffer[k:k + mid - i] = items[i:mid]
+            k += mid - i
+            buffer[k:k + end - j] = items[j:end]
+        items, buffer = buffer, items
+        width *= 2
+    return inversions
+
+
+def is_solvable(board, grid_size):
+    """Whether board can reach the solved layout (empty square top-left).
+
+    On odd grids every move keeps the inversion parity, so it must be even.
+    On even grids a vertical move flips the inversion parity and the empty
+    square's row together, so their sum must be even instead.
+    """
+    inversions = count_inversions(tile for tile in board if tile)
+    if grid_size % 2:
+        return inversions % 2 == 0
+    blank_row = list(board).index(0) // grid_size
+    return (inversions + blank_row) % 2 == 0
+
+
+def random_board(grid_size, rng=random):
+    """A uniformly random solvable, unsolved board built in one shuffle.
+
+    Exactly half of all permutations are solvable and swapping two tiles flips
+    solvability, so a wrong-parity shuffle is fixed with one swap instead of
+    being thrown away.
+    """
+    size = grid_size * grid_size
+    board = list(range(size))
+    while True:
+        rng.shuffle(board)
+        if not is_solvable(board, grid_size):
+            first, second = [pos for pos in range(size) if board[pos]][:2]
+            board[first], board[second] = board[second], board[first]
+        if board != list(range(size)):
+            return board
+
+
+@lru_cache(maxsize=None)
+def neighbour_table(grid_size):
+    """Positions the empty square can move to from each position."""
+    table = []
+    for pos in range(grid_size * grid_size):
+        row, col = divmod(pos, grid_size)
+        neighbours = []
+        if row > 0:
+            neighbours.append(pos - grid_size)
+        if row < grid_size - 1:
+            neighbours.append(pos + grid_size)
+        if col > 0:
+            neighbours.append(pos - 1)
+        if col < grid_size - 1:
+            neighbours.append(pos + 1)
+        table.append(tuple(neighbours))
+    return tuple(table)
+
+
+def board_with_solution_length(grid_size, moves, solver, rng=random, max_nodes=100000, max_extra_steps=None):
+    """A board whose optimal solution is `moves` long, or the closest one found.
+
+    Walks randomly away from the solved board (never undoing the last move)
+    and measures the optimal distance with solver. Every move changes the
+    distance by exactly one, so the walk keeps going until it lands on the
+    target. When the solver runs out of max_nodes, its heuristic lower bound
+    is used as the distance, so very hard targets on big grids are approximate.
+    """
+    if moves < 1:
+        raise ValueError("moves must be at least 1")
+    if max_extra_steps is None:
+        max_extra_steps = 4 * moves
+    board = list(range(grid_size * grid_size))
+    blank, previous = 0, None
+
+    def step():
+        nonlocal blank, previous
+        pos = rng.choice([p for p in neighbour_table(grid_size)[blank] if p != previous])
+        board[blank], board[pos] = board[pos], 0
+        previous, blank = blank, pos
+
+    for _ in range(moves):
+        step()
+    best, best_gap = None, None
+    for _ in range(max_extra_steps + 1):
+        solution = solver.solve(board, max_nodes)
+        distance = len(solution) if solution is not None else solver.heuristic(board)
+        gap = abs(distance - moves)
+        if distance and (best_gap is None or gap < best_gap):
+            best, best_gap = board[:], gap
+            if gap == 0:
+                break
+        step()
+    return best
@@ -0,0 +1,210 @@
+from collections import OrderedDict
+from functools import lru_cache
+from minigames.puzzle_board import is_solvable, neighbour_table
+
+# Optimal solver for the sliding puzzle used by PuzzleMinigame.
+# Boards are flat lists where board[pos] is the tile at that position and 0 is
+# the empty square; the goal is list(range(grid_size * grid_size)).
+# A move is the board position of the tile that slides into the empty square,
+# which is exactly what PuzzleMinigame.try_move expects.
+
+
+@lru_cache(maxsize=None)
+def distance_table(grid_size):
+    """Manhattan distance of every tile from every position, indexed [tile][pos]."""
+    size = grid_size * grid_size
+    table = [(0,) * size]  # the empty square never counts
+    for tile in range(1, size):
+        goal_row, goal_col = divmod(tile, grid_size)
+        table.append(tuple(abs(pos // grid_size - goal_row) + abs(pos % grid_size - goal_col)
+                           for pos in range(size)))
+    return tuple(table)
+
+
+@lru_cache(maxsize=None)
+def _conflict_penalty(goals):
+    """Linear-conflict penalty for the in-line goal offsets of one row or column.
+
+    Every tile outside the longest increasing run has to leave the line and
+    come back, which costs two moves on top of its Manhattan distance.
+    """
+    longest = [1] * len(goals)
+    for i in range(len(goals)):
+        for j in range(i):
+            if goals[j] < goals[i] and longest[j] + 1 > longest[i]:
+                longest[i] = longest[j] + 1
+    return 2 * (len(goals) - max(longest, default=0))
+
+
+def _row_conflicts(board, row, grid_size):
+    start = row * grid_size
+    goals = tuple(tile % grid_size for tile in board[start:start + grid_size]
+                  if tile and tile // grid_size == row)
+    return _conflict_penalty(goals) if len(goals) > 1 else 0
+
+
+def _col_conflicts(board, col, grid_size):
+    goals = tuple(tile // grid_size for tile in board[col::grid_size]
+                  if tile and tile % grid_size == col)
+    return _conflict_penalty(goals) if len(goals) > 1 else 0
+
+
+def heuristic(board, grid_size):
+    """Manhattan distance plus linear conflicts; never overestimates the move count."""
+    distances = distance_table(grid_size)
+    total = sum(distances[tile][pos] for pos, tile in enumerate(board))
+    for line in range(grid_size):
+        total += _row_conflicts(board, line, grid_size) + _col_conflicts(board, line, grid_size)
+    return total
+
+
+class SearchBudgetExceeded(Exception):
+    """Raised internally when a search expands more nodes than it was allowed."""
+
+
+class PuzzleSolver:
+    def __init__(self, grid_size=3, cache_size=4096):
+        self.grid_size = grid_size
+        self.goal = tuple(range(grid_size * grid_size))
+        self.distances = distance_table(grid_size)
+        self.neighbours = neighbour_table(grid_size)
+        self.nodes_expanded = 0
+        # board -> next move on an optimal path, filled in from every solved path;
+        # least recently used boards are dropped beyond cache_size (a 4x4 path is at most 80 boards)
+        self.cache_size = cache_size
+        self._next_moves = OrderedDict()
+
+    def heuristic(self, board):
+        return heuristic(board, self.grid_size)
+
+    def solve(self, board, max_nodes=None):
+        """Return an optimal list of moves for board, or None if max_nodes runs out
+        or the board cannot be solved.
+
+        Uses IDA* with Manhattan distance plus linear conflicts, updating the
+        heuristic incrementally: a horizontal move only changes the conflicts
+        of the two columns involved and a vertical move those of the two rows.
+        """
+        grid_size = self.grid_size
+        distances = self.distances
+        neighbours = self.neighbours
+        state = list(board)
+        if tuple(state) == self.goal:
+            return []
+        if not is_solvable(state, grid_size):
+            return None
+
+        row_lc = [_row_conflicts(state, line, grid_size) for line in range(grid_size)]
+        col_lc = [_col_conflicts(state, line, grid_size) for line in range(grid_size)]
+        manhattan = sum(distances[tile][pos] for pos, tile in enumerate(state))
+        path = []
+        limit = None if max_nodes is None else self.nodes_expanded + max_nodes
+
+        def search(blank, depth, bound, previous, manhattan, conflicts):
+            estimate = depth + manhattan + conflicts
+            if estimate > bound:
+                return estimate
+            if manhattan == 0:
+                return -1
+            self.nodes_expanded += 1
+            if limit is not None and self.nodes_expanded > limit:
+                raise SearchBudgetExceeded
+            smallest = None
+            for pos in neighbours[blank]:
+                if pos == previous:
+                    continue
+                tile = state[pos]
+                state[blank], state[pos] = tile, 0
+                new_manhattan = manhattan - distances[tile][pos] + distances[tile][blank]
+                if pos // grid_size == blank // grid_size:
+                    # horizontal move, only two columns change
+                    a, b = pos % grid_size, blank % grid_size
+                    old = col_lc[a] + col_lc[b]
+                    col_lc[a] = _col_conflicts(state, a, grid_size)
+                    col_lc[b] = _col_conflicts(state, b, grid_size)
+                    new_conflicts = conflicts - old + col_lc[a] + col_lc[b]
+                    path.append(pos)
+                    result = search(pos, depth + 1, bound, blank, new_manhattan, new_conflicts)
+                    if result == -1:
+                        return -1
+                    path.pop()
+                    state[pos], state[blank] = tile, 0
+                    col_lc[a] = _col_conflicts(state, a, grid_size)
+                    col_lc[b] = _col_conflicts(state, b, grid_size)
+                else:
+                    a, b = pos // grid_size, blank // grid_size
+                    old = row_lc[a] + row_lc[b]
+                    row_lc[a] = _row_conflicts(state, a, grid_size)
+                    row_lc[b] = _row_conflicts(state, b, grid_size)
+                    new_conflicts = conflicts - old + row_lc[a] + row_lc[b]
+                    path.append(pos)
+                    result = search(pos, depth + 1, bound, blank, new_manhattan, new_conflicts)
+                    if result == -1:
+                        return -1
+                    path.pop()
+                    state[pos], state[blank] = tile, 0
+                    row_lc[a] = _row_conflicts(state, a, grid_size)
+                    row_lc[b] = _row_conflicts(state, b, grid_size)
+                if smallest is None or result < smallest:
+                    smallest = result
+            return smallest
+
+        blank = state.index(0)
+        conflicts = sum(row_lc) + sum(col_lc)
+        bound = manhattan + conflicts
+        try:
+            while True:
+                result = search(blank, 0, bound, None, manhattan, conflicts)
+                if result == -1:
+                    break
+                bound = result
+        except SearchBudgetExceeded:
+            return None
+        self._remember(board, path)
+        return list(path)
+
+    def _remember(self, board, moves):
+        state = list(board)
+        for pos in moves:
+            key = tuple(state)
+            self._next_moves[key] = pos
+            self._next_moves.move_to_end(key)
+            blank = state.index(0)
+            state[blank], state[pos] = state[pos], 0
+        while len(self._next_moves) > self.cache_size:
+            self._next_moves.popitem(last=False)
+
+    def next_move(self, board, max_nodes=None, avoid=()):
+        """Best next move for board, or None if it is already solved.
+
+        Boards on a previously solved path are answered from the cache. If the
+        search budget runs out, fall back to the neighbour with the lowest
+        heuristic so a hint is always available. The fallback skips moves that
+        lead to a board in avoid (e.g. boards auto-solve already went through),
+        so repeated fallbacks can't bounce between two boards; if every move is
+        avoided it returns None.
+        """
+        key = tuple(board)
+        if key == self.goal:
+            return None
+        move = self._next_moves.get(key)
+        if move is not None:
+            self._next_moves.move_to_end(key)
+            return move
+        moves = self.solve(board, max_nodes)
+        if moves:
+            return moves[0]
+        state = list(board)
+        blank = state.index(0)
+        best, best_score = None, None
+        for pos in self.neighbours[blank]:
+            state[blank], state[pos] = state[pos], 0
+            if tuple(state) not in avoid:
+                score = self.heuristic(state)
+                if best_score is None or score < best_score:
+                    best, best_score = pos, score
+            state[pos], state[blank] = state[blank], 0
+        return best
+
+    def clear_cache(self):
+        self._next_moves.clear()
@@ -0,0 +1,33 @@
+from asset_resolver import load_image
+
+# Sliced puzzle images shared by every PuzzleMinigame, keyed by (image_path, grid_size, tile_size)
+_atlas_cache = {}
+
+
+def build_tile_atlas(image_path, grid_size, tile_size):
+    """Scale image_path into one atlas surface and return it with a grid of tile views.
+
+    The tiles are subsurfaces of the atlas, so they share its pixels instead
+    of each holding a copy.
+    """
+    side = grid_size * tile_size
+    atlas = load_image(image_path, (side, side))
+    tiles = []
+    for y in range(grid_size):
+        row = []
+        for x in range(grid_size):
+            row.append(atlas.subsurface((x * tile_size, y * tile_size, tile_size, tile_size)))
+        tiles.append(row)
+    return atlas, tiles
+
+
+def get_tile_atlas(image_path, grid_size, tile_size):
+    """Cached build_tile_atlas, so replaying a puzzle never reloads or rescales the image."""
+    key = (image_path, grid_size, tile_size)
+    if key not in _atlas_cache:
+        _atlas_cache[key] = build_tile_atlas(image_path, grid_size, tile_size)
+    return _atlas_cache[key]
+
+
+def clear_tile_atlas_cache():
+    _atlas_cache.clear()
@@ -0,0 +1,304 @@
+import bisect
+import queue
+import random
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+
+# Deadlines, retries and a circuit breaker for calls to the chat model.
+# Clocks, sleeps and random numbers can be injected so fault-injection runs
+# are deterministic.
+
+
+class DeadlineExceeded(Exception):
+    """The call did not finish before its deadline."""
+
+
+class ModelUnavailable(Exception):
+    """The call failed (or the breaker is open) and there was no fallback answer."""
+
+
+class DeadlineExecutor:
+    """At most max_workers daemon threads for calls that may never return.
+
+    Unlike ThreadPoolExecutor's workers, these threads are not joined at
+    interpreter exit, so a request that hangs is abandoned instead of blocking
+    shutdown. A thread is started when a call arrives and none is idle.
+    """
+
+    def __init__(self, max_workers=4, name='deadline-call'):
+        self.max_workers = max_workers
+        self.name = name
+        self._jobs = queue.SimpleQueue()
+        self._threads = []
+        self._idle = 0
+        self._lock = threading.Lock()
+
+    def submit(self, func, *args):
+        future = Future()
+        with self._lock:
+            if self._idle:
+                self._idle -= 1
+            elif len(self._threads) < self.max_workers:
+                thread = threading.Thread(target=self._work, name=f'{self.name}-{len(self._threads)}', daemon=True)
+                thread.start()
+                self._threads.append(thread)
+        self._jobs.put((future, func, args))
+        return future
+
+    def _work(self):
+        # A new thread starts for a call that is already queued, so it isn't idle yet
+        busy = True
+        while True:
+            if not busy:
+                with self._lock:
+                    self._idle += 1
+            busy = False
+            future, func, args = self._jobs.get()
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                result = func(*args)
+            except BaseException as e:
+                future.set_exception(e)
+            else:
+                future.set_result(result)
+
+
+def result_within(future, timeout):
+    """future's result, or DeadlineExceeded after timeout seconds (cancelling it if it hasn't started)."""
+    try:
+        return future.result(timeout)
+    except FutureTimeout:
+        future.cancel()
+        raise DeadlineExceeded(f"no response after {timeout:.1f}s") from None
+
+
+_default_executor = None
+_default_executor_lock = threading.Lock()
+
+
+def call_with_deadline(func, timeout, *args, executor=None):
+    """Run func(*args) on executor (a shared DeadlineExecutor by default) and return its result,
+    or raise DeadlineExceeded after timeout seconds."""
+    global _default_executor
+    if executor is None:
+        with _default_executor_lock:
+            if _default_executor is None:
+                _default_executor = DeadlineExecutor()
+            executor = _default_executor
+    return result_within(executor.submit(func, *args), timeout)
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter: attempt n waits uniform(0, min(max_delay, base * 2**n))."""
+
+    def __init__(self, max_attempts=3, base_delay=0.25, max_delay=2.0, rng=None):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.rng = rng or random.Random()
+
+    def delay(self, attempt):
+        return self.rng.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+
+class CircuitBreaker:
+    """Stops calling a failing endpoint for reset_timeout seconds after failure_threshold failures in a row.
+
+    After the timeout one trial call is let through (half-open); success closes
+    the breaker again, failure re-opens it. Calls passed to track_hung() (ones
+    still running past their deadline) count as hung until they return, and
+    no call is allowed while max_hung of them are.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold=3, reset_timeout=30.0, max_hung=4, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.max_hung = max_hung
+        self.clock = clock
+        self.hung = 0
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self.times_opened = 0
+        self._lock = threading.Lock()
+
+    def allow(self):
+        with self._lock:
+            if self.hung >= self.max_hung:
+                return False
+            if self.state == self.OPEN and self.clock() - self.opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                return True
+            return self.state == self.CLOSED
+
+    def track_hung(self, future):
+        """Count the call behind future, which missed its deadline, as hung until it returns."""
+        with self._lock:
+            self.hung += 1
+        future.add_done_callback(self._unhung)
+
+    def _unhung(self, future):
+        with self._lock:
+            self.hung -= 1
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    self.times_opened += 1
+                self.state = self.OPEN
+                self.opened_at = self.clock()
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram in milliseconds."""
+
+    def __init__(self, bounds_ms=(50, 100, 250, 500, 1000, 2500, 5000, 10000)):
+        self.bounds_ms = list(bounds_ms)
+        self.counts = [0] * (len(self.bounds_ms) + 1)
+        self.total = 0
+        self.sum_ms = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, ms):
+        with self._lock:
+            self.counts[bisect.bisect_left(self.bounds_ms, ms)] += 1
+            self.total += 1
+            self.sum_ms += ms
+
+    def percentile(self, fraction):
+        """Upper bound of the bucket holding the given fraction of samples (inf for the overflow bucket)."""
+        if not self.total:
+            return 0.0
+        target = fraction * self.total
+        seen = 0
+        for i, count in enumerate(self.counts):
+            seen += count
+            if seen >= target:
+                return float(self.bounds_ms[i]) if i < len(self.bounds_ms) else float('inf')
+        return float('inf')
+
+    def snapshot(self):
+        labels = [f"<={bound}" for bound in self.bounds_ms] + [f">{self.bounds_ms[-1]}"]
+        return {
+            'buckets_ms': dict(zip(labels, self.counts)),
+            'count': self.total,
+            'mean_ms': self.sum_ms / self.total if self.total else 0.0,
+            'p50_ms': self.percentile(0.5),
+            'p95_ms': self.percentile(0.95),
+        }
+
+
+class ResilientCaller:
+    """Wraps a prompt -> text call with deadlines, jittered retries, a circuit breaker and fallbacks.
+
+    Successful answers are remembered per prompt (up to cache_size). When every
+    attempt fails, or the breaker is open, the cached answer for the same
+    prompt is returned, then fallback(prompt) if given (a fallback passed to
+    call() takes precedence over the caller's own); otherwise ModelUnavailable
+    is raised.
+
+    Attempts run on the caller's own DeadlineExecutor, with room for
+    max_concurrent_calls healthy calls plus the breaker's max_hung calls stuck
+    past their deadline, so calls that hang can't pile up threads. Callers
+    running more calls at once than max_concurrent_calls wait for a thread.
+    """
+
+    def __init__(self, call_timeout=10.0, retry=None, breaker=None, fallback=None,
+                 cache_size=128, sleep=time.sleep, clock=time.perf_counter, max_concurrent_calls=16):
+        self.call_timeout = call_timeout
+        self.retry = retry or RetryPolicy()
+        self.breaker = breaker or CircuitBreaker()
+        self.executor = DeadlineExecutor(max_concurrent_calls + self.breaker.max_hung, name='model-call')
+        self.fallback = fallback
+        self.cache_size = cache_size
+        self.sleep = sleep
+        self.clock = clock
+        self.latency = LatencyHistogram()
+        self.counters = {'calls': 0, 'attempts': 0, 'failures': 0, 'timeouts': 0,
+                         'short_circuited': 0, 'cache_fallbacks': 0, 'offline_fallbacks': 0}
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _count(self, name):
+        with self._lock:
+            self.counters[name] += 1
+
+    def call(self, func, prompt, fallback=None):
+        self._count('calls')
+        last_error = None
+        for attempt in range(self.retry.max_attempts):
+            if not self.breaker.allow():
+                self._count('short_circuited')
+                break
+            self._count('attempts')
+            start = self.clock()
+            future = self.executor.submit(func, prompt)
+            try:
+                text = result_within(future, self.call_timeout)
+            except DeadlineExceeded as e:
+                if not future.done():
+                    self.breaker.track_hung(future)
+                self._count('timeouts')
+                last_error = e
+            except Exception as e:
+                last_error = e
+            else:
+                self.latency.observe((self.clock() - start) * 1000)
+                self.breaker.record_success()
+                self._remember(prompt, text)
+                return text
+            self.latency.observe((self.clock() - start) * 1000)
+            self._count('failures')
+            self.breaker.record_failure()
+            if attempt + 1 < self.retry.max_attempts and self.breaker.state != CircuitBreaker.OPEN:
+                self.sleep(self.retry.delay(attempt))
+        return self._fall_back(prompt, last_error, fallback or self.fallback)
+
+    def _remember(self, prompt, text):
+        with self._lock:
+            self._cache[prompt] = text
+            self._cache.move_to_end(prompt)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def _fall_back(self, prompt, error, fallback):
+        with self._lock:
+            cached = self._cache.get(prompt)
+        if cached is not None:
+            self._count('cache_fallbacks')
+            return cached
+        if fallback is not None:
+            text = fallback(prompt)
+            if text is not None:
+                self._count('offline_fallbacks')
+                return text
+        if error is None:
+            raise ModelUnavailable("circuit breaker is open")
+        raise ModelUnavailable(str(error)) from error
+
+    def stats(self):
+        """Breaker state, counters and latency histogram, for logging or a status screen."""
+        with self._lock:
+            counters = dict(self.counters)
+        return {
+            'breaker_state': self.breaker.state,
+            'breaker_opened': self.breaker.times_opened,
+            'consecutive_failures': self.breaker.failures,
+            'hung_calls': self.breaker.hung,
+            **counters,
+            'latency': self.latency.snapshot(),
+        }
@@ -2,9 +2,14 @@ import pygame
 import os
 import sys
 from pygame import Surface
-from conversation import ConversationManager
+from asset_resolver import load_image
+from sprite_atlas import CHARACTER_NAMES, character_sprite
+from world import WORLD_SCREENS, AnimalIndex, Camera, TiledBackground, scatter_animals
 
 class OpeningScreen:
+    # Event types handle_event reads; the main loop blocks the rest
+    event_types = (pygame.MOUSEMOTION, pygame.MOUSEBUTTONDOWN)
+
     def __init__(self, screen):
         self.screen = screen
         self.font = pygame.font.SysFont('Arial', 64)
@@ -30,6 +35,9 @@ class OpeningScreen:
             "Return to the home screen after interactions"
         ]
 
+    def reset(self):
+        self.hovered = False
+
     def handle_event(self, event):
         if event.type == pygame.MOUSEMOTION:
             self.hovered = self.button_rect.collidepoint(event.pos)
@@ -60,32 +68,30 @@ class OpeningScreen:
         self.screen.blit(self.button_text, text_rect)
 
 class CharacterSelectScreen:
+    event_types = (pygame.MOUSEMOTION, pygame.MOUSEBUTTONDOWN)
+
     def __init__(self, screen):
         self.screen = screen
         self.bg_color = (220, 255, 220)
         self.font = pygame.font.SysFont('Arial', 36)
         self.small_font = pygame.font.SysFont('Arial', 28)
-        self.characters = [
-            {'name': 'Capybara', 'file': 'capybara.png'},
-            {'name': 'Jaguar', 'file': 'jaguar.png'},
-            {'name': 'Macaw', 'file': 'macaw.png'},
-        ]
+        self.characters = [{'name': name} for name in CHARACTER_NAMES]
         self.images = []
         self.rects = []
         self.hovered = -1
         self._load_images()
 
+    def reset(self):
+        self.hovered = -1
+
     def _load_images(self):
-        base_path = os.path.join('assets', 'characters')
         img_size = (180, 180)
         spacing = 80
         total_width = len(self.characters) * img_size[0] + (len(self.characters) - 1) * spacing
         start_x = (self.screen.get_width() - total_width) // 2
         y = self.screen.get_height() // 2 - 60
         for i, char in enumerate(self.characters):
-            img_path = os.path.join(base_path, char['file'])
-            img = pygame.image.load(img_path).convert_alpha()
-            img = pygame.transform.smoothscale(img, img_size)
+            img = character_sprite(char['name'], img_size[0])
             x = start_x + i * (img_size[0] + spacing)
             rect = pygame.Rect(x, y, img_size[0], img_size[0])
             self.images.append(img)
@@ -123,6 +129,8 @@ class CharacterSelectScreen:
             self.screen.blit(name_surf, name_rect)
 
 class SVDExplanationScreen:
+    event_types = (pygame.MOUSEMOTION, pygame.MOUSEBUTTONDOWN)
+
     def __init__(self, screen):
         self.screen = screen
         self.font = pygame.font.SysFont('Arial', 36)
@@ -143,6 +151,9 @@ class SVDExplanationScreen:
             "You're helping rebuild the forest! Your goal is to complete at least 3 interactions."
         ]
 
+    def reset(self):
+        self.hovered = False
+
     def handle_event(self, event):
         if event.type == pygame.MOUSEMOTION:
             self.hovered = self.continue_button.collidepoint(event.pos)
@@ -170,6 +181,8 @@ class SVDExplanationScreen:
         self.screen.blit(btn_text, btn_rect)
 
 class GameInstructionsScreen:
+    event_types = (pygame.MOUSEMOTION, pygame.MOUSEBUTTONDOWN, pygame.KEYDOWN)
+
     def __init__(self, screen):
         self.screen = screen
         self.font = pygame.font.SysFont('Arial', 24)
@@ -202,10 +215,14 @@ class GameInstructionsScreen:
             "Jaguar Minigame:",
             "- Click on image blocks to move them",
             "- Reconstruct the forest image to win!",
+            "- Stuck? Press H for a hint or A to auto-solve",
             ""
 
         ]
 
+    def reset(self):
+        self.hovered = False
+
     def handle_event(self, event):
         if event.type == pygame.MOUSEMOTION:
             self.hovered = self.button_rect.collidepoint(event.pos)
@@ -270,58 +287,72 @@ class GameInstructionsScreen:
 
 
 class HomeScreen:
-    def __init__(self, screen, player_character, player_name="Player", background_path=None):
+    event_types = (pygame.KEYDOWN,)
+
+    def __init__(self, screen, player_character, player_name="Player", background_path=None, world_screens=WORLD_SCREENS):
         self.screen = screen
         self.player_character = player_character
         self.player_name = player_name
         self.font = pygame.font.SysFont('Arial', 32)
         self.small_font = pygame.font.SysFont('Arial', 28)
-        # Load background
+        # The world scrolls sideways; the camera follows the player
+        self.world_width = screen.get_width() * world_screens
+        self.camera = Camera(screen.get_width(), self.world_width)
+        # Load background, tiled across the world
         if background_path is None:
             bg_path = os.path.join('assets', 'background', 'rainforest.png')
         else:
             bg_path = background_path
         self.background_path = bg_path
-        self.background = pygame.image.load(bg_path).convert()
-        self.background = pygame.transform.smoothscale(self.background, (screen.get_width(), screen.get_height()))
-        # Load player character image
-        char_path = os.path.join('assets', 'characters', f'{player_character.lower()}.png')
-        self.char_img = pygame.image.load(char_path).convert_alpha()
-        self.char_img = pygame.transform.smoothscale(self.char_img, (160, 160))
-        # Player character movement
+        self.background = load_image(bg_path, screen.get_size())
+        self.background_tiles = TiledBackground(self.background)
+        # Player character image
+        self.char_img = character_sprite(player_character, 160)
+        # Player character movement, in world coordinates
         self.char_x = 100
         self.char_y = int(screen.get_height() * 2 / 3) + 40  # bottom 1/3
         self.char_speed = 8
         self.char_rect = self.char_img.get_rect(midbottom=(self.char_x, self.char_y + 80))
+        self.name_surf = self.font.render(self.player_name, True, (255, 255, 255))
         # Determine unselected characters
-        all_chars = ['Capybara', 'Jaguar', 'Macaw']
-        self.other_names = [c for c in all_chars if c != player_character]
-        # Place other animals along the same y-line as player
-        self.other_imgs = []
-        self.other_rects = []
-        self.other_xs = [screen.get_width() // 3, 2 * screen.get_width() // 3]
+        self.other_names = [c for c in CHARACTER_NAMES if c != player_character]
+        # Other animals along the same y-line as player, spread through the world
+        self.other_imgs = {}
+        self.other_labels = {}
+        for name in self.other_names:
+            self.other_imgs[name] = character_sprite(name, 160)
+            self.other_labels[name] = self.small_font.render(name, True, (255, 255, 255))
         self.other_y = self.char_y + 80
-        for i, name in enumerate(self.other_names):
-            img_path = os.path.join('assets', 'characters', f'{name.lower()}.png')
-            img = pygame.image.load(img_path).convert_alpha()
-            img = pygame.transform.smoothscale(img, (160, 160))
-            rect = img.get_rect(midbottom=(self.other_xs[i], self.other_y))
-            self.other_imgs.append(img)
-            self.other_rects.append(rect)
-        self.other_lit = [False, False]
+        self.animals = AnimalIndex(scatter_animals(self.other_names, screen.get_width() // 3, self.world_width - 80))
+        self.animal_half_width = max(img.get_width() for img in self.other_imgs.values()) // 2 + 8
+        self.lit = None  # index of the animal next to the player
         self.proximity_threshold = 120
+        # Highlight behind a lit animal, drawn once
+        self.highlight = pygame.Surface((160 + 16, 160 + 16), pygame.SRCALPHA)
+        border_color = (255, 215, 0, 180)  # Added alpha value (180 = less transparent)
+        pygame.draw.rect(self.highlight, border_color, self.highlight.get_rect(), border_radius=16)
+
+    def reset(self, background_path=None):
+        """Put the player back at the start, optionally switching background."""
+        self.char_x = 100
+        self.camera.follow(self.char_x)
+        self.char_rect = self.char_img.get_rect(midbottom=(self.camera.to_screen(self.char_x), self.char_y + 80))
+        self.lit = None
+        if background_path is not None:
+            self.set_background(background_path)
 
     def set_background(self, background_path):
+        if background_path == self.background_path:
+            return
         self.background_path = background_path
-        self.background = pygame.image.load(background_path).convert()
-        self.background = pygame.transform.smoothscale(self.background, (self.screen.get_width(), self.screen.get_height()))
+        self.background = load_image(background_path, self.screen.get_size())
+        self.background_tiles.set_tile(self.background)
 
     def handle_event(self, event):
         # No mouse hover, only proximity
         if event.type == pygame.KEYDOWN and event.key == pygame.K_RETURN:
-            for i, rect in enumerate(self.other_rects):
-                if self.other_lit[i]:
-                    return self.other_names[i]
+            if self.lit is not None:
+                return self.animals.animals[self.lit][1]
         return None
 
     def update(self):
@@ -331,55 +362,49 @@ class HomeScreen:
             self.char_x -= self.char_speed
         if keys[pygame.K_RIGHT]:
             self.char_x += self.char_speed
-        # Constrain to screen bounds
+        # Constrain to world bounds
         min_x = 80
-        max_x = self.screen.get_width() - 80
+        max_x = self.world_width - 80
         self.char_x = max(min_x, min(max_x, self.char_x))
+        self.camera.follow(self.char_x)
         # Update rect for drawing
-        self.char_rect = self.char_img.get_rect(midbottom=(self.char_x, self.char_y + 80))
+        self.char_rect = self.char_img.get_rect(midbottom=(self.camera.to_screen(self.char_x), self.char_y + 80))
         # Proximity highlight
-        for i, rect in enumerate(self.other_rects):
-            dist = abs(self.char_rect.centerx - rect.centerx)
-            self.other_lit[i] = dist < self.proximity_threshold
+        self.lit = self.animals.nearest(self.char_x, self.proximity_threshold)
 
     def draw(self):
-        self.screen.blit(self.background, (0, 0))
+        self.background_tiles.draw(self.screen, self.camera)
         # Draw player's character (bottom 1/3, movable)
         self.screen.blit(self.char_img, self.char_rect)
-        name_surf = self.font.render(self.player_name, True, (255, 255, 255))
-        name_rect = name_surf.get_rect(midbottom=(self.char_rect.centerx, self.char_rect.top - 10))
-        self.screen.blit(name_surf, name_rect)
-        # Draw other characters along the same line
-        for i, (img, rect, name) in enumerate(zip(self.other_imgs, self.other_rects, self.other_names)):
-            # if self.other_lit[i]:
-            #     border_color = (255, 215, 0)
-            #     pygame.draw.rect(self.screen, border_color, rect.inflate(16, 16), border_radius=16)
-            if self.other_lit[i]:
-                border_color = (255, 215, 0, 180)  # Added alpha value (180 = less transparent)
-                border_surface = pygame.Surface((rect.width + 16, rect.height + 16), pygame.SRCALPHA)
-                pygame.draw.rect(border_surface, border_color, border_surface.get_rect(), border_radius=16)
-                border_rect = border_surface.get_rect(center=rect.center)
-                self.screen.blit(border_surface, border_rect)
+        name_rect = self.name_surf.get_rect(midbottom=(self.char_rect.centerx, self.char_rect.top - 10))
+        self.screen.blit(self.name_surf, name_rect)
+        # Draw the other characters on screen, skipping the rest of the world
+        visible = self.animals.between(self.camera.left - self.animal_half_width,
+                                       self.camera.right + self.animal_half_width)
+        for i in visible:
+            x, name = self.animals.animals[i]
+            img = self.other_imgs[name]
+            rect = img.get_rect(midbottom=(self.camera.to_screen(x), self.other_y))
+            if i == self.lit:
+                self.screen.blit(self.highlight, self.highlight.get_rect(center=rect.center))
             self.screen.blit(img, rect)
-            other_name_surf = self.small_font.render(name, True, (255, 255, 255))
-            other_name_rect = other_name_surf.get_rect(midbottom=(rect.centerx, rect.top - 10))
-            self.screen.blit(other_name_surf, other_name_rect)
+            label = self.other_labels[name]
+            self.screen.blit(label, label.get_rect(midbottom=(rect.centerx, rect.top - 10)))
 
 class InteractionScreen:
-    def __init__(self, screen, animal_name):
+    event_types = (pygame.MOUSEMOTION, pygame.MOUSEBUTTONDOWN)
+
+    def __init__(self, screen, animal_name, player_name=None):
         self.screen = screen
         self.animal_name = animal_name
+        self.player_name = player_name
         self.font = pygame.font.SysFont('Arial', 32)
         self.small_font = pygame.font.SysFont('Arial', 24)
         # Load and blur background
         bg_path = os.path.join('assets', 'background', 'rainforest.png')
-        bg = pygame.image.load(bg_path).convert()
-        bg = pygame.transform.smoothscale(bg, (screen.get_width()//8, screen.get_height()//8))
-        self.background = pygame.transform.smoothscale(bg, (screen.get_width(), screen.get_height()))
-        # Load animal image
-        char_path = os.path.join('assets', 'characters', f'{animal_name.lower()}.png')
-        self.animal_img = pygame.image.load(char_path).convert_alpha()
-        self.animal_img = pygame.transform.smoothscale(self.animal_img, (200, 200))
+        self.background = load_image(bg_path, screen.get_size(), blur=8)
+        # Animal image
+        self.animal_img = character_sprite(animal_name, 200)
         self.animal_rect = self.animal_img.get_rect(center=(screen.get_width()//2, screen.get_height()//2 - 60))
         # Buttons
         self.buttons = [
@@ -391,6 +416,9 @@ class InteractionScreen:
         self.hovered = -1
         self._layout_buttons()
 
+    def reset(self):
+        self.hovered = -1
+
 
     def _layout_buttons(self):
         btn_w, btn_h = 260, 54
@@ -403,12 +431,31 @@ class InteractionScreen:
             rect = pygame.Rect(start_x + i * (btn_w + spacing), y, btn_w, btn_h)
             self.button_rects.append(rect)
 
+    def prefetch_greeting(self):
+        """Start fetching the chat greeting once the player points at Learn Facts.
+
+        Only if the chat client is already up (the preload thread builds it),
+        so nothing heavy runs on the frame and animals the player doesn't chat
+        with cost no model call.
+        """
+        service = sys.modules.get('conversation_service')
+        client = service.ready_conversation_client() if service else None
+        if client is None or self.player_name is None:
+            return
+        try:
+            client.greeting(service.chat_session_id(self.player_name, self.animal_name),
+                            self.animal_name, self.player_name)
+        except Exception as e:
+            print(f"Could not prefetch greeting: {e}")
+
     def handle_event(self, event):
         if event.type == pygame.MOUSEMOTION:
-            self.hovered = -1
+            previous, self.hovered = self.hovered, -1
             for i, rect in enumerate(self.button_rects):
                 if rect.collidepoint(event.pos):
                     self.hovered = i
+            if self.hovered != previous and self.hovered >= 0 and self.buttons[self.hovered]['action'] == 'facts':
+                self.prefetch_greeting()
         if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
             for i, rect in enumerate(self.button_rects):
                 if rect.collidepoint(event.pos):
@@ -436,6 +483,8 @@ class InteractionScreen:
             self.screen.blit(label_surf, label_rect) 
 
 class NameInputScreen:
+    event_types = (pygame.KEYDOWN,)
+
     def __init__(self, screen):
         self.screen = screen
         self.font = pygame.font.SysFont('Arial', 36)
@@ -446,6 +495,11 @@ class NameInputScreen:
         self.cursor_visible = True
         self.cursor_timer = 0
 
+    def reset(self):
+        self.name = ''
+        self.cursor_visible = True
+        self.cursor_timer = 0
+
     def handle_event(self, event):
         if event.type == pygame.KEYDOWN and self.active:
             if event.key == pygame.K_RETURN and self.name.strip():
@@ -480,6 +534,8 @@ class NameInputScreen:
             pygame.draw.rect(self.screen, (60, 60, 60), (cursor_x, cursor_y, 3, 36)) 
 
 class ConversationScreen:
+    event_types = (pygame.MOUSEBUTTONDOWN, pygame.KEYDOWN)
+
     def __init__(self, screen, character_name, player_name):
         self.screen = screen
         self.character_name = character_name
@@ -488,13 +544,12 @@ class ConversationScreen:
         self.small_font = pygame.font.SysFont('Arial', 18)
         self.title_font = pygame.font.SysFont('Arial', 32)
         
-        # Conversation manager
-        try:
-            self.conversation_manager = ConversationManager()
-            self.conversation_started = False
-        except:
-            self.conversation_manager = None
-            self.conversation_started = False
+        # The shared conversation client is only looked up once the chat is on screen:
+        # this screen is prefetched while the player is still on InteractionScreen,
+        # and that must not build the client or request a greeting
+        self.conversation_id = None
+        self.conversation_client = None
+        self.conversation_started = False
         
         # UI elements
         self.input_box = pygame.Rect(50, screen.get_height() - 80, screen.get_width() - 300, 40)
@@ -505,17 +560,35 @@ class ConversationScreen:
         self.input_text = ""
         self.messages = []
         self.suggestions = []
+        # Messages waiting to be shown, in order: ("player", text) or ("character", future)
+        self.pending = []
         
-        # Load character image
-        char_path = os.path.join('assets', 'characters', f'{character_name.lower()}.png')
-        self.char_img = pygame.image.load(char_path).convert_alpha()
-        self.char_img = pygame.transform.smoothscale(self.char_img, (120, 120))
+        # Character image
+        self.char_img = character_sprite(character_name, 120)
         
         # Load background
         bg_path = os.path.join('assets', 'background', 'rainforest.png')
-        bg = pygame.image.load(bg_path).convert()
-        bg = pygame.transform.smoothscale(bg, (screen.get_width()//8, screen.get_height()//8))
-        self.background = pygame.transform.smoothscale(bg, (screen.get_width(), screen.get_height()))
+        self.background = load_image(bg_path, screen.get_size(), blur=8)
+
+    def reset(self):
+        """Pick the chat up where it was left; the model history lives in the shared manager."""
+        self.input_text = ""
+        self.start_conversation()
+
+    def start_conversation(self):
+        """Queue the greeting when the chat is shown; it is often already fetched from InteractionScreen."""
+        if self.conversation_started:
+            return
+        self.conversation_started = True
+        try:
+            from conversation_service import chat_session_id, get_conversation_client
+            self.conversation_id = chat_session_id(self.player_name, self.character_name)
+            self.conversation_client = get_conversation_client()
+        except Exception as e:
+            print(f"Chat unavailable: {e}")
+            return
+        greeting = self.conversation_client.greeting(self.conversation_id, self.character_name, self.player_name)
+        self.pending.append(("character", greeting))
 
     def handle_event(self, event):
         if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
@@ -544,29 +617,41 @@ class ConversationScreen:
         if not self.input_text.strip():
             return
         
-        if not self.conversation_started and self.conversation_manager:
-            # Start conversation
-            response = self.conversation_manager.start_conversation(self.character_name, self.player_name)
-            self.messages.append(("character", response))
-            self.conversation_started = True
+        self.start_conversation()
         
         # Add player message
-        self.messages.append(("player", self.input_text))
+        self.pending.append(("player", self.input_text))
         
-        # Get character response
-        if self.conversation_manager:
-            response = self.conversation_manager.continue_conversation(self.character_name, self.input_text)
-            self.messages.append(("character", response))
+        # Ask for the character response; it is shown once it arrives
+        if self.conversation_client:
+            response = self.conversation_client.continue_conversation(self.conversation_id, self.character_name, self.input_text)
+            self.pending.append(("character", response))
+        self.flush_pending()
+        
+        self.input_text = ""
+        #self.update_suggestions()
+
+    def flush_pending(self):
+        """Move finished responses (and the player lines queued behind them) into messages."""
+        while self.pending:
+            msg_type, content = self.pending[0]
+            if msg_type == "character":
+                if not content.done():
+                    break
+                try:
+                    content = content.result()
+                except Exception as e:
+                    content = f"I'm having trouble responding right now. Could you try again? (Error: {str(e)})"
+            self.pending.pop(0)
+            self.messages.append((msg_type, content))
         
         # Keep only the last 4 messages (2 exchanges)
         if len(self.messages) > 4:
             self.messages = self.messages[-4:]
-        
-        self.input_text = ""
-        #self.update_suggestions()
 
     def update(self):
-        pass
+        self.start_conversation()
+        self.flush_pending()
 
     def draw(self):
         self.screen.blit(self.background, (0, 0))
@@ -619,6 +704,11 @@ class ConversationScreen:
                 
                 y_offset += bubble_height + 10
         
+        # Waiting for the character to answer
+        if self.pending and y_offset < self.screen.get_height() - 120:
+            typing_surf = self.font.render(f"{self.character_name} is thinking...", True, (255, 255, 255))
+            self.screen.blit(typing_surf, (conversation_rect.x + 20, y_offset))
+        
         # Draw suggestion buttons
         for i, suggestion in enumerate(self.suggestions):
             suggestion_rect = pygame.Rect(50 + (i % 2) * 300, 200 + (i // 2) * 40, 280, 30)
@@ -648,6 +738,8 @@ import pygame
 import sys
 
 class EndingScreen:
+    event_types = (pygame.MOUSEBUTTONDOWN,)
+
     def __init__(self, screen):
         self.screen = screen
         self.font = pygame.font.SysFont('Arial', 36)
@@ -657,6 +749,9 @@ class EndingScreen:
         self.explore_button.center = (screen.get_width() // 2 - 150, screen.get_height() // 2 + 60)
         self.exit_button.center = (screen.get_width() // 2 + 150, screen.get_height() // 2 + 60)
 
+    def reset(self):
+        pass
+
     def handle_event(self, event):
         if event.type == pygame.MOUSEBUTTONDOWN:
             if self.exit_button.collidepoint(event.pos):
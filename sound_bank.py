@@ -0,0 +1,144 @@
+import array
+import math
+import os
+import random
+import threading
+import pygame
+
+# Sound effects and jingles, decoded once and played without stalling a frame.
+# Files are decoded into pygame.mixer.Sound objects on a background thread and
+# the short minigame effects are synthesized there too, so nothing is loaded
+# on the hot path. Each channel group has its own reserved mixer channels:
+# a burst of fire hits can steal the oldest 'sfx' channel, but never the
+# channel playing the victory jingle.
+
+SOUND_FILES = {
+    'victory': os.path.join('assets', 'sounds', 'victory.wav'),
+}
+
+# name -> (start Hz, end Hz, seconds, volume, noise mix, decay rate)
+SYNTH_EFFECTS = {
+    'fire_hit': (900, 180, 0.18, 0.45, 0.6, 18.0),
+    'egg_drop': (520, 260, 0.16, 0.5, 0.0, 14.0),
+    'egg_pick': (440, 660, 0.08, 0.35, 0.0, 20.0),
+    'tile_slide': (240, 200, 0.07, 0.35, 0.3, 30.0),
+}
+
+CHANNEL_GROUPS = {'music': 1, 'sfx': 6}
+
+# mixer sample size -> (array typecode, peak amplitude, zero level)
+_SAMPLE_FORMATS = {
+    -8: ('b', 127, 0), 8: ('B', 127, 128),
+    -16: ('h', 32767, 0), 16: ('H', 32767, 32768),
+    32: ('f', 1.0, 0.0),
+}
+
+
+def synthesize(start_hz, end_hz, seconds, volume=0.5, noise=0.0, decay=10.0, rng=None):
+    """A short decaying sweep from start_hz to end_hz, mixed with noise, as a Sound in the mixer's format."""
+    frequency, size, channels = pygame.mixer.get_init()
+    typecode, peak, zero = _SAMPLE_FORMATS[size]
+    rng = rng or random.Random(0)
+    count = int(frequency * seconds)
+    samples = array.array(typecode)
+    phase = 0.0
+    for i in range(count):
+        t = i / count
+        phase += 2 * math.pi * (start_hz + (end_hz - start_hz) * t) / frequency
+        value = (1 - noise) * math.sin(phase) + noise * rng.uniform(-1, 1)
+        level = value * volume * math.exp(-decay * t * seconds)
+        sample = zero + level * peak if typecode == 'f' else int(zero + level * peak)
+        samples.extend([sample] * channels)
+    return pygame.mixer.Sound(buffer=samples)
+
+
+class SoundBank:
+    """Preloaded sounds with pooled, non-blocking playback.
+
+    Sounds that haven't finished loading are skipped rather than waited for.
+    If the mixer isn't available the bank stays silent.
+    """
+
+    def __init__(self, files=None, effects=None, groups=None):
+        self.files = dict(SOUND_FILES if files is None else files)
+        self.effects = dict(SYNTH_EFFECTS if effects is None else effects)
+        self.sounds = {}
+        self.groups = {}
+        self._started = {}
+        self._plays = 0
+        self._loaded = threading.Event()
+        self.enabled = pygame.mixer.get_init() is not None
+        if not self.enabled:
+            self._loaded.set()
+            return
+        groups = CHANNEL_GROUPS if groups is None else groups
+        reserved = sum(groups.values())
+        pygame.mixer.set_num_channels(max(pygame.mixer.get_num_channels(), reserved + 2))
+        pygame.mixer.set_reserved(reserved)
+        channel_id = 0
+        for group, count in groups.items():
+            self.groups[group] = [pygame.mixer.Channel(channel_id + i) for i in range(count)]
+            channel_id += count
+
+    def preload(self):
+        """Decode files and synthesize effects on a daemon thread."""
+        if not self.enabled:
+            return None
+
+        def worker():
+            for name, spec in self.effects.items():
+                try:
+                    self.sounds[name] = synthesize(*spec)
+                except Exception as e:
+                    print(f"Could not synthesize {name}: {e}")
+            for name, path in self.files.items():
+                try:
+                    self.sounds[name] = pygame.mixer.Sound(path)
+                except Exception as e:
+                    print(f"Could not load sound {path}: {e}")
+            self._loaded.set()
+
+        thread = threading.Thread(target=worker, name='sound-bank', daemon=True)
+        thread.start()
+        return thread
+
+    def wait_until_loaded(self, timeout=None):
+        return self._loaded.wait(timeout)
+
+    def play(self, name, group='sfx', volume=1.0):
+        """Play name on a free channel of group, or the one that started longest ago.
+
+        Returns the channel, or None if the sound isn't loaded (yet).
+        """
+        sound = self.sounds.get(name)
+        channels = self.groups.get(group)
+        if sound is None or not channels:
+            return None
+        channel = next((c for c in channels if not c.get_busy()), None)
+        if channel is None:
+            channel = min(channels, key=lambda c: self._started.get(c, 0))
+        channel.set_volume(volume)
+        channel.play(sound)
+        self._plays += 1
+        self._started[channel] = self._plays
+        return channel
+
+    def stop(self, group=None):
+        for name, channels in self.groups.items():
+            if group is None or name == group:
+                for channel in channels:
+                    channel.stop()
+
+
+_shared_bank = None
+_shared_bank_lock = threading.Lock()
+
+
+def get_sound_bank():
+    """The process-wide SoundBank, preloading in the background on first use."""
+    global _shared_bank
+    with _shared_bank_lock:
+        if _shared_bank is None:
+            _shared_bank = SoundBank()
+            _shared_bank.preload()
+        return _shared_bank
@@ -0,0 +1,99 @@
+import os
+import threading
+import pygame
+from asset_resolver import scale_image
+from surface_cache import RawSurfaceCache
+
+# Every character at every size a screen draws it, packed into one alpha
+# surface. Each source PNG is decoded once, scaled to all sizes and blitted
+# into its row of the atlas; screens get subsurfaces, so they share the
+# atlas's pixels instead of holding a copy each. The finished atlas is kept
+# in the raw surface cache, so later runs map it from disk without decoding
+# anything.
+
+CHARACTER_NAMES = ('Capybara', 'Jaguar', 'Macaw')
+CHARACTER_SIZES = (120, 160, 180, 200)  # conversation, home, character select, interaction
+CHARACTER_DIR = os.path.join('assets', 'characters')
+ATLAS_VERSION = 1
+
+
+def character_path(name):
+    return os.path.join(CHARACTER_DIR, f'{name.lower()}.png')
+
+
+class SpriteAtlas:
+    def __init__(self, names=CHARACTER_NAMES, sizes=CHARACTER_SIZES, raw_cache=True):
+        self.names = tuple(names)
+        self.sizes = tuple(sorted(sizes))
+        if raw_cache is True:
+            raw_cache = RawSurfaceCache()
+        self.raw_cache = raw_cache or None
+        # One row per size, one column per character
+        self.cells = {}
+        top = 0
+        for size in self.sizes:
+            for column, name in enumerate(self.names):
+                self.cells[name, size] = pygame.Rect(column * self.sizes[-1], top, size, size)
+            top += size
+        self.atlas_size = (len(self.names) * self.sizes[-1], top)
+        self.surface = None
+        self._sprites = {}
+
+    def _stamp(self):
+        stats = [os.stat(character_path(name)) for name in self.names]
+        return f"{ATLAS_VERSION}|{self.sizes}|" + ",".join(f"{s.st_size}:{s.st_mtime_ns}" for s in stats)
+
+    def build(self):
+        """Decode and scale every character into a new atlas surface."""
+        atlas = pygame.Surface(self.atlas_size, pygame.SRCALPHA).convert_alpha()
+        atlas.fill((0, 0, 0, 0))
+        for name in self.names:
+            source = pygame.image.load(character_path(name)).convert_alpha()
+            for size in self.sizes:
+                atlas.blit(scale_image(source, (size, size)), self.cells[name, size])
+        return atlas
+
+    def load(self):
+        """The atlas surface, from the raw cache if it is current, otherwise built (and cached)."""
+        if self.surface is not None:
+            return self.surface
+        key = f"sprite-atlas:{','.join(self.names)}"
+        stamp = self._stamp()
+        surface = self.raw_cache.load(key, stamp) if self.raw_cache else None
+        if surface is None:
+            surface = self.build()
+            if self.raw_cache:
+                try:
+                    self.raw_cache.store(key, stamp, surface)
+                except OSError as e:
+                    print(f"Could not cache the sprite atlas: {e}")
+        self.surface = surface
+        return surface
+
+    def sprite(self, name, size):
+        """name drawn at size x size, as a subsurface of the atlas."""
+        sprite = self._sprites.get((name, size))
+        if sprite is None:
+            rect = self.cells.get((name, size))
+            if rect is None:
+                raise KeyError(f"{name} at {size}px is not in the sprite atlas (sizes: {self.sizes})")
+            sprite = self._sprites[name, size] = self.load().subsurface(rect)
+        return sprite
+
+
+_shared_atlas = None
+_shared_atlas_lock = threading.Lock()
+
+
+def get_sprite_atlas():
+    """The process-wide SpriteAtlas. It is loaded on the first sprite request, which needs a display."""
+    global _shared_atlas
+    with _shared_atlas_lock:
+        if _shared_atlas is None:
+            _shared_atlas = SpriteAtlas()
+        return _shared_atlas
+
+
+def character_sprite(name, size):
+    """Shortcut for get_sprite_atlas().sprite."""
+    return get_sprite_atlas().sprite(name, size)
@@ -0,0 +1,106 @@
+import time
+
+# Matches any truthy screen result that has no more specific transition
+ANY_RESULT = object()
+
+
+class StageMachine:
+    """Table-driven stage flow that keeps live screens in a pool.
+
+    Stages are registered with a factory that builds their screen and an
+    optional reset hook that readies a pooled screen for another visit, so a
+    transition is a dictionary lookup plus a reset instead of a rebuild.
+    """
+
+    def __init__(self, context):
+        self.context = context
+        self.stages = {}
+        self.transitions = {}
+        self.successors = {}
+        self.pool = {}
+        self.stage = None
+        self.current_screen = None
+        self.prefetch_hooks = []
+        self.timing_hooks = []
+        self._pending_prefetch = []
+
+    def add_stage(self, stage, factory, reset=None, pool_key=None):
+        """Register a stage.
+
+        factory(context) builds the screen, reset(screen, context) prepares a
+        pooled one for reuse, and pool_key(context) tells screens that depend
+        on the context apart (returning None means it can't be built yet).
+        """
+        self.stages[stage] = (factory, reset, pool_key)
+        self.successors.setdefault(stage, [])
+
+    def add_transition(self, stage, result, handler, targets=()):
+        """handler(context, result) returns the next stage, or None to stay.
+
+        targets lists the stages the handler can lead to, which are prefetched
+        while the player is still on stage.
+        """
+        self.transitions[(stage, result)] = handler
+        for target in targets:
+            if target not in self.successors.setdefault(stage, []):
+                self.successors[stage].append(target)
+
+    def _pool_key(self, stage):
+        pool_key = self.stages[stage][2]
+        if pool_key is None:
+            return (stage,)
+        key = pool_key(self.context)
+        return None if key is None else (stage, key)
+
+    def get_screen(self, stage):
+        factory, reset, _ = self.stages[stage]
+        key = self._pool_key(stage)
+        screen = self.pool.get(key)
+        if screen is None:
+            screen = factory(self.context)
+            if key is not None:
+                self.pool[key] = screen
+        elif reset is not None:
+            reset(screen, self.context)
+        return screen
+
+    def enter(self, stage):
+        previous = self.stage
+        start = time.perf_counter()
+        screen = self.get_screen(stage)
+        self.stage = stage
+        self.current_screen = screen
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        for hook in self.timing_hooks:
+            hook(previous, stage, elapsed_ms)
+        self._pending_prefetch = list(self.successors.get(stage, []))
+        return screen
+
+    def dispatch(self, result):
+        """Run the transition for the current screen's result, if there is one."""
+        if result is None:
+            return False
+        handler = self.transitions.get((self.stage, result))
+        if handler is None and result:
+            handler = self.transitions.get((self.stage, ANY_RESULT))
+        if handler is None:
+            return False
+        next_stage = handler(self.context, result)
+        if next_stage is not None:
+            self.enter(next_stage)
+        return True
+
+    def prefetch_next(self):
+        """Build one not-yet-pooled successor screen. Call once per frame when idle."""
+        while self._pending_prefetch:
+            stage = self._pending_prefetch.pop(0)
+            key = self._pool_key(stage)
+            if key is None or key in self.pool:
+                continue
+            start = time.perf_counter()
+            self.pool[key] = self.stages[stage][0](self.context)
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            for hook in self.prefetch_hooks:
+                hook(stage, elapsed_ms)
+            return stage
+        return None
@@ -0,0 +1,106 @@
+import numpy as np
+import pygame
+
+# NumPy images straight onto pygame surfaces, without a PNG on disk in between.
+# Arrays are in image layout, (height, width[, 3]) floats in [0, 1] or uint8,
+# as svd.py produces them; surfarray uses (width, height, 3), so the surface
+# view is transposed rather than the array. Float input is scaled, rounded and
+# clipped in scratch buffers that are allocated once per size and reused, and
+# the result is written into the surface's own pixels. For opaque 32-bit
+# surfaces (the display format) each pixel is packed into one word with a
+# matrix product, which writes whole pixels instead of three strided bytes.
+
+
+class ArrayBlitter:
+    def __init__(self, size, scale=255.0):
+        """size is (width, height) of the surfaces drawn to; scale maps input values to 0-255."""
+        self.size = tuple(size)
+        self.scale = scale
+        width, height = self.size
+        self._scratch = np.empty((height, width, 3), dtype=np.float32)
+        self._pixels = np.empty((height, width, 3), dtype=np.uint8)
+        self._packed = np.empty((height, width), dtype=np.float32)
+        self._alpha = np.empty((height, width), dtype=np.float32)
+
+    def new_surface(self, alpha=False):
+        """A surface in the display's format that to_surface can write to directly."""
+        surface = pygame.Surface(self.size, pygame.SRCALPHA if alpha else 0, 32)
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert_alpha() if alpha else surface.convert()
+        return surface
+
+    def _rounded(self, array):
+        """array as (height, width, 3) values 0-255: rounded floats in the scratch buffer, or uint8 as is."""
+        if array.ndim == 2:
+            array = array[:, :, None]  # grey: broadcast to all three channels
+        if array.shape[:2] != self._scratch.shape[:2]:
+            raise ValueError(f"array is {array.shape[1]}x{array.shape[0]}, blitter is {self.size[0]}x{self.size[1]}")
+        if array.dtype == np.uint8:
+            return np.broadcast_to(array, self._pixels.shape) if array.shape[2] == 1 else array[:, :, :3]
+        np.multiply(array[:, :, :3], self.scale, out=self._scratch, casting='unsafe')
+        np.add(self._scratch, 0.5, out=self._scratch)
+        np.clip(self._scratch, 0, 255, out=self._scratch)
+        np.floor(self._scratch, out=self._scratch)
+        return self._scratch
+
+    @staticmethod
+    def _packing_weights(surface):
+        """Per-channel multipliers that pack RGB into one pixel value, or None if the surface can't take it."""
+        if surface.get_bytesize() != 4 or surface.get_flags() & pygame.SRCALPHA or any(surface.get_losses()[:3]):
+            return None
+        shifts = surface.get_shifts()[:3]
+        if max(shifts) > 16:
+            return None  # sums past 2**24 are not exact in float32
+        return np.array([1 << shift for shift in shifts], dtype=np.float32)
+
+    def to_surface(self, array, surface=None, alpha=None):
+        """Write array into surface (a new one if not given) and return the surface.
+
+        alpha, if given, is a (height, width) array in the same range as array
+        and needs a per-pixel alpha surface.
+        """
+        if surface is None:
+            surface = self.new_surface(alpha is not None)
+        values = self._rounded(array)
+        weights = self._packing_weights(surface)
+        if weights is not None:
+            np.matmul(values, weights, out=self._packed)
+            target = pygame.surfarray.pixels2d(surface)
+            np.copyto(target.T, self._packed, casting='unsafe')
+            del target  # unlocks the surface
+        elif surface.get_bytesize() in (3, 4):
+            # Rows of the surface in place, as a (height, width, 3) view
+            target = pygame.surfarray.pixels3d(surface)
+            np.copyto(target.transpose(1, 0, 2), values, casting='unsafe')
+            del target
+        else:
+            # 16-bit surfaces: let pygame pack the colours (palette surfaces are not supported)
+            np.copyto(self._pixels, values, casting='unsafe')
+            pygame.surfarray.blit_array(surface, self._pixels.transpose(1, 0, 2))
+        if alpha is not None:
+            self.set_alpha(surface, alpha)
+        return surface
+
+    def set_alpha(self, surface, alpha):
+        if alpha.dtype == np.uint8:
+            values = alpha
+        else:
+            np.multiply(alpha, self.scale, out=self._alpha, casting='unsafe')
+            np.add(self._alpha, 0.5, out=self._alpha)
+            np.clip(self._alpha, 0, 255, out=self._alpha)
+            values = self._alpha
+        target = pygame.surfarray.pixels_alpha(surface)
+        np.copyto(target.T, values, casting='unsafe')
+        del target
+
+
+_blitters = {}
+
+
+def array_to_surface(array, surface=None, alpha=None):
+    """Shortcut for ArrayBlitter.to_surface, with one blitter (and scratch buffers) kept per size."""
+    size = (array.shape[1], array.shape[0])
+    blitter = _blitters.get(size)
+    if blitter is None:
+        blitter = _blitters[size] = ArrayBlitter(size)
+    return blitter.to_surface(array, surface, alpha)
@@ -0,0 +1,115 @@
+import hashlib
+import mmap
+import os
+import struct
+import sys
+import pygame
+
+# Decoded, display-format pixels on disk. A cached image is a small header and
+# the surface's raw rows, so loading it is an mmap plus at most one memcpy
+# instead of a PNG decode, a format conversion and a rescale. Per-pixel alpha
+# images in a byte order pygame.image.frombuffer understands are wrapped
+# without copying at all; the mapping is copy-on-write, so drawing on such a
+# surface never touches the file.
+# A file is named after its key and the key's stamp, so when the source
+# changes the new pixels go to a new file and the old one is deleted.
+
+RAW_DIR = os.path.join('assets', 'build', 'raw')
+RAW_VERSION = 1
+_MAGIC = b'RRSF'
+_HEADER = struct.Struct('<4sIIIIIIIII')  # magic, version, width, height, pitch, flags, 4 masks
+_DATA_OFFSET = 64
+
+# (R, G, B, A) masks of 32-bit alpha surfaces -> frombuffer format, for this machine's byte order
+if sys.byteorder == 'little':
+    _FROMBUFFER_FORMATS = {(0xff0000, 0xff00, 0xff, 0xff000000): 'BGRA',
+                           (0xff, 0xff00, 0xff0000, 0xff000000): 'RGBA'}
+else:
+    _FROMBUFFER_FORMATS = {(0xff00, 0xff0000, 0xff000000, 0xff): 'BGRA',
+                           (0xff000000, 0xff0000, 0xff00, 0xff): 'RGBA'}
+
+
+class RawSurfaceCache:
+    def __init__(self, cache_dir=RAW_DIR):
+        self.cache_dir = cache_dir
+        self.hits = 0
+        self.misses = 0
+        self.zero_copy = 0
+
+    def _key_prefix(self, key):
+        return hashlib.sha1(f"{RAW_VERSION}|{key}".encode()).hexdigest()[:12] + '-'
+
+    def path_for(self, key, stamp):
+        """File for key; stamp (e.g. source size and mtime) changes the name when the source changes."""
+        display = pygame.display.get_surface()
+        display_masks = display.get_masks() if display is not None else ()
+        digest = hashlib.sha1(f"{stamp}|{display_masks}".encode()).hexdigest()[:12]
+        return os.path.join(self.cache_dir, f"{self._key_prefix(key)}{digest}.raw")
+
+    def load(self, key, stamp):
+        """The cached surface for key, or None."""
+        path = self.path_for(key, stamp)
+        try:
+            with open(path, 'rb') as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        magic, version, width, height, pitch, flags, *masks = _HEADER.unpack_from(mapped)
+        if magic != _MAGIC or version != RAW_VERSION or len(mapped) < _DATA_OFFSET + pitch * height:
+            mapped.close()
+            self.misses += 1
+            return None
+        pixels = memoryview(mapped)[_DATA_OFFSET:_DATA_OFFSET + pitch * height]
+        self.hits += 1
+        fmt = _FROMBUFFER_FORMATS.get(tuple(masks))
+        if fmt is not None and flags & pygame.SRCALPHA and pitch == width * 4:
+            # Same layout convert_alpha() produced: wrap the mapping as is
+            self.zero_copy += 1
+            return pygame.image.frombuffer(pixels, (width, height), fmt)
+        surface = pygame.Surface((width, height), flags & pygame.SRCALPHA, 32, masks)
+        if surface.get_pitch() != pitch:
+            pixels.release()
+            mapped.close()
+            self.hits -= 1
+            self.misses += 1
+            return None
+        target = memoryview(surface.get_view('0'))
+        target[:] = pixels
+        target.release()
+        pixels.release()
+        mapped.close()
+        return surface
+
+    def store(self, key, stamp, surface):
+        """Write surface's pixels for key. Only 32-bit surfaces are cached."""
+        if surface.get_bitsize() != 32:
+            return None
+        path = self.path_for(key, stamp)
+        os.makedirs(self.cache_dir, exist_ok=True)
+        header = _HEADER.pack(_MAGIC, RAW_VERSION, surface.get_width(), surface.get_height(),
+                              surface.get_pitch(), surface.get_flags() & pygame.SRCALPHA, *surface.get_masks())
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(header.ljust(_DATA_OFFSET, b'\0'))
+            f.write(surface.get_buffer().raw)
+        os.replace(tmp_path, path)
+        self._remove_stale(key, os.path.basename(path))
+        return path
+
+    def _remove_stale(self, key, current):
+        """Delete key's files for older stamps, and files named before names had a key prefix."""
+        prefix = self._key_prefix(key)
+        for name in os.listdir(self.cache_dir):
+            if name.endswith('.raw') and name != current and (name.startswith(prefix) or '-' not in name):
+                try:
+                    os.remove(os.path.join(self.cache_dir, name))
+                except OSError:
+                    pass  # still mapped on a platform that won't delete it; tried again on the next store
+
+    def clear(self):
+        if not os.path.isdir(self.cache_dir):
+            return
+        for name in os.listdir(self.cache_dir):
+            if name.endswith('.raw'):
+                os.remove(os.path.join(self.cache_dir, name))
@@ -1,13 +1,19 @@
 import numpy as np
-import matplotlib.pyplot as plt
-import matplotlib.image as img
+import argparse
+import io
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from PIL import Image
 
 # Load and compress image progressively using SVD
 
 def load_image(image_path):
-    """Load image and return as a NumPy array."""
-    return img.imread(image_path)
+    """Load image and return it as a float32 RGB NumPy array in [0, 1]."""
+    with Image.open(image_path) as image:
+        pixels = np.asarray(image.convert('RGB'), dtype=np.float32)
+    pixels /= 255.0
+    return pixels
 
 def compress_channel(channel, k):
     """Compress a single channel using SVD with k singular values."""
@@ -27,28 +33,152 @@ def compress_image_color(img, k):
     return compressed_img
 
 
-def save_compressed_image(image, output_path):
-    """Save compressed image"""
-    plt.imsave(output_path, image)
-
-def generate_compression_stages(image_path, stages, output_dir):
-    """ Generate and save a sequence of progressively less compressed images. """
+# YCbCr mode: the eye is much less sensitive to colour detail than to
+# brightness, so luma keeps rank k while the two chroma planes are halved in
+# each direction and compressed at a lower rank. The chroma SVDs are then
+# about eight times cheaper and their factors a quarter of the size.
+
+def rgb_to_ycbcr(image):
+    """Full-range BT.601 YCbCr of an RGB image in [0, 1], as an (h, w, 3) float array."""
+    matrix = np.array([[0.299, 0.587, 0.114],
+                       [-0.168736, -0.331264, 0.5],
+                       [0.5, -0.418688, -0.081312]])
+    ycbcr = image[:, :, :3] @ matrix.T
+    ycbcr[:, :, 1:] += 0.5
+    return ycbcr
+
+def ycbcr_to_rgb(ycbcr):
+    """Inverse of rgb_to_ycbcr, clipped to [0, 1]."""
+    matrix = np.array([[1.0, 0.0, 1.402],
+                       [1.0, -0.344136, -0.714136],
+                       [1.0, 1.772, 0.0]])
+    shifted = ycbcr - np.array([0.0, 0.5, 0.5])
+    return np.clip(shifted @ matrix.T, 0, 1)
+
+def downsample(plane, factor=2):
+    """Average factor x factor blocks (edges padded by repetition)."""
+    h, w = plane.shape
+    padded = np.pad(plane, ((0, -h % factor), (0, -w % factor)), mode='edge')
+    return padded.reshape(padded.shape[0] // factor, factor, padded.shape[1] // factor, factor).mean(axis=(1, 3))
+
+def upsample(plane, shape, factor=2):
+    """Repeat each value factor x factor times and crop to shape."""
+    return np.repeat(np.repeat(plane, factor, axis=0), factor, axis=1)[:shape[0], :shape[1]]
+
+def compress_image_ycbcr(img, k, chroma_rank=None, factor=2):
+    """Compress luma with k values and subsampled chroma with chroma_rank (default k // 2) values."""
+    chroma_rank = chroma_rank or max(1, k // 2)
+    ycbcr = rgb_to_ycbcr(img)
+    channels = [compress_channel(ycbcr[:, :, 0], k)]
+    for c in (1, 2):
+        small = compress_channel(downsample(ycbcr[:, :, c], factor), chroma_rank)
+        channels.append(upsample(small, ycbcr.shape[:2], factor))
+    return ycbcr_to_rgb(np.stack(channels, axis=2))
+
+def factor_floats(shape, k, chroma_rank=None, factor=2):
+    """Numbers stored by the RGB and YCbCr modes at rank k, as (rgb, ycbcr)."""
+    h, w = shape[:2]
+    chroma_rank = chroma_rank or max(1, k // 2)
+    ch, cw = -(-h // factor), -(-w // factor)
+    return 3 * k * (h + w + 1), k * (h + w + 1) + 2 * chroma_rank * (ch + cw + 1)
+
+def mse_to_psnr(mse):
+    """PSNR in dB for a mean squared error (a number or an array) of pixel values in [0, 1]."""
+    mse = np.asarray(mse, dtype=np.float64)
+    with np.errstate(divide='ignore'):
+        return np.where(mse > 0, 10 * np.log10(1.0 / np.maximum(mse, 1e-300)), np.inf)
+
+def psnr(reference, image):
+    """PSNR in dB of image against reference, both in [0, 1]."""
+    return float(mse_to_psnr(np.mean((reference[:, :, :3] - image[:, :, :3]) ** 2)))
+
+def compare_color_modes(img, k, chroma_rank=None):
+    """Time, PSNR and factor size of the RGB and YCbCr modes at rank k."""
+    results = {}
+    for mode, compress in (('rgb', lambda: compress_image_color(img, k)),
+                           ('ycbcr', lambda: compress_image_ycbcr(img, k, chroma_rank))):
+        start = time.perf_counter()
+        compressed = compress()
+        results[mode] = {'seconds': time.perf_counter() - start, 'psnr': psnr(img, compressed)}
+    results['rgb']['floats'], results['ycbcr']['floats'] = factor_floats(img.shape, k, chroma_rank)
+    return results
+
+
+# Output stage: stages are converted to 8-bit and written with Pillow. The
+# game loads compressed_stage_N.png (main.BG_STAGES), so stages are always
+# PNG, with a tunable zlib level; WebP (lossy or lossless) is only there for
+# save_compressed_image callers and the encode table. Encoding runs on a
+# thread pool, since Pillow releases the GIL while it compresses.
+
+ENCODE_OPTIONS = {
+    'png': lambda compress_level, lossless, quality: {'compress_level': compress_level},
+    'webp': lambda compress_level, lossless, quality: {'lossless': lossless, 'quality': quality, 'method': 4},
+}
+
+def to_uint8(image):
+    """Scale a [0, 1] float image to uint8, leaving image untouched (one scratch copy does the arithmetic)."""
+    scaled = np.multiply(image, 255.0)
+    np.add(scaled, 0.5, out=scaled)
+    np.clip(scaled, 0, 255, out=scaled)
+    return scaled.astype(np.uint8)
+
+def encode_image(pixels, fmt='png', compress_level=6, lossless=False, quality=90):
+    """Encode uint8 RGB pixels and return the file bytes."""
+    buffer = io.BytesIO()
+    options = ENCODE_OPTIONS[fmt](compress_level, lossless, quality)
+    Image.fromarray(pixels[:, :, :3], 'RGB').save(buffer, format=fmt.upper(), **options)
+    return buffer.getvalue()
+
+def save_compressed_image(image, output_path, compress_level=6, lossless=False, quality=90):
+    """Save compressed image (float in [0, 1] or uint8); the format follows the file extension."""
+    if image.dtype != np.uint8:
+        image = to_uint8(image)
+    fmt = os.path.splitext(output_path)[1].lstrip('.').lower()
+    data = encode_image(image, fmt, compress_level, lossless, quality)
+    with open(output_path, 'wb') as f:
+        f.write(data)
+    return len(data)
+
+def encode_table(image, configs=None):
+    """Encode time and size of one stage per output configuration, as a list of rows."""
+    pixels = image if image.dtype == np.uint8 else to_uint8(image)
+    configs = configs or [('png', {'compress_level': 1}), ('png', {'compress_level': 6}),
+                          ('png', {'compress_level': 9}), ('webp', {'quality': 90}),
+                          ('webp', {'lossless': True})]
+    rows = []
+    for fmt, options in configs:
+        start = time.perf_counter()
+        data = encode_image(pixels, fmt, **options)
+        label = fmt + ''.join(f" {key}={value}" for key, value in options.items())
+        rows.append((label, (time.perf_counter() - start) * 1000, len(data)))
+    return rows
+
+def generate_compression_stages(image_path, stages, output_dir, mode='rgb', compress_level=6, workers=None):
+    """ Generate and save a sequence of progressively less compressed images (as the PNGs the game loads). """
     if not os.path.exists(output_dir):
         os.makedirs(output_dir)
 
     original_img = load_image(image_path)
 
-    image_number = 1
-    for k in stages:
-        compressed_img = compress_image_color(original_img, k)
+    with ThreadPoolExecutor(workers or min(len(stages), os.cpu_count() or 1)) as pool:
+        encodes = []
+        image_number = 1
+        for k in stages:
+            if mode == 'ycbcr':
+                compressed_img = compress_image_ycbcr(original_img, k)
+            else:
+                compressed_img = compress_image_color(original_img, k)
 
-        filename = "compressed_stage_" + str(image_number) + ".png"
-        save_path = os.path.join(output_dir, filename)
+            filename = "compressed_stage_" + str(image_number) + ".png"
+            save_path = os.path.join(output_dir, filename)
 
-        save_compressed_image(compressed_img, save_path)
-        print("Saved", filename, "with k =", k)
+            # Encode in the background while the next rank is decomposed
+            encodes.append((filename, k, pool.submit(save_compressed_image, compressed_img, save_path,
+                                                     compress_level)))
+            image_number += 1
 
-        image_number += 1
+        for filename, k, encode in encodes:
+            print("Saved", filename, "with k =", k, f"({encode.result() / 1024:.0f} KB)")
 
 
 # Implementation
@@ -57,4 +187,27 @@ if __name__ == '__main__':
     compression_stages = [15, 35, 50, 100]  # Adjust as needed
     output_folder = 'assets/compressed_backgrounds'
 
-    generate_compression_stages(image_path, compression_stages, output_folder)
+    parser = argparse.ArgumentParser(description='Write the SVD-compressed background stages.')
+    parser.add_argument('--ycbcr', action='store_true', help='YCbCr mode with subsampled chroma')
+    parser.add_argument('--compare', action='store_true', help='compare the RGB and YCbCr modes instead')
+    parser.add_argument('--encode-table', action='store_true', help='time each output format instead')
+    parser.add_argument('--compress-level', type=int, default=6, help='PNG zlib level, 0-9')
+    parser.add_argument('--workers', type=int, help='encoder threads (default: one per CPU, up to one per stage)')
+    args = parser.parse_args()
+
+    if args.compare:
+        # PSNR and cost of the YCbCr mode against the RGB path, per stage rank
+        original = load_image(image_path)
+        print(f"{'k':>4} {'mode':>6} {'seconds':>8} {'PSNR dB':>8} {'floats':>10}")
+        for k in compression_stages:
+            for mode, result in compare_color_modes(original, k).items():
+                print(f"{k:>4} {mode:>6} {result['seconds']:>8.2f} {result['psnr']:>8.2f} {result['floats']:>10}")
+    elif args.encode_table:
+        stage = compress_image_color(load_image(image_path), compression_stages[0])
+        print(f"{'output':<32} {'ms':>8} {'KB':>8}")
+        for label, ms, size in encode_table(stage):
+            print(f"{label:<32} {ms:>8.1f} {size / 1024:>8.0f}")
+    else:
+        mode = 'ycbcr' if args.ycbcr else 'rgb'
+        generate_compression_stages(image_path, compression_stages, output_folder, mode,
+                                    args.compress_level, args.workers)
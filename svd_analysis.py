@@ -0,0 +1,180 @@
+"""
+What each SVD rank costs and buys, for choosing the background stage ranks.
+
+Every colour channel is decomposed once. By Eckart-Young the squared
+Frobenius error of a rank-k reconstruction is the sum of the discarded
+squared singular values, so the error, PSNR and factor storage for every k
+come from cumulative sums of the spectrum without rebuilding any image. SSIM
+needs real pixels, so it is only computed at a few sampled ranks. The stage
+ranks are then picked as the smallest k reaching each target PSNR.
+
+Usage (files and/or directories; directories are analysed in parallel):
+    python svd_analysis.py assets/background [--targets 28 30 31 34] [--workers 4] [--csv-dir out]
+"""
+
+import argparse
+import csv
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from svd import load_image, mse_to_psnr
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.webp', '.bmp')
+DEFAULT_TARGETS_DB = (28.0, 30.0, 31.0, 34.0)  # about what the hand-picked ranks give rainforest.png
+CURRENT_STAGES = (15, 35, 50, 100)  # svd.py's hand-picked ranks, for comparison
+FACTOR_BYTES = 4  # float32 factors
+
+
+def decompose(image):
+    """(U, s, Vt) for each colour channel."""
+    return [np.linalg.svd(image[:, :, c], full_matrices=False) for c in range(image.shape[2])]
+
+
+def rank_curves(spectra, shape):
+    """Error and size of every rank k = 0..min(height, width), from the singular values only.
+
+    spectra holds one singular value array per channel. Returns a dict of
+    arrays indexed by k: squared error, relative Frobenius error, PSNR (dB,
+    for pixel values in [0, 1]) and factor storage in bytes.
+    """
+    height, width, channels = shape
+    ranks = min(height, width)
+    tail = np.zeros(ranks + 1)
+    total = 0.0
+    for s in spectra:
+        energy = np.zeros(ranks)
+        energy[:len(s)] = s ** 2
+        channel_total = energy.sum()
+        total += channel_total
+        # discarded energy after keeping k values: total - sum of the first k
+        tail += np.maximum(channel_total - np.concatenate(([0.0], np.cumsum(energy))), 0.0)
+    psnr = mse_to_psnr(tail / (height * width * channels))
+    k = np.arange(ranks + 1)
+    return {
+        'k': k,
+        'squared_error': tail,
+        'relative_error': np.sqrt(tail / total) if total else np.zeros_like(tail),
+        'psnr': psnr,
+        'bytes': k * (height + width + 1) * channels * FACTOR_BYTES,
+    }
+
+
+def ranks_for_targets(psnr, targets):
+    """Smallest k whose PSNR reaches each target, or None if no rank does."""
+    chosen = []
+    for target in targets:
+        reached = np.flatnonzero(psnr >= target)
+        chosen.append(int(reached[0]) if len(reached) else None)
+    return chosen
+
+
+def reconstruct(factors, k):
+    channels = [(U[:, :k] * s[:k]) @ Vt[:k, :] for U, s, Vt in factors]
+    return np.clip(np.stack(channels, axis=2), 0, 1)
+
+
+def _box_mean(a, size):
+    """Mean over every size x size window (valid positions only), via an integral image."""
+    integral = np.pad(a, ((1, 0), (1, 0))).cumsum(0).cumsum(1)
+    return (integral[size:, size:] - integral[:-size, size:] - integral[size:, :-size]
+            + integral[:-size, :-size]) / (size * size)
+
+
+def ssim(a, b, window=8):
+    """Mean SSIM of the luma of two RGB images in [0, 1], with uniform windows."""
+    weights = np.array([0.299, 0.587, 0.114])
+    x, y = a @ weights, b @ weights
+    c1, c2 = 0.01 ** 2, 0.03 ** 2
+    mx, my = _box_mean(x, window), _box_mean(y, window)
+    vx = _box_mean(x * x, window) - mx * mx
+    vy = _box_mean(y * y, window) - my * my
+    cov = _box_mean(x * y, window) - mx * my
+    score = ((2 * mx * my + c1) * (2 * cov + c2)) / ((mx * mx + my * my + c1) * (vx + vy + c2))
+    return float(score.mean())
+
+
+def analyse(path, targets=DEFAULT_TARGETS_DB, sample_ranks=CURRENT_STAGES):
+    """Curves, chosen stage ranks and SSIM at the sampled and chosen ranks for one image."""
+    # float64, so the tail sums of small singular values don't lose precision
+    image = load_image(path).astype(np.float64)
+    start = time.perf_counter()
+    factors = decompose(image)
+    svd_seconds = time.perf_counter() - start
+    curves = rank_curves([s for _, s, _ in factors], image.shape)
+    chosen = ranks_for_targets(curves['psnr'], targets)
+    max_rank = len(curves['k']) - 1
+    sampled = sorted({min(k, max_rank) for k in sample_ranks} | {k for k in chosen if k is not None})
+    return {
+        'path': path,
+        'shape': image.shape,
+        'svd_seconds': svd_seconds,
+        'curves': curves,
+        'targets': list(targets),
+        'chosen': chosen,
+        'ssim': {k: ssim(image, reconstruct(factors, k)) for k in sampled},
+    }
+
+
+def write_csv(result, csv_dir):
+    os.makedirs(csv_dir, exist_ok=True)
+    name = os.path.splitext(os.path.basename(result['path']))[0] + '_ranks.csv'
+    curves = result['curves']
+    with open(os.path.join(csv_dir, name), 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['k', 'relative_error', 'psnr_db', 'bytes', 'ssim'])
+        for k in curves['k']:
+            writer.writerow([k, f"{curves['relative_error'][k]:.6f}", f"{curves['psnr'][k]:.3f}",
+                             curves['bytes'][k], result['ssim'].get(int(k), '')])
+
+
+def print_report(result):
+    height, width, channels = result['shape']
+    raw_bytes = height * width * channels
+    curves = result['curves']
+    print(f"\n{result['path']}: {width}x{height}, SVD {result['svd_seconds']:.2f}s")
+    print(f"{'k':>6} {'rel.err':>8} {'PSNR dB':>8} {'SSIM':>7} {'size KB':>9} {'vs raw':>7}")
+    for k, score in sorted(result['ssim'].items()):
+        print(f"{k:>6} {curves['relative_error'][k]:>8.4f} {curves['psnr'][k]:>8.2f} {score:>7.4f}"
+              f" {curves['bytes'][k] / 1024:>9.0f} {curves['bytes'][k] / raw_bytes:>6.2f}x")
+    pairs = ", ".join(f"{t:g} dB -> {'n/a' if k is None else k}" for t, k in zip(result['targets'], result['chosen']))
+    print(f"Stage ranks for targets: {pairs}")
+    print(f"compression_stages = {[k for k in result['chosen'] if k is not None]}")
+
+
+def image_paths(inputs):
+    paths = []
+    for item in inputs:
+        if os.path.isdir(item):
+            paths.extend(os.path.join(item, name) for name in sorted(os.listdir(item))
+                         if name.lower().endswith(IMAGE_EXTENSIONS))
+        else:
+            paths.append(item)
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('inputs', nargs='+', help='image files or directories')
+    parser.add_argument('--targets', nargs='+', type=float, default=list(DEFAULT_TARGETS_DB),
+                        help='PSNR targets in dB, one per stage')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help='parallel processes')
+    parser.add_argument('--csv-dir', help='write the full per-rank curve of each image here')
+    args = parser.parse_args()
+
+    paths = image_paths(args.inputs)
+    start = time.perf_counter()
+    if len(paths) > 1 and args.workers > 1:
+        with ProcessPoolExecutor(min(args.workers, len(paths))) as pool:
+            results = list(pool.map(analyse, paths, [args.targets] * len(paths)))
+    else:
+        results = [analyse(path, args.targets) for path in paths]
+    for result in results:
+        print_report(result)
+        if args.csv_dir:
+            write_csv(result, args.csv_dir)
+    print(f"\n{len(results)} image(s) in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == '__main__':
+    main()
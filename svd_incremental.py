@@ -0,0 +1,100 @@
+"""
+Rank-k SVD reconstructions of an animation, updated from frame to frame.
+
+Consecutive frames of an animated background (swaying canopy, drifting
+light) are nearly the same image, so their top-k factors are too. Instead of
+a full np.linalg.svd per frame, each channel keeps a thin SVD X = U diag(s) V^T
+of rank k and moves it towards the next frame F:
+
+  1. the residual R = F - X (X is the previous reconstruction, kept anyway)
+     is sketched to rank r: A = orth(R Omega), refined by power iterations
+     A = orth(R R^T A), and B = R^T A, so R ~ A B^T
+  2. Brand's low-rank modification gives the SVD of X + A B^T:
+       P Ra = qr((I - U U^T) A),  Q Rb = qr((I - V V^T) B)
+       K = [diag(s) 0; 0 0] + [U^T A; Ra] [V^T B; Rb]^T      ((k + r) x (k + r))
+       K = U' s' V'^T,  U <- [U P] U',  V <- [V Q] V'
+     and the result is truncated back to rank k.
+
+Each frame costs O(height * width * (k + r)) instead of a full
+decomposition, and because the update is driven by the residual, not the
+frame difference, truncation errors don't accumulate: on a still image every
+update moves the factors closer to the best rank-k approximation.
+"""
+
+import numpy as np
+
+
+class IncrementalSVD:
+    """Rank-k thin SVD of one channel that follows a sequence of frames."""
+
+    def __init__(self, frame, k, update_rank=8, power_iters=1, rng=None):
+        self.k = k
+        self.update_rank = update_rank
+        self.power_iters = power_iters
+        self.rng = rng or np.random.default_rng(0)
+        frame = np.asarray(frame, dtype=np.float32)
+        U, s, Vt = np.linalg.svd(frame, full_matrices=False)
+        self.U = np.ascontiguousarray(U[:, :k])
+        self.s = s[:k].copy()
+        self.V = np.ascontiguousarray(Vt[:k].T)
+        self.reconstruction = (self.U * self.s) @ self.V.T
+        self._omega = np.empty((frame.shape[1], update_rank), dtype=np.float32)
+
+    def modify(self, A, B):
+        """Update the factors to the rank-k truncation of U diag(s) V^T + A B^T."""
+        k = len(self.s)
+        UtA = self.U.T @ A
+        P, Ra = np.linalg.qr(A - self.U @ UtA)
+        VtB = self.V.T @ B
+        Q, Rb = np.linalg.qr(B - self.V @ VtB)
+        K = np.zeros((k + A.shape[1], k + B.shape[1]), dtype=np.float32)
+        K[:k, :k] = np.diag(self.s)
+        K += np.vstack([UtA, Ra]) @ np.vstack([VtB, Rb]).T
+        Uk, sk, Vkt = np.linalg.svd(K)
+        self.U = np.hstack([self.U, P]) @ Uk[:, :self.k]
+        self.s = sk[:self.k].astype(np.float32)
+        self.V = np.hstack([self.V, Q]) @ Vkt[:self.k].T
+
+    def update(self, frame):
+        """Move the factors towards frame and return the new rank-k reconstruction."""
+        residual = np.subtract(frame, self.reconstruction, dtype=np.float32)
+        self._omega[:] = self.rng.standard_normal(self._omega.shape)
+        A = np.linalg.qr(residual @ self._omega)[0]
+        for _ in range(self.power_iters):
+            A = np.linalg.qr(residual @ (residual.T @ A))[0]
+        B = residual.T @ A
+        self.modify(A, B)
+        self.reconstruction = (self.U * self.s) @ self.V.T
+        return self.reconstruction
+
+
+class IncrementalImageSVD:
+    """IncrementalSVD for each channel of an (height, width, 3) image sequence in [0, 1]."""
+
+    def __init__(self, frame, k, update_rank=8, power_iters=1):
+        self.channels = [IncrementalSVD(frame[:, :, c], k, update_rank, power_iters, np.random.default_rng(c))
+                         for c in range(frame.shape[2])]
+        self._out = np.empty(frame.shape, dtype=np.float32)
+
+    def reconstruct(self):
+        """The current rank-k frame, clipped to [0, 1], in a buffer reused from frame to frame."""
+        for c, channel in enumerate(self.channels):
+            self._out[:, :, c] = channel.reconstruction
+        return np.clip(self._out, 0, 1, out=self._out)
+
+    def update(self, frame):
+        for c, channel in enumerate(self.channels):
+            channel.update(frame[:, :, c])
+        return self.reconstruct()
+
+
+def sway_frames(image, count, amplitude=6, period=None):
+    """Yield count frames of image swaying sideways, more at the top (canopy) than the bottom."""
+    height, width = image.shape[:2]
+    period = period or count
+    columns = np.arange(width)
+    weight = np.linspace(1.0, 0.0, height) ** 2
+    for t in range(count):
+        offsets = np.rint(amplitude * weight * np.sin(2 * np.pi * t / period)).astype(int)
+        indices = np.clip(columns[None, :] - offsets[:, None], 0, width - 1)
+        yield np.take_along_axis(image, indices[:, :, None], axis=1)
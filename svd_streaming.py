@@ -0,0 +1,162 @@
+"""
+Out-of-core SVD compression for backgrounds too big to decompose in memory.
+
+The image is read in row blocks from a memory-mapped (height, width, 3)
+uint8 array, and the top-k factors of each channel come from a randomized
+sketch of the row space:
+
+  pass 1  Z = sum over blocks of B^T (B Omega)    (width x l, l = k + oversample)
+  (power) Z = sum over blocks of B^T (B Q)        for each extra power iteration
+  pass 2  P = B Q for every block, written to disk, and G = sum of P^T P
+          G = W S^2 W^T gives the singular values S and right factors Q W
+  pass 3  U = P W S^-1, block by block, into a memory-mapped array
+
+Only width-sized matrices and one block of rows are ever held in memory, so
+peak memory does not grow with the image height. Reconstructed stages are
+written back block by block the same way.
+
+Usage:
+    python svd_streaming.py panorama.png --ranks 15 35 50 100 --output-dir out [--block-rows 256]
+(a .npy file of shape (height, width, 3) and dtype uint8 can be given instead of an image)
+"""
+
+import argparse
+import os
+import tempfile
+import time
+import numpy as np
+from PIL import Image
+
+
+def image_to_memmap(image_path, npy_path, block_rows=256):
+    """Decode image_path once into a (height, width, 3) uint8 .npy file and return it memory-mapped.
+
+    PNG and JPEG can't be decoded a strip at a time, so this one-off step holds
+    the decoded image (as 8-bit pixels, not floats); everything after it streams.
+    """
+    with Image.open(image_path) as image:
+        image = image.convert('RGB')
+        width, height = image.size
+        out = np.lib.format.open_memmap(npy_path, mode='w+', dtype=np.uint8, shape=(height, width, 3))
+        for top in range(0, height, block_rows):
+            bottom = min(top + block_rows, height)
+            out[top:bottom] = np.asarray(image.crop((0, top, width, bottom)))
+        out.flush()
+    return np.load(npy_path, mmap_mode='r')
+
+
+def open_pixels(path, workdir, block_rows=256):
+    if path.endswith('.npy'):
+        return np.load(path, mmap_mode='r')
+    return image_to_memmap(path, os.path.join(workdir, 'pixels.npy'), block_rows)
+
+
+def _blocks(height, block_rows):
+    for top in range(0, height, block_rows):
+        yield top, min(top + block_rows, height)
+
+
+def _read(pixels, top, bottom):
+    """Rows top:bottom as float64 in [0, 1], shape (rows, width, channels)."""
+    block = np.asarray(pixels[top:bottom], dtype=np.float64)
+    if pixels.dtype == np.uint8:
+        block /= 255.0
+    return block if block.ndim == 3 else block[:, :, None]
+
+
+def streaming_svd(pixels, k, oversample=10, power_iters=1, block_rows=256, workdir=None, rng=None):
+    """Approximate top-k (U, s, Vt) of every channel of a (height, width[, channels]) array.
+
+    U is a read-only memory-mapped array in workdir (a new temporary directory,
+    left for the caller to remove, if not given); s and Vt are small in-memory
+    arrays.
+    """
+    height, width = pixels.shape[:2]
+    channels = pixels.shape[2] if pixels.ndim == 3 else 1
+    rank = min(k + oversample, height, width)
+    rng = rng or np.random.default_rng(0)
+    workdir = workdir or tempfile.mkdtemp(prefix='svd-stream-')
+
+    # Passes 1 (+ power iterations): orthonormal basis Q of each channel's dominant row space
+    q = [rng.standard_normal((width, rank)) for _ in range(channels)]
+    for _ in range(1 + power_iters):
+        z = [np.zeros((width, rank)) for _ in range(channels)]
+        for top, bottom in _blocks(height, block_rows):
+            block = _read(pixels, top, bottom)
+            for c in range(channels):
+                b = block[:, :, c]
+                z[c] += b.T @ (b @ q[c])
+        q = [np.linalg.qr(zc)[0] for zc in z]
+
+    # Pass 2: project every block onto Q, keeping the projections on disk
+    projections = [np.lib.format.open_memmap(os.path.join(workdir, f'projection_{c}.npy'), mode='w+',
+                                             dtype=np.float64, shape=(height, rank)) for c in range(channels)]
+    gram = [np.zeros((rank, rank)) for _ in range(channels)]
+    for top, bottom in _blocks(height, block_rows):
+        block = _read(pixels, top, bottom)
+        for c in range(channels):
+            p = block[:, :, c] @ q[c]
+            projections[c][top:bottom] = p
+            gram[c] += p.T @ p
+
+    # Pass 3: U = P W / s, one block at a time
+    factors = []
+    for c in range(channels):
+        eigenvalues, w = np.linalg.eigh(gram[c])
+        order = np.argsort(eigenvalues)[::-1][:k]
+        s = np.sqrt(np.maximum(eigenvalues[order], 0.0))
+        w = w[:, order]
+        scale = np.divide(1.0, s, out=np.zeros_like(s), where=s > 0)
+        u = np.lib.format.open_memmap(os.path.join(workdir, f'u_{c}.npy'), mode='w+',
+                                      dtype=np.float64, shape=(height, len(s)))
+        for top, bottom in _blocks(height, block_rows):
+            u[top:bottom] = (projections[c][top:bottom] @ w) * scale
+        u.flush()
+        projections[c] = None  # unmap; the file is removed with workdir
+        factors.append((np.load(u.filename, mmap_mode='r'), s, (q[c] @ w).T))
+    return factors
+
+
+def reconstruct_to_memmap(factors, k, out_path, block_rows=256):
+    """Write the rank-k image as a (height, width, channels) uint8 .npy, block by block."""
+    height, width = factors[0][0].shape[0], factors[0][2].shape[1]
+    out = np.lib.format.open_memmap(out_path, mode='w+', dtype=np.uint8, shape=(height, width, len(factors)))
+    for top, bottom in _blocks(height, block_rows):
+        for c, (u, s, vt) in enumerate(factors):
+            rows = (np.asarray(u[top:bottom, :k]) * s[:k]) @ vt[:k]
+            out[top:bottom, :, c] = np.clip(rows * 255.0 + 0.5, 0, 255).astype(np.uint8)
+    out.flush()
+    return out
+
+
+def generate_streaming_stages(path, ranks, output_dir, block_rows=256, save_png=True):
+    """Decompose once at the largest rank and write one stage per rank."""
+    os.makedirs(output_dir, exist_ok=True)
+    with tempfile.TemporaryDirectory(prefix='svd-stream-') as workdir:
+        pixels = open_pixels(path, workdir, block_rows)
+        start = time.perf_counter()
+        factors = streaming_svd(pixels, max(ranks), block_rows=block_rows, workdir=workdir)
+        print(f"Factored {pixels.shape[1]}x{pixels.shape[0]} at rank {max(ranks)} in {time.perf_counter() - start:.1f}s")
+        for number, k in enumerate(ranks, start=1):
+            npy_path = os.path.join(output_dir, f'compressed_stage_{number}.npy')
+            stage = reconstruct_to_memmap(factors, k, npy_path, block_rows)
+            if save_png:
+                # Pillow needs the whole stage to encode the PNG, but only as uint8
+                Image.fromarray(np.asarray(stage)).save(os.path.join(output_dir, f'compressed_stage_{number}.png'))
+            print(f"Saved stage {number} with k = {k}")
+        del factors, pixels
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('input', help='image file or (height, width, 3) uint8 .npy file')
+    parser.add_argument('--ranks', nargs='+', type=int, default=[15, 35, 50, 100])
+    parser.add_argument('--output-dir', default='compressed_stream')
+    parser.add_argument('--block-rows', type=int, default=256)
+    parser.add_argument('--no-png', action='store_true', help='only write the .npy stages')
+    args = parser.parse_args()
+    generate_streaming_stages(args.input, args.ranks, args.output_dir, args.block_rows, not args.no_png)
+
+
+if __name__ == '__main__':
+    main()
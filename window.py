@@ -0,0 +1,49 @@
+import pygame
+
+# The game window. Screens always draw to a surface of the game's own size
+# (960x640); with pygame.SCALED, SDL's renderer stretches it to the window or
+# the whole display, keeping the aspect ratio with black bars, and maps mouse
+# positions back to game coordinates. Resizing the window or going fullscreen
+# therefore changes nothing the screens see: no layout is recomputed and no
+# image is reloaded or rescaled.
+
+FULLSCREEN_KEY = pygame.K_F11
+# SDL only forwards window changes to the renderer that does the scaling if
+# these events are enabled, so the input pipeline never blocks them
+WINDOW_EVENTS = (pygame.VIDEORESIZE, pygame.VIDEOEXPOSE, pygame.WINDOWSIZECHANGED,
+                 pygame.WINDOWRESIZED, pygame.WINDOWEXPOSED)
+
+
+class Window:
+    def __init__(self, size, fullscreen=False):
+        self.size = tuple(size)
+        self.fullscreen = fullscreen
+        self.scaled = False
+
+    def _flags(self, fullscreen):
+        return pygame.SCALED | pygame.RESIZABLE | (pygame.FULLSCREEN if fullscreen else 0)
+
+    def open(self):
+        """Create the display surface, scaled if the platform has a renderer for it."""
+        try:
+            screen = pygame.display.set_mode(self.size, self._flags(self.fullscreen))
+            self.scaled = True
+        except pygame.error as e:
+            print(f"Scaled window unavailable ({e}), using a fixed-size window")
+            screen = pygame.display.set_mode(self.size)
+            self.scaled = self.fullscreen = False
+        return screen
+
+    def toggle_fullscreen(self):
+        """Switch between a window and fullscreen. Returns False if the video driver can't."""
+        if not self.scaled:
+            return False
+        try:
+            pygame.display.toggle_fullscreen()
+        except pygame.error as e:
+            # Setting the mode again instead can fail halfway and leave no window, so stay as we are
+            print(f"Could not switch fullscreen: {e}")
+            return False
+        self.fullscreen = not self.fullscreen
+        return True
+
@@ -0,0 +1,88 @@
+import random
+from bisect import bisect_left, bisect_right
+import pygame
+
+# The home screen's scrolling rainforest. The world is a strip several
+# screens wide; a Camera maps world x to screen x and follows the player.
+# The background is one screen-sized tile repeated (every other copy
+# mirrored, so the seams line up), and only the one or two tiles under the
+# camera are drawn. Animals are kept sorted by x in an AnimalIndex, so finding
+# the visible ones and the one next to the player are bisections: per-frame
+# work depends on what is on screen, not on how big the world is.
+
+WORLD_SCREENS = 8  # world width, in screen widths
+ANIMAL_SPACING = 320  # average distance between animals
+ANIMAL_JITTER = 60
+
+
+class Camera:
+    def __init__(self, view_width, world_width):
+        self.view_width = view_width
+        self.world_width = world_width
+        self.x = 0
+
+    def follow(self, target_x):
+        """Centre the view on target_x without showing past either end of the world."""
+        self.x = max(0, min(self.world_width - self.view_width, int(target_x) - self.view_width // 2))
+
+    def to_screen(self, world_x):
+        return world_x - self.x
+
+    @property
+    def left(self):
+        return self.x
+
+    @property
+    def right(self):
+        return self.x + self.view_width
+
+
+class TiledBackground:
+    def __init__(self, tile):
+        self.set_tile(tile)
+
+    def set_tile(self, tile):
+        self.tiles = (tile, pygame.transform.flip(tile, True, False))
+        self.tile_width = tile.get_width()
+
+    def draw(self, target, camera):
+        first = camera.left // self.tile_width
+        last = (camera.right - 1) // self.tile_width
+        for i in range(first, last + 1):
+            target.blit(self.tiles[i % 2], (camera.to_screen(i * self.tile_width), 0))
+
+
+class AnimalIndex:
+    """(x, name) pairs sorted by x, for range and nearest-neighbour queries by bisection."""
+
+    def __init__(self, animals):
+        self.animals = sorted(animals)
+        self.xs = [x for x, _ in self.animals]
+
+    def __len__(self):
+        return len(self.animals)
+
+    def between(self, left, right):
+        """Indices of the animals with left <= x <= right."""
+        return range(bisect_left(self.xs, left), bisect_right(self.xs, right))
+
+    def nearest(self, x, max_distance):
+        """Index of the animal closest to x if it is less than max_distance away, else None."""
+        i = bisect_left(self.xs, x)
+        best = None
+        for j in (i - 1, i):
+            if 0 <= j < len(self.xs) and abs(self.xs[j] - x) < max_distance:
+                if best is None or abs(self.xs[j] - x) < abs(self.xs[best] - x):
+                    best = j
+        return best
+
+
+def scatter_animals(names, start, end, spacing=ANIMAL_SPACING, jitter=ANIMAL_JITTER, seed=0):
+    """(x, name) for animals roughly spacing apart between start and end, taking names in turn."""
+    rng = random.Random(seed)
+    animals = []
+    x = start
+    while x <= end:
+        animals.append((min(end, max(start, x + rng.randint(-jitter, jitter))), names[len(animals) % len(names)]))
+        x += spacing
+    return animals